@@ -14,7 +14,8 @@ def main():
     Loads configuration and starts CLI interface.
     """
 
-    # Load environment configuration
+    # Load environment configuration (variables already set, e.g. container
+    # secrets, take precedence over .env)
     env_path = Path(__file__).parent / ".env"
     load_dotenv(dotenv_path=env_path)
     
@@ -4,22 +4,64 @@ Terminal-based operator interaction.
 See .github/copilot-instructions.md for interface requirements.
 """
 
+import atexit
+import os
 import sys
-from typing import Optional
-from src.core.translation.workflow import translation_workflow
+import threading
+from pathlib import Path
+from typing import Final, Optional
 from src.core.translation.state import WorkflowState
-from src.core.knowledge.sqlite_client import RobotStateDB
-from src.core.observability.logging import get_logger
+from src.core.observability.logging import StructuredLogger, get_logger
+
+try:
+    import readline  # Line editing and history for input() (not available on Windows)
+except ImportError:
+    readline = None
 
 logger = get_logger("cli")
 
+HISTORY_FILE = Path(os.getenv("CLI_HISTORY_FILE", Path.home() / ".robot_cli_history")).expanduser()
+HISTORY_LENGTH = 1000
+
+_EXIT_WORDS: Final = frozenset({"exit", "quit", "q"})
+
+# Erase the current terminal line and return the cursor to column 0
+CLEAR_LINE = "\x1b[2K\r"
+
+# Output framing, built once
+_BANNER = (
+    "\n" + "=" * 80 + "\n"
+    "  CONTEXT-AWARE ROBOT CONTROL SYSTEM\n"
+    "  Natural Language → Task Sequences\n"
+    + "=" * 80 + "\n\n"
+)
+_SEPARATOR = "-" * 80 + "\n"
+_RESPONSE_HEADER = "\n" + _SEPARATOR + "RESPONSE:\n" + _SEPARATOR
+
+
+def setup_history():
+    """Load command history and save it again at exit (no-op without readline)."""
+    if readline is None:
+        return
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+    readline.set_history_length(HISTORY_LENGTH)
+    atexit.register(_save_history)
+
+
+def _save_history():
+    """Write command history, ignoring unwritable locations."""
+    try:
+        readline.write_history_file(HISTORY_FILE)
+    except OSError as e:
+        logger.warning("Could not save CLI history", error=str(e))
+
 
 def print_banner():
     """Display CLI startup banner."""
-    print("\n" + "="*80)
-    print("  CONTEXT-AWARE ROBOT CONTROL SYSTEM")
-    print("  Natural Language → Task Sequences")
-    print("="*80 + "\n")
+    sys.stdout.write(_BANNER)
 
 
 def print_response(state: WorkflowState):
@@ -32,15 +74,30 @@ def print_response(state: WorkflowState):
     response = state.get("response")
     
     if response:
-        print("\n" + "-"*80)
-        print("RESPONSE:")
-        print("-"*80)
-        print(response)
-        print("-"*80 + "\n")
+        sys.stdout.write(_RESPONSE_HEADER + response + "\n" + _SEPARATOR + "\n")
     else:
         print("\n[No response generated]\n")
 
 
+def _read_commands(interactive: bool):
+    """
+    Yield operator commands until EOF.
+    
+    Interactive sessions prompt with input(); piped input is read line by
+    line without prompts.
+    """
+    if not interactive:
+        for line in sys.stdin:
+            yield line.strip()
+        return
+    
+    while True:
+        try:
+            yield input("robot> ").strip()
+        except EOFError:
+            return
+
+
 def run_cli_session():
     """
     Main CLI loop for operator interaction.
@@ -50,21 +107,31 @@ def run_cli_session():
     2. Invoke LangGraph workflow
     3. Display response
     4. Repeat until exit
+    
+    When stdin is not a terminal (piped commands), the banner, prompt and
+    progress indicator are skipped and each line is handled as one command.
     """
-    print_banner()
-    logger.info("CLI session started")
+    interactive = sys.stdin.isatty()
+    if interactive:
+        print_banner()
+        setup_history()
     
-    print("CLI session started")
-    print("Type 'exit' or 'quit' to exit, Ctrl+C to interrupt\n")
+    # Connect to Neo4j while the workflow modules import
+    from src.core.knowledge.neo4j_client import prewarm_shared_driver
+    threading.Thread(target=prewarm_shared_driver, name="neo4j-prewarm", daemon=True).start()
+    
+    # Deferred so the banner shows before LangGraph and the LLM SDKs load
+    from src.core.translation.workflow import translation_workflow
+    
+    logger.info("CLI session started", interactive=interactive)
+    
+    if interactive:
+        print("CLI session started")
+        print("Type 'exit' or 'quit' to exit, Ctrl+C to interrupt\n")
     
     try:
-        while True:
-            try:
-                operator_input = input("robot> ").strip()
-            except EOFError:
-                break
-            
-            if operator_input.lower() in ["exit", "quit", "q"]:
+        for operator_input in _read_commands(interactive):
+            if operator_input.lower() in _EXIT_WORDS:
                 break
             
             if not operator_input:
@@ -75,16 +142,20 @@ def run_cli_session():
             }
             
             try:
-                print("Processing...", end="", flush=True)
+                if interactive:
+                    print("Processing...", end="", flush=True)
                 
                 final_state = translation_workflow.invoke(initial_state)
+                StructuredLogger.flush_run(final_state.get("correlation_id"))
                 
-                print("\r" + " " * 20 + "\r", end="")
+                if interactive:
+                    sys.stdout.write(CLEAR_LINE)
                 
                 print_response(final_state)
             
             except Exception as e:
-                print("\r" + " " * 20 + "\r", end="")
+                if interactive:
+                    sys.stdout.write(CLEAR_LINE)
                 print(f"\nError: {str(e)}")
                 print("Please try again or contact system administrator.\n")
     
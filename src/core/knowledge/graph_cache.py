@@ -0,0 +1,198 @@
+"""
+Local Graph Cache
+SQLite copy of the graph data plan verification reads, tied to $GRAPH_VERSION.
+Lets a verification run without Neo4j round trips once the copy is current.
+See docs/06_KNOWLEDGE_LAYER.md for the cached tables.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Tuple
+from src.core.knowledge.neo4j_client import Neo4jClient
+from src.core.knowledge.sqlite_client import _SQLiteDB
+from src.core.observability.logging import get_logger
+
+logger = get_logger("graph_cache")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS positions (name TEXT PRIMARY KEY, role TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS routines (name TEXT PRIMARY KEY, required_tool TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS tool_locations (tool TEXT PRIMARY KEY, position TEXT NOT NULL)",
+    """CREATE TABLE IF NOT EXISTS allowed_edges (
+        from_position TEXT NOT NULL, to_position TEXT NOT NULL,
+        PRIMARY KEY (from_position, to_position)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS supported_at (
+        routine TEXT NOT NULL, position TEXT NOT NULL,
+        PRIMARY KEY (routine, position)
+    ) WITHOUT ROWID""",
+)
+
+_SQL_CLEAR = (
+    "DELETE FROM positions",
+    "DELETE FROM routines",
+    "DELETE FROM tool_locations",
+    "DELETE FROM allowed_edges",
+    "DELETE FROM supported_at",
+)
+
+_SQL_GET_VERSION = "SELECT value FROM cache_meta WHERE key = 'cache_version'"
+_SQL_SET_VERSION = "INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('cache_version', ?)"
+
+_SQL_INSERT_POSITION = "INSERT INTO positions (name, role) VALUES (?, ?)"
+_SQL_INSERT_ROUTINE = "INSERT INTO routines (name, required_tool) VALUES (?, ?)"
+_SQL_INSERT_TOOL_LOCATION = "INSERT INTO tool_locations (tool, position) VALUES (?, ?)"
+_SQL_INSERT_EDGE = "INSERT INTO allowed_edges (from_position, to_position) VALUES (?, ?)"
+_SQL_INSERT_SUPPORTED_AT = "INSERT INTO supported_at (routine, position) VALUES (?, ?)"
+
+_SQL_ALL_POSITIONS = "SELECT name, role FROM positions"
+_SQL_ALL_ROUTINES = "SELECT name, required_tool FROM routines"
+_SQL_ALL_TOOL_LOCATIONS = "SELECT tool, position FROM tool_locations"
+_SQL_ALL_EDGES = "SELECT from_position, to_position FROM allowed_edges"
+_SQL_ALL_SUPPORTED_AT = "SELECT routine, position FROM supported_at"
+
+
+@dataclass(frozen=True, slots=True)
+class GraphCacheSnapshot:
+    """Graph data loaded from the local cache (shared - do not mutate)."""
+    version: str  # GRAPH_VERSION the tables were filled for
+    positions: Dict[str, str]  # position name -> role
+    routines: Dict[str, str]  # routine name -> required tool
+    tool_locations: Dict[str, str]  # tool name -> tool stand position
+    allowed_edges: FrozenSet[Tuple[str, str]]  # (from, to), both directions of each edge
+    supported_at: FrozenSet[Tuple[str, str]]  # (routine, position)
+
+
+class GraphCacheDB(_SQLiteDB):
+    """
+    Local copy of positions, routines, tool locations, :ONLY_ALLOWED_MOVE_TO
+    edges and :SUPPORTED_AT pairs.
+    
+    The tables are rewritten from Neo4j in one transaction whenever the
+    stored cache_version differs from the requested version, and read into
+    memory once per process after that.
+    
+    Schema:
+        cache_meta: key/value pairs (cache_version)
+        positions: name, role
+        routines: name, required_tool
+        tool_locations: tool, position
+        allowed_edges: from_position, to_position
+        supported_at: routine, position
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the graph cache database.
+        
+        Args:
+            db_path: Path to SQLite file (default: $SQLITE_GRAPH_CACHE_DB or data/graph_cache.db)
+        """
+        self.db_path = db_path or os.getenv("SQLITE_GRAPH_CACHE_DB", "data/graph_cache.db")
+        self._snapshot: Optional[GraphCacheSnapshot] = None
+        self._connect()
+        self._initialize_schema()
+        logger.info("GraphCacheDB initialized", db_path=self.db_path)
+    
+    def _initialize_schema(self):
+        """Create the cache tables."""
+        with self._lock, self._conn as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+    
+    def cached_version(self) -> Optional[str]:
+        """Return the version the tables were last filled for, or None if never filled."""
+        with self._lock, self._conn as conn:
+            row = conn.execute(_SQL_GET_VERSION).fetchone()
+        return row["value"] if row else None
+    
+    def refresh_if_stale(self, current_version: str, neo4j: Optional[Neo4jClient] = None) -> bool:
+        """
+        Rewrite the tables from Neo4j unless they already hold current_version.
+        
+        Args:
+            current_version: Graph revision the cache must match (e.g., $GRAPH_VERSION)
+            neo4j: Client to read from (default: Neo4jClient.get_default())
+        
+        Returns:
+            True if the tables were rewritten
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == current_version:
+            return False
+        self._snapshot = None  # Held for another version; reload below or on next snapshot()
+        if self.cached_version() == current_version:
+            return False
+        
+        neo4j = neo4j or Neo4jClient.get_default()
+        with neo4j.read_tx():
+            positions = neo4j.get_all_positions()
+            routines = neo4j.get_all_routines()
+            tool_locations = neo4j.get_tool_locations()
+            allowed_edges = neo4j.get_allowed_edges()
+            supported_at = neo4j.get_supported_at()
+        
+        with self._lock, self._conn as conn:
+            for statement in _SQL_CLEAR:
+                conn.execute(statement)
+            conn.executemany(_SQL_INSERT_POSITION, [(p["name"], p["role"]) for p in positions])
+            conn.executemany(_SQL_INSERT_ROUTINE, [(r["name"], r["required_tool"]) for r in routines])
+            conn.executemany(_SQL_INSERT_TOOL_LOCATION, list(tool_locations.items()))
+            conn.executemany(_SQL_INSERT_EDGE, allowed_edges)
+            conn.executemany(_SQL_INSERT_SUPPORTED_AT, supported_at)
+            conn.execute(_SQL_SET_VERSION, (current_version,))
+            self._snapshot = None
+        
+        logger.info("Graph cache refreshed", version=current_version,
+                   positions=len(positions), routines=len(routines))
+        return True
+    
+    def snapshot(self) -> Optional[GraphCacheSnapshot]:
+        """
+        Return the cached graph data, or None if the tables were never filled.
+        
+        Read from SQLite on first call after a refresh, then kept in memory.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        
+        with self._lock, self._conn as conn:
+            row = conn.execute(_SQL_GET_VERSION).fetchone()
+            if row is None:
+                return None
+            snapshot = GraphCacheSnapshot(
+                version=row["value"],
+                positions={r["name"]: r["role"] for r in conn.execute(_SQL_ALL_POSITIONS)},
+                routines={r["name"]: r["required_tool"] for r in conn.execute(_SQL_ALL_ROUTINES)},
+                tool_locations={r["tool"]: r["position"] for r in conn.execute(_SQL_ALL_TOOL_LOCATIONS)},
+                allowed_edges=frozenset(
+                    (r["from_position"], r["to_position"]) for r in conn.execute(_SQL_ALL_EDGES)
+                ),
+                supported_at=frozenset(
+                    (r["routine"], r["position"]) for r in conn.execute(_SQL_ALL_SUPPORTED_AT)
+                ),
+            )
+            self._snapshot = snapshot
+        return snapshot
+
+
+def get_graph_snapshot() -> Optional[GraphCacheSnapshot]:
+    """
+    Return the local graph data for $GRAPH_VERSION, refreshed from Neo4j when stale.
+    
+    Returns None when GRAPH_VERSION is unset: without a revision to compare
+    against, a stale copy could not be detected, so callers read Neo4j.
+    
+    Example:
+        >>> graph = get_graph_snapshot()
+        >>> ("<routine_name>", "<position_1>") in graph.supported_at
+        True
+    """
+    version = os.getenv("GRAPH_VERSION")
+    if not version:
+        return None
+    cache = GraphCacheDB.get_default()
+    cache.refresh_if_stale(version)
+    return cache.snapshot()
@@ -5,14 +5,235 @@ Graph is the single source of truth for system capabilities.
 See docs/knowledge/README.md for data model.
 """
 
+import atexit
 import os
-from typing import Dict, List, Optional, Tuple, Any
-from neo4j import GraphDatabase, Driver
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Final, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Any
+from neo4j import GraphDatabase, Driver, Session, Transaction, READ_ACCESS
 from src.core.observability.logging import get_logger
 
 logger = get_logger("neo4j_client")
 
 
+@dataclass(frozen=True, slots=True)
+class Neo4jConfig:
+    """Connection settings (values may be None when unset in the environment)."""
+    uri: Optional[str]
+    user: Optional[str]
+    password: Optional[str]
+    database: Optional[str] = None  # None = server default database
+    
+    @classmethod
+    def from_env(cls) -> "Neo4jConfig":
+        """Read settings from NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_DATABASE."""
+        env = os.environ
+        return cls(
+            uri=env.get("NEO4J_URI"),
+            user=env.get("NEO4J_USER"),
+            password=env.get("NEO4J_PASSWORD"),
+            database=env.get("NEO4J_DATABASE"),
+        )
+
+
+_env_config: Optional[Neo4jConfig] = None
+
+
+def get_env_config() -> Neo4jConfig:
+    """Return the environment config, read once on first use (after .env is loaded)."""
+    global _env_config
+    if _env_config is None:
+        _env_config = Neo4jConfig.from_env()
+    return _env_config
+
+
+# Connection pool settings for the shared driver
+MAX_CONNECTION_POOL_SIZE = 50
+CONNECTION_ACQUISITION_TIMEOUT = 30  # seconds
+# Fail fast when Neo4j is unreachable instead of waiting for the driver default
+CONNECTION_TIMEOUT = float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "5"))  # seconds
+
+# One driver per (uri, user), shared by every Neo4jClient in the process.
+# Drivers are thread-safe and own the Bolt connection pool, so creating one
+# per node invocation would throw the pool (and its handshakes) away each time.
+_shared_drivers: Dict[Tuple[str, str], Driver] = {}
+_shared_drivers_lock = threading.Lock()
+
+# Uniqueness constraints backing the name lookups used by this client.
+# Names match docs/seed_full.cypher so IF NOT EXISTS is a no-op on seeded graphs.
+_SCHEMA_CONSTRAINTS = (
+    "CREATE CONSTRAINT position_name_unique IF NOT EXISTS FOR (p:Position) REQUIRE p.name IS UNIQUE",
+    "CREATE CONSTRAINT tool_name_unique IF NOT EXISTS FOR (t:Tool) REQUIRE t.name IS UNIQUE",
+    "CREATE CONSTRAINT routine_name_unique IF NOT EXISTS FOR (r:Routine) REQUIRE r.name IS UNIQUE",
+)
+
+
+def _ensure_schema(driver: Driver):
+    """
+    Create name constraints (and their backing indexes) if missing.
+    
+    Without them every {name: $x} match starts with a label scan instead of
+    an index seek. Failures (e.g., read-only user, duplicate names) are logged
+    and ignored - queries still work, just slower.
+    """
+    try:
+        with driver.session() as session:
+            for statement in _SCHEMA_CONSTRAINTS:
+                session.run(statement).consume()
+        logger.info("Neo4j schema constraints ensured", count=len(_SCHEMA_CONSTRAINTS))
+    except Exception as e:
+        logger.warning("Could not ensure Neo4j schema constraints", error=str(e))
+
+
+def _get_shared_driver(uri: str, user: str, password: str) -> Driver:
+    """
+    Return the process-wide driver for uri/user, creating it on first use.
+    
+    Connectivity is verified and schema constraints are ensured only when
+    the driver is created.
+    """
+    key = (uri, user)
+    with _shared_drivers_lock:
+        driver = _shared_drivers.get(key)
+        if driver is None:
+            driver = GraphDatabase.driver(
+                uri,
+                auth=(user, password),
+                max_connection_pool_size=MAX_CONNECTION_POOL_SIZE,
+                connection_acquisition_timeout=CONNECTION_ACQUISITION_TIMEOUT,
+                connection_timeout=CONNECTION_TIMEOUT,
+            )
+            try:
+                driver.verify_connectivity()
+            except Exception:
+                driver.close()
+                raise
+            _ensure_schema(driver)
+            _shared_drivers[key] = driver
+            logger.info("Neo4j driver created", uri=uri)
+        return driver
+
+
+def prewarm_shared_driver():
+    """
+    Create and verify the default shared driver ahead of the first query.
+    
+    Meant to run in a background thread during startup so the Bolt handshake
+    overlaps with module imports. Failures are only logged; the first real
+    connect() retries and raises as usual.
+    """
+    try:
+        config = get_env_config()
+        if config.uri and config.user and config.password:
+            _get_shared_driver(config.uri, config.user, config.password)
+    except Exception as e:
+        logger.warning("Neo4j driver prewarm failed", error=str(e))
+
+
+def close_shared_drivers():
+    """Close all shared drivers (called automatically at process exit)."""
+    with _shared_drivers_lock:
+        for driver in _shared_drivers.values():
+            driver.close()
+        _shared_drivers.clear()
+
+
+atexit.register(close_shared_drivers)
+
+# Per-thread default clients (see Neo4jClient.get_default); sessions are not
+# thread-safe, so each thread keeps its own connected client
+_default_clients = threading.local()
+
+# Results of read-only lookups, keyed by ((uri, database), lookup, *args) and shared by all
+# clients. The graph is static for a CLI session; call Neo4jClient.invalidate()
+# after editing it. Cached values are shared - callers must not mutate them.
+_query_cache: Dict[Tuple, Any] = {}
+QUERY_CACHE_MAX_ENTRIES = 1024
+_MISSING = object()
+
+
+def _cypher(query: str) -> str:
+    """Collapse whitespace so only the query itself is sent over Bolt."""
+    return " ".join(query.split())
+
+
+# Read queries, kept as constants so the query text is identical on every
+# call and Neo4j's plan cache is hit (all values are passed as parameters).
+_Q_ALL_POSITIONS: Final = _cypher("""
+MATCH (p:Position)
+RETURN p.name AS name, p.role AS role, p.description AS description
+ORDER BY p.name
+""")
+
+_Q_ALL_TOOLS: Final = _cypher("""
+MATCH (t:Tool)
+RETURN t.name AS name, t.description AS description
+ORDER BY t.name
+""")
+
+_Q_ALL_ROUTINES: Final = _cypher("""
+MATCH (r:Routine)
+RETURN r.name AS name,
+       r.description AS description,
+       COALESCE(r.required_tool, 'none') AS required_tool
+ORDER BY r.name
+""")
+
+_Q_ROUTINE_BY_NAME: Final = _cypher("""
+MATCH (r:Routine {name: $routine_name})
+RETURN r.name AS name,
+       r.description AS description,
+       COALESCE(r.required_tool, 'none') AS required_tool
+""")
+
+_Q_TOOL_LOCATIONS: Final = _cypher("""
+MATCH (t:Tool)-[:TOOL_AVAILABLE_AT]->(s:ToolStand)-[:LOCATED_AT]->(p:Position)
+RETURN t.name AS tool, p.name AS position
+ORDER BY t.name
+""")
+
+_Q_SUPPORTED_POSITIONS: Final = _cypher("""
+MATCH (r:Routine {name: $routine_name})-[:SUPPORTED_AT]->(p:Position)
+RETURN p.name AS position_name
+ORDER BY position_name
+""")
+
+_Q_ADJACENCY: Final = _cypher("""
+MATCH (a:Position)-[:ONLY_ALLOWED_MOVE_TO]-(b:Position)
+RETURN a.name AS a, b.name AS b
+""")
+
+_Q_ROUTINE_METADATA: Final = _cypher("""
+MATCH (r:Routine {name: $routine_name})-[s:SUPPORTED_AT]->(p:Position {name: $position_name})
+RETURN s.stabilize AS stabilize,
+       s.action_after AS action_after,
+       s.verify AS verify
+""")
+
+_Q_ROUTINE_METADATA_BATCH: Final = _cypher("""
+UNWIND $pairs AS pair
+MATCH (r:Routine {name: pair[0]})-[s:SUPPORTED_AT]->(p:Position {name: pair[1]})
+RETURN pair[0] AS routine,
+       pair[1] AS position,
+       s.stabilize AS stabilize,
+       s.action_after AS action_after,
+       s.verify AS verify
+""")
+
+_Q_ROUTINES_BULK: Final = _cypher("""
+UNWIND $names AS n
+OPTIONAL MATCH (r:Routine {name: n})
+OPTIONAL MATCH (r)-[:SUPPORTED_AT]->(p:Position)
+RETURN n AS name,
+       r IS NOT NULL AS found,
+       r.description AS description,
+       COALESCE(r.required_tool, 'none') AS required_tool,
+       collect(DISTINCT p.name) AS supported_positions
+""")
+
+
 class Neo4jClient:
     """
     Neo4j graph database client for knowledge queries.
@@ -30,7 +251,8 @@ class Neo4jClient:
     - :TOOL_AVAILABLE_AT: Tool → Position
     """
     
-    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None):
+    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None,
+                 database: Optional[str] = None):
         """
         Initialize Neo4j connection from environment or explicit credentials.
         
@@ -38,38 +260,76 @@ class Neo4jClient:
             uri: Neo4j connection URI (default: $NEO4J_URI)
             user: Username (default: $NEO4J_USER)
             password: Password (default: $NEO4J_PASSWORD)
+            database: Database name (default: $NEO4J_DATABASE, else server default)
         """
         # Get configuration from environment (NO defaults - fail if missing)
-        self.uri = uri or os.getenv("NEO4J_URI")
-        if not self.uri:
-            raise ValueError("NEO4J_URI not set in .env file")
-        
-        self.user = user or os.getenv("NEO4J_USER")
-        if not self.user:
-            raise ValueError("NEO4J_USER not set in .env file")
+        config = get_env_config()
+        self.uri = uri or config.uri
+        self.user = user or config.user
+        self.password = password or config.password
+        self.database = database or config.database
         
-        self.password = password or os.getenv("NEO4J_PASSWORD")
-        if not self.password:
-            raise ValueError("NEO4J_PASSWORD not set in .env file")
+        for name, value in (("NEO4J_URI", self.uri), ("NEO4J_USER", self.user), ("NEO4J_PASSWORD", self.password)):
+            if not value:
+                raise ValueError(f"{name} not set in .env file")
         
         self.driver: Optional[Driver] = None
+        self._session: Optional[Session] = None
+        self._tx: Optional[Transaction] = None  # Begun by the first query inside read_tx()
+        self._tx_depth = 0  # Nesting depth of read_tx() blocks
         logger.info("Neo4j client initialized", uri=self.uri)
     
+    @classmethod
+    def get_default(cls) -> "Neo4jClient":
+        """
+        Return this thread's connected client for the environment config.
+        
+        Created and connected on first use in each thread and kept open, so
+        per-request callers skip client setup and session creation. Do not
+        close() it; the shared driver is closed at process exit.
+        
+        Example:
+            >>> positions = Neo4jClient.get_default().get_all_positions()
+        """
+        client = getattr(_default_clients, "client", None)
+        if client is None:
+            client = cls()
+            client.connect()
+            _default_clients.client = client
+        return client
+    
     def connect(self):
-        """Establish connection to Neo4j database."""
+        """
+        Attach to the shared Neo4j driver (created and verified on first use).
+        
+        The driver's connection pool is reused across clients, so repeated
+        connect()/close() cycles do not pay the Bolt handshake again.
+        Calling connect() on a connected client does nothing.
+        """
+        if self._session is not None:
+            return
         try:
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
-            # Test connection
-            self.driver.verify_connectivity()
+            self.driver = _get_shared_driver(self.uri, self.user, self.password)
+            # Long-lived read session reused by every query on this client;
+            # sessions only borrow a pooled connection per transaction.
+            # READ access lets cluster routing send queries to read replicas.
+            self._session = self.driver.session(default_access_mode=READ_ACCESS, database=self.database)
             logger.info("Neo4j connection established")
         except Exception as e:
             logger.error("Failed to connect to Neo4j", error=str(e))
             raise
     
     def close(self):
-        """Close Neo4j connection."""
+        """
+        Release this client's reference to the shared driver.
+        
+        The pooled driver itself stays open until close_shared_drivers().
+        """
+        if self._session:
+            self._session.close()
+            self._session = None
         if self.driver:
-            self.driver.close()
+            self.driver = None
             logger.info("Neo4j connection closed")
     
     def __enter__(self):
@@ -81,6 +341,96 @@ class Neo4jClient:
         """Context manager exit."""
         self.close()
     
+    @contextmanager
+    def read_tx(self) -> Iterator[None]:
+        """
+        Run every uncached lookup inside the block in one read transaction.
+        
+        Saves a transaction begin/commit per query when several lookups are
+        made back to back (e.g., the graph reads of one verification). The
+        transaction is begun by the first uncached lookup, so a block served
+        entirely from the query cache costs no round trip. Nested use joins
+        the outer block.
+        
+        Example:
+            >>> with client.read_tx():
+            ...     locations = client.get_tool_locations()
+            ...     routines = client.get_routines_bulk(["<routine_name>"])
+        """
+        self._tx_depth += 1
+        try:
+            yield
+            if self._tx_depth == 1 and self._tx is not None:
+                self._tx.commit()
+        finally:
+            self._tx_depth -= 1
+            if self._tx_depth == 0 and self._tx is not None:
+                try:
+                    self._tx.close()  # No-op after commit, rollback on error
+                finally:
+                    self._tx = None
+    
+    def _read(self, work: Callable[[Transaction], Any]) -> Any:
+        """Run work(tx) in the read_tx() transaction when inside one, else in a managed read transaction."""
+        if self._tx_depth:
+            if self._tx is None:
+                self._tx = self._session.begin_transaction()
+            return work(self._tx)
+        return self._session.execute_read(work)
+    
+    def _cache_get(self, lookup: str, *args) -> Any:
+        """Return cached lookup result, or _MISSING if not cached."""
+        return _query_cache.get(((self.uri, self.database), lookup) + args, _MISSING)
+    
+    def _cache_put(self, lookup: str, value: Any, *args) -> Any:
+        """Store lookup result and return it."""
+        if len(_query_cache) >= QUERY_CACHE_MAX_ENTRIES:
+            # Unknown names from LLM output can grow the per-name entries
+            _query_cache.clear()
+        _query_cache[((self.uri, self.database), lookup) + args] = value
+        return value
+    
+    def invalidate(self, lookup: Optional[str] = None):
+        """
+        Drop cached lookup results for this database.
+        
+        Args:
+            lookup: Lookup name (e.g., "all_positions", "adjacency") or None for all
+        """
+        for key in list(_query_cache):
+            if key[0] == (self.uri, self.database) and (lookup is None or key[1] == lookup):
+                _query_cache.pop(key, None)
+        logger.info("Neo4j query cache invalidated", lookup=lookup or "all")
+    
+    def _load_adjacency(self) -> Dict[str, Set[str]]:
+        """
+        Return the full :ONLY_ALLOWED_MOVE_TO graph as {position: {neighbours}}.
+        
+        The motion whitelist of a cell is small, so it is pulled once and
+        move checks and path search run in Python instead of per-call Cypher.
+        """
+        cached = self._cache_get("adjacency")
+        if cached is not _MISSING:
+            return cached
+        
+        def _read(tx):
+            adjacency: Dict[str, Set[str]] = {}
+            for a, b in tx.run(_Q_ADJACENCY).values("a", "b"):
+                adjacency.setdefault(a, set()).add(b)
+                adjacency.setdefault(b, set()).add(a)
+            return adjacency
+        
+        adjacency = self._read(_read)
+        logger.info("Loaded motion adjacency", positions=len(adjacency))
+        return self._cache_put("adjacency", adjacency)
+    
+    def refresh_topology(self):
+        """Reload the motion adjacency on next use (call after editing edges)."""
+        self.invalidate("adjacency")
+        self.invalidate("allowed_edges")
+        self.invalidate("path_tree")
+        self.invalidate("all_paths")
+    
     def get_all_positions(self) -> List[Dict[str, str]]:
         """
         Query all positions in the graph.
@@ -94,17 +444,13 @@ class Neo4jClient:
                 {"name": "<position_2>", "role": "safe_approach", "description": "<description>"}
             ]
         """
-        query = """
-        MATCH (p:Position)
-        RETURN p.name AS name, p.role AS role, p.description AS description
-        ORDER BY p.name
-        """
+        cached = self._cache_get("all_positions")
+        if cached is not _MISSING:
+            return cached
         
-        with self.driver.session() as session:
-            result = session.run(query)
-            positions = [dict(record) for record in result]
-            logger.info("Queried all positions", count=len(positions))
-            return positions
+        positions = self._read(lambda tx: tx.run(_Q_ALL_POSITIONS).data())
+        logger.info("Queried all positions", count=len(positions))
+        return self._cache_put("all_positions", positions)
     
     def get_all_tools(self) -> List[Dict[str, str]]:
         """
@@ -119,17 +465,13 @@ class Neo4jClient:
                 {"name": "<tool_2>", "description": "<description>"}
             ]
         """
-        query = """
-        MATCH (t:Tool)
-        RETURN t.name AS name, t.description AS description
-        ORDER BY t.name
-        """
+        cached = self._cache_get("all_tools")
+        if cached is not _MISSING:
+            return cached
         
-        with self.driver.session() as session:
-            result = session.run(query)
-            tools = [dict(record) for record in result]
-            logger.info("Queried all tools", count=len(tools))
-            return tools
+        tools = self._read(lambda tx: tx.run(_Q_ALL_TOOLS).data())
+        logger.info("Queried all tools", count=len(tools))
+        return self._cache_put("all_tools", tools)
     
     def get_all_routines(self) -> List[Dict[str, str]]:
         """
@@ -144,19 +486,13 @@ class Neo4jClient:
                 {"name": "<routine_2>", "description": "<description>", "required_tool": "<tool_name>"}
             ]
         """
-        query = """
-        MATCH (r:Routine)
-        RETURN r.name AS name, 
-               r.description AS description,
-               COALESCE(r.required_tool, 'none') AS required_tool
-        ORDER BY r.name
-        """
+        cached = self._cache_get("all_routines")
+        if cached is not _MISSING:
+            return cached
         
-        with self.driver.session() as session:
-            result = session.run(query)
-            routines = [dict(record) for record in result]
-            logger.info("Queried all routines", count=len(routines))
-            return routines
+        routines = self._read(lambda tx: tx.run(_Q_ALL_ROUTINES).data())
+        logger.info("Queried all routines", count=len(routines))
+        return self._cache_put("all_routines", routines)
     
     def get_routine_by_name(self, routine_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -172,23 +508,18 @@ class Neo4jClient:
             >>> client.get_routine_by_name("<routine_name>")
             {"name": "<routine_name>", "description": "<description>", "required_tool": "<tool_name>"}
         """
-        query = """
-        MATCH (r:Routine {name: $routine_name})
-        RETURN r.name AS name,
-               r.description AS description,
-               COALESCE(r.required_tool, 'none') AS required_tool
-        """
-        
-        with self.driver.session() as session:
-            result = session.run(query, routine_name=routine_name)
-            record = result.single()
-            if record:
-                routine_info = dict(record)
-                logger.info("Queried routine", routine_name=routine_name, found=True)
-                return routine_info
-            else:
-                logger.warning("Routine not found", routine_name=routine_name)
-                return None
+        cached = self._cache_get("routine_by_name", routine_name)
+        if cached is not _MISSING:
+            return cached
+        
+        record = self._read(lambda tx: tx.run(_Q_ROUTINE_BY_NAME, routine_name=routine_name).single())
+        if record:
+            routine_info = dict(record)
+            logger.info("Queried routine", routine_name=routine_name, found=True)
+            return self._cache_put("routine_by_name", routine_info, routine_name)
+        else:
+            logger.warning("Routine not found", routine_name=routine_name)
+            return self._cache_put("routine_by_name", None, routine_name)
     
     def get_tool_locations(self) -> Dict[str, str]:
         """
@@ -203,17 +534,13 @@ class Neo4jClient:
                 "<tool_2>": "<position_name>"
             }
         """
-        query = """
-        MATCH (t:Tool)-[:TOOL_AVAILABLE_AT]->(s:ToolStand)-[:LOCATED_AT]->(p:Position)
-        RETURN t.name AS tool, p.name AS position
-        ORDER BY t.name
-        """
+        cached = self._cache_get("tool_locations")
+        if cached is not _MISSING:
+            return cached
         
-        with self.driver.session() as session:
-            result = session.run(query)
-            locations = {record["tool"]: record["position"] for record in result}
-            logger.info("Queried tool locations", count=len(locations))
-            return locations
+        locations = self._read(lambda tx: dict(tx.run(_Q_TOOL_LOCATIONS).values("tool", "position")))
+        logger.info("Queried tool locations", count=len(locations))
+        return self._cache_put("tool_locations", locations)
     
     def get_allowed_moves(self, from_position: str) -> List[str]:
         """
@@ -229,17 +556,25 @@ class Neo4jClient:
             >>> client.get_allowed_moves("<position_name>")
             ["<position_1>", "<position_2>"]
         """
-        query = """
-        MATCH (current:Position {name: $from_name})-[:ONLY_ALLOWED_MOVE_TO]-(next:Position)
-        RETURN next.name AS position
-        ORDER BY position
+        allowed = sorted(self._load_adjacency().get(from_position, ()))
+        logger.info("Queried allowed moves", from_position=from_position, allowed_count=len(allowed))
+        return allowed
+    
+    def get_all_allowed_moves(self) -> Dict[str, List[str]]:
         """
+        Allowed direct moves for every position, from one adjacency load.
         
-        with self.driver.session() as session:
-            result = session.run(query, from_name=from_position)
-            allowed = [record["position"] for record in result]
-            logger.info("Queried allowed moves", from_position=from_position, allowed_count=len(allowed))
-            return allowed
+        Returns:
+            Dict mapping position name to sorted reachable position names
+            (positions without edges are absent)
+        
+        Example:
+            >>> client.get_all_allowed_moves()
+            {"<position_1>": ["<position_2>"], "<position_2>": ["<position_1>"]}
+        """
+        allowed = {pos: sorted(neighbours) for pos, neighbours in self._load_adjacency().items()}
+        logger.info("Queried all allowed moves", position_count=len(allowed))
+        return allowed
     
     def is_move_allowed(self, from_position: str, to_position: str) -> bool:
         """
@@ -256,16 +591,29 @@ class Neo4jClient:
             >>> client.is_move_allowed("<position_1>", "<position_2>")
             True
         """
-        query = """
-        MATCH (a:Position {name: $from_name})-[:ONLY_ALLOWED_MOVE_TO]-(b:Position {name: $to_name})
-        RETURN COUNT(*) > 0 AS allowed
+        allowed = to_position in self._load_adjacency().get(from_position, ())
+        logger.info("Checked edge whitelist", from_position=from_position, to_position=to_position, allowed=allowed)
+        return allowed
+    
+    def get_allowed_edges(self) -> FrozenSet[Tuple[str, str]]:
         """
+        Every allowed direct move as a (from_position, to_position) pair.
         
-        with self.driver.session() as session:
-            result = session.run(query, from_name=from_position, to_name=to_position)
-            allowed = result.single()["allowed"]
-            logger.info("Checked edge whitelist", from_position=from_position, to_position=to_position, allowed=allowed)
-            return allowed
+        Both directions of each :ONLY_ALLOWED_MOVE_TO edge are included, so
+        a move check is a single set lookup (e.g., every move of a plan).
+        
+        Example:
+            >>> ("<position_1>", "<position_2>") in client.get_allowed_edges()
+            True
+        """
+        cached = self._cache_get("allowed_edges")
+        if cached is not _MISSING:
+            return cached
+        
+        edges = frozenset(
+            (a, b) for a, neighbours in self._load_adjacency().items() for b in neighbours
+        )
+        return self._cache_put("allowed_edges", edges)
     
     def get_supported_positions(self, routine_name: str) -> List[str]:
         """
@@ -281,17 +629,15 @@ class Neo4jClient:
             >>> client.get_supported_positions("<routine_name>")
             ["<position_1>", "<position_2>"]
         """
-        query = """
-        MATCH (r:Routine {name: $routine_name})-[:SUPPORTED_AT]->(p:Position)
-        RETURN p.name AS position_name
-        ORDER BY position_name
-        """
+        cached = self._cache_get("supported_positions", routine_name)
+        if cached is not _MISSING:
+            return cached
         
-        with self.driver.session() as session:
-            result = session.run(query, routine_name=routine_name)
-            positions = [record["position_name"] for record in result]
-            logger.info("Retrieved supported positions", routine=routine_name, positions=positions)
-            return positions
+        positions = self._read(
+            lambda tx: tx.run(_Q_SUPPORTED_POSITIONS, routine_name=routine_name).value("position_name")
+        )
+        logger.info("Retrieved supported positions", routine=routine_name, positions=positions)
+        return self._cache_put("supported_positions", positions, routine_name)
     
     def get_routine_metadata(self, routine_name: str, position_name: str) -> Optional[Dict[str, any]]:
         """
@@ -308,24 +654,100 @@ class Neo4jClient:
             >>> client.get_routine_metadata("<routine_name>", "<position_name>")
             {"stabilize": 1.5, "action_after": "<action_name>", "verify": "<verify_routine>"}
         """
-        query = """
-        MATCH (r:Routine {name: $routine_name})-[s:SUPPORTED_AT]->(p:Position {name: $position_name})
-        RETURN s.stabilize AS stabilize,
-               s.action_after AS action_after,
-               s.verify AS verify
-        """
-        
-        with self.driver.session() as session:
-            result = session.run(query, routine_name=routine_name, position_name=position_name)
-            record = result.single()
-            
-            if record:
-                metadata = dict(record)
-                logger.info("Retrieved routine metadata", routine=routine_name, position=position_name, metadata=metadata)
-                return metadata
+        cached = self._cache_get("routine_metadata", routine_name, position_name)
+        if cached is not _MISSING:
+            return cached
+        
+        record = self._read(
+            lambda tx: tx.run(_Q_ROUTINE_METADATA, routine_name=routine_name, position_name=position_name).single()
+        )
+        
+        if record:
+            metadata = dict(record)
+            logger.info("Retrieved routine metadata", routine=routine_name, position=position_name, metadata=metadata)
+        else:
+            metadata = None
+            logger.warning("Routine not supported at position", routine=routine_name, position=position_name)
+        return self._cache_put("routine_metadata", metadata, routine_name, position_name)
+    
+    def get_routine_metadata_batch(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+        """
+        Query routine metadata for several (routine, position) pairs in one round-trip.
+        
+        Pairs already cached are not sent; the rest are resolved with a
+        single UNWIND query and cached like get_routine_metadata results.
+        
+        Args:
+            pairs: (routine_name, position_name) tuples
+        
+        Returns:
+            Dict mapping each pair to its metadata dict, or None if the
+            routine is not supported at that position
+        
+        Example:
+            >>> client.get_routine_metadata_batch([("<routine_name>", "<position_name>")])
+            {("<routine_name>", "<position_name>"): {"stabilize": 1.5, "action_after": None, "verify": None}}
+        """
+        result: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        missing = []
+        for pair in dict.fromkeys(pairs):
+            cached = self._cache_get("routine_metadata", *pair)
+            if cached is _MISSING:
+                missing.append(pair)
             else:
-                logger.warning("Routine not supported at position", routine=routine_name, position=position_name)
-                return None
+                result[pair] = cached
+        
+        if missing:
+            records = self._read(
+                lambda tx: tx.run(_Q_ROUTINE_METADATA_BATCH, pairs=[list(pair) for pair in missing]).data()
+            )
+            found = {
+                (record.pop("routine"), record.pop("position")): record
+                for record in records
+            }
+            for pair in missing:
+                result[pair] = self._cache_put("routine_metadata", found.get(pair), *pair)
+            logger.info("Retrieved routine metadata batch", requested=len(missing), found=len(found))
+        
+        return result
+    
+    def _path_tree(self, from_position: str) -> Dict[str, Optional[str]]:
+        """
+        Return the breadth-first search tree from a position as {position: previous}.
+        
+        Covers every reachable position, so one search answers all shortest
+        paths from the same start. Cached until refresh_topology().
+        """
+        cached = self._cache_get("path_tree", from_position)
+        if cached is not _MISSING:
+            return cached
+        
+        adjacency = self._load_adjacency()
+        # previous[] doubles as the visited set
+        previous: Dict[str, Optional[str]] = {from_position: None}
+        queue = deque([from_position])
+        while queue:
+            current = queue.popleft()
+            # Sorted so ties between equal-length routes do not depend on the
+            # string hash seed (same command, same route in every process)
+            for neighbour in sorted(adjacency.get(current, ())):
+                if neighbour not in previous:
+                    previous[neighbour] = current
+                    queue.append(neighbour)
+        return self._cache_put("path_tree", previous, from_position)
+    
+    @staticmethod
+    def _path_from_tree(previous: Dict[str, Optional[str]], to_position: str) -> Optional[List[str]]:
+        """Walk a search tree back from to_position; None if it was not reached."""
+        if to_position not in previous:
+            return None
+        path = []
+        current = to_position
+        while current is not None:
+            path.append(current)
+            current = previous[current]
+        path.reverse()
+        return path
     
     def get_shortest_path(self, from_position: str, to_position: str) -> Optional[List[str]]:
         """
@@ -342,19 +764,117 @@ class Neo4jClient:
             >>> client.get_shortest_path("<position_1>", "<position_2>")
             ["<position_1>", "<position_3>", "<position_2>"]
         """
-        query = """
-        MATCH path = shortestPath((start:Position {name: $from_name})-[:ONLY_ALLOWED_MOVE_TO*]-(end:Position {name: $to_name}))
-        RETURN [node IN nodes(path) | node.name] AS positions
+        path = self._path_from_tree(self._path_tree(from_position), to_position)
+        
+        if path:
+            logger.info("Calculated shortest path", from_position=from_position, to_position=to_position, path=path)
+            return path
+        else:
+            logger.warning("No path found", from_position=from_position, to_position=to_position)
+            return None
+    
+    def get_all_shortest_paths(self) -> Dict[Tuple[str, str], List[str]]:
+        """
+        Shortest valid path between every pair of connected positions.
+        
+        The motion graph is small, so the full table is built once from the
+        cached search trees and then served as a dict lookup. Cached until
+        refresh_topology(); unreachable and same-position pairs are absent.
+        
+        Returns:
+            Dict mapping (from_position, to_position) to the ordered path
+        
+        Example:
+            >>> client.get_all_shortest_paths()[("<position_1>", "<position_2>")]
+            ["<position_1>", "<position_3>", "<position_2>"]
+        """
+        cached = self._cache_get("all_paths")
+        if cached is not _MISSING:
+            return cached
+        
+        table: Dict[Tuple[str, str], List[str]] = {}
+        for from_position in self._load_adjacency():
+            tree = self._path_tree(from_position)
+            for to_position in tree:
+                if to_position != from_position:
+                    table[(from_position, to_position)] = self._path_from_tree(tree, to_position)
+        
+        logger.info("Computed all-pairs shortest paths", pair_count=len(table))
+        return self._cache_put("all_paths", table)
+    
+    def get_routines_bulk(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
         """
+        Query routine info and supported positions for several routines in one round-trip.
         
-        with self.driver.session() as session:
-            result = session.run(query, from_name=from_position, to_name=to_position)
-            record = result.single()
-            
-            if record:
-                path = record["positions"]
-                logger.info("Calculated shortest path", from_position=from_position, to_position=to_position, path=path)
-                return path
+        Names already resolved are not sent; the rest are resolved with a
+        single UNWIND query and also cached as get_routine_by_name and
+        get_supported_positions results.
+        
+        Args:
+            names: Routine names
+        
+        Returns:
+            Dict mapping each name to {"info": routine dict or None,
+            "supported_positions": sorted position names,
+            "supported_set": the same positions as a frozenset, for membership checks}
+        
+        Example:
+            >>> client.get_routines_bulk(["<routine_name>"])
+            {"<routine_name>": {"info": {"name": "<routine_name>", "description": "<description>",
+                                         "required_tool": "<tool_name>"},
+                                "supported_positions": ["<position_1>", "<position_2>"],
+                                "supported_set": frozenset({"<position_1>", "<position_2>"})}}
+        """
+        result: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for name in dict.fromkeys(names):
+            entry = self._cache_get("routine_entry", name)
+            if entry is _MISSING:
+                missing.append(name)
             else:
-                logger.warning("No path found", from_position=from_position, to_position=to_position)
-                return None
+                result[name] = entry
+        
+        if missing:
+            records = self._read(lambda tx: tx.run(_Q_ROUTINES_BULK, names=missing).data())
+            for record in records:
+                name = record["name"]
+                info = None
+                if record["found"]:
+                    info = {
+                        "name": name,
+                        "description": record["description"],
+                        "required_tool": record["required_tool"],
+                    }
+                positions = sorted(record["supported_positions"])
+                self._cache_put("routine_by_name", info, name)
+                self._cache_put("supported_positions", positions, name)
+                result[name] = self._cache_put("routine_entry", {
+                    "info": info,
+                    "supported_positions": positions,
+                    "supported_set": frozenset(positions),
+                }, name)
+            logger.info("Queried routines in bulk", requested=len(missing), found=sum(r["found"] for r in records))
+        
+        return result
+    
+    def get_supported_at(self) -> FrozenSet[Tuple[str, str]]:
+        """
+        Every (routine, position) pair joined by a :SUPPORTED_AT edge.
+        
+        Built from get_routines_bulk() over all routines (one query on a cold
+        cache), so support checks for a whole plan need no further reads.
+        
+        Example:
+            >>> ("<routine_name>", "<position_1>") in client.get_supported_at()
+            True
+        """
+        cached = self._cache_get("supported_at")
+        if cached is not _MISSING:
+            return cached
+        
+        entries = self.get_routines_bulk([r["name"] for r in self.get_all_routines()])
+        pairs = frozenset(
+            (name, position) for name, entry in entries.items() for position in entry["supported_set"]
+        )
+        logger.info("Loaded supported routine positions", pair_count=len(pairs))
+        return self._cache_put("supported_at", pairs)
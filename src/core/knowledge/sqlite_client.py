@@ -4,17 +4,191 @@ Manages robot state (current status) and history (run logs).
 See docs/knowledge/README.md for schema definitions.
 """
 
+import json
 import os
 import sqlite3
-from datetime import datetime
+import threading
+import weakref
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
-from src.core.observability.logging import get_logger
+from typing import Dict, List, Optional, Tuple, Union
+from src.core.observability.logging import get_logger, utc_now_iso
+
+try:
+    import orjson  # Optional: faster serialization of stored plans
+except ImportError:
+    orjson = None
 
 logger = get_logger("sqlite_client")
 
+# Applied to every connection. WAL lets replay/history reads run alongside
+# step updates, and synchronous=NORMAL is durable under WAL except for the
+# last commits on power loss.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA busy_timeout=5000",  # ms
+)
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Runtime statements, defined once so every call passes the same SQL text and
+# hits the connection's prepared-statement cache instead of re-parsing.
+_SQL_GET_STATE = "SELECT current_position, current_tool, last_updated FROM robot_state WHERE id = 1"
+
+_SQL_UPDATE_POSITION = """
+UPDATE robot_state
+SET current_position = ?, last_updated = ?
+WHERE id = 1
+"""
+
+_SQL_UPDATE_TOOL = """
+UPDATE robot_state
+SET current_tool = ?, last_updated = ?
+WHERE id = 1
+"""
+
+_SQL_UPDATE_STATE = """
+UPDATE robot_state
+SET current_position = ?, current_tool = ?, last_updated = ?
+WHERE id = 1
+"""
+
+_SQL_CREATE_RUN = """
+INSERT INTO runs (run_id, operator_input, sequence_json, status, started_at)
+VALUES (?, ?, ?, 'pending', ?)
+"""
+
+_SQL_UPDATE_RUN_STATUS = """
+UPDATE runs
+SET status = ?, finished_at = ?
+WHERE run_id = ?
+"""
+
+_SQL_ADD_STEP = """
+INSERT INTO run_steps (run_id, position, action, state, started_at)
+VALUES (?, ?, ?, 'pending', ?)
+"""
+
+_SQL_ADD_FINISHED_STEP = """
+INSERT INTO run_steps (run_id, position, action, state, started_at, finished_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPDATE_STEP_STATE = """
+UPDATE run_steps
+SET state = ?, error = ?, finished_at = ?
+WHERE step_id = ?
+"""
+
+_SQL_LATEST_COMPLETED_RUN = """
+SELECT run_id, operator_input, sequence_json, finished_at
+FROM runs
+WHERE status = 'completed'
+ORDER BY finished_at DESC
+LIMIT 1
+"""
+
+_SQL_RUN_BY_ID = """
+SELECT run_id, operator_input, sequence_json, status, finished_at
+FROM runs
+WHERE run_id = ?
+"""
+
+_SQL_RUN_SUMMARY_BY_ID = """
+SELECT run_id, operator_input, status, finished_at
+FROM runs
+WHERE run_id = ?
+"""
+
+_SQL_PLAN_JSON_BY_ID = """
+SELECT sequence_json
+FROM runs
+WHERE run_id = ?
+LIMIT 1
+"""
+
+_SQL_RUNS_BY_DATE = """
+SELECT run_id, operator_input, status, started_at, finished_at
+FROM runs
+WHERE started_at >= ? AND started_at < ?
+ORDER BY started_at DESC
+"""
+
+_SQL_RECENT_RUNS = """
+SELECT run_id, operator_input, status, started_at, finished_at
+FROM runs
+WHERE started_at >= ?
+ORDER BY started_at DESC
+LIMIT ?
+"""
+
+_SQL_FAILED_POSITIONS = """
+SELECT position
+FROM run_steps
+WHERE run_id = ? AND state = 'error'
+ORDER BY step_id
+"""
+
+
+def _dict_factory(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, object]:
+    """Row factory building the column dict directly (no sqlite3.Row + dict() copy)."""
+    return dict(zip([column[0] for column in cursor.description], row))
+
+
+# Process-wide instances returned by get_default(), one per client class
+_default_dbs: Dict[type, "_SQLiteDB"] = {}
+_default_lock = threading.Lock()
+
 
-class RobotStateDB:
+class _SQLiteDB:
+    """
+    Base for the SQLite clients: one persistent connection per instance.
+    
+    Opening a connection per call costs open/close syscalls and a cold page
+    cache every time. The connection is shared across threads behind a lock
+    and closed when the instance is garbage collected or at process exit.
+    """
+    
+    @classmethod
+    def get_default(cls):
+        """
+        Return the shared instance for the env-configured database path.
+        
+        Created on first use; callers must not close() it.
+        
+        Example:
+            >>> state = RobotStateDB.get_default().get_state()
+        """
+        db = _default_dbs.get(cls)
+        if db is None:
+            with _default_lock:
+                db = _default_dbs.get(cls)
+                if db is None:
+                    db = _default_dbs[cls] = cls()
+        return db
+    
+    def _connect(self):
+        """Open the persistent connection (call once db_path is set)."""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                     cached_statements=STATEMENT_CACHE_SIZE)
+        self._conn.row_factory = _dict_factory
+        for pragma in _PRAGMAS:
+            self._conn.execute(pragma)
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, self._conn.close)
+    
+    def close(self):
+        """Close the connection (safe to call more than once)."""
+        self._finalizer()
+
+
+class RobotStateDB(_SQLiteDB):
     """
     Single-row table tracking current robot state.
     
@@ -36,13 +210,13 @@ class RobotStateDB:
             db_path: Path to SQLite file (default: $SQLITE_STATE_DB or data/robot_state.db)
         """
         self.db_path = db_path or os.getenv("SQLITE_STATE_DB", "data/robot_state.db")
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connect()
         self._initialize_schema()
         logger.info("RobotStateDB initialized", db_path=self.db_path)
     
     def _initialize_schema(self):
         """Create table and seed default state if empty."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             # Create table (simplified - no target state locking)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS robot_state (
@@ -53,13 +227,12 @@ class RobotStateDB:
                 )
             """)
             
-            # Check if empty and seed
-            cursor = conn.execute("SELECT COUNT(*) FROM robot_state")
-            if cursor.fetchone()[0] == 0:
-                conn.execute("""
-                    INSERT INTO robot_state (id, current_position, current_tool, last_updated)
-                    VALUES (1, 'Home', 'none', ?)
-                """, (datetime.utcnow().isoformat(),))
+            # Seed the single row if missing (no-op when it exists)
+            cursor = conn.execute("""
+                INSERT OR IGNORE INTO robot_state (id, current_position, current_tool, last_updated)
+                VALUES (1, 'Home', 'none', ?)
+            """, (utc_now_iso(),))
+            if cursor.rowcount == 1:
                 logger.info("Seeded default robot state", position="Home", tool="none")
     
     def get_state(self) -> Dict[str, str]:
@@ -80,11 +253,9 @@ class RobotStateDB:
                 "last_updated": "2025-01-15T12:34:56"
             }
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("SELECT current_position, current_tool, last_updated FROM robot_state WHERE id = 1")
-            row = cursor.fetchone()
-            state = dict(row)
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_SQL_GET_STATE)
+            state = cursor.fetchone()
             logger.info("Retrieved robot state", state=state)
             return state
     
@@ -95,12 +266,8 @@ class RobotStateDB:
         Args:
             position: New position name
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE robot_state
-                SET current_position = ?, last_updated = ?
-                WHERE id = 1
-            """, (position, datetime.utcnow().isoformat()))
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_UPDATE_POSITION, (position, utc_now_iso()))
             logger.info("Updated robot position", position=position)
     
     def update_tool(self, tool: str):
@@ -110,16 +277,24 @@ class RobotStateDB:
         Args:
             tool: Tool name or "none"
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE robot_state
-                SET current_tool = ?, last_updated = ?
-                WHERE id = 1
-            """, (tool, datetime.utcnow().isoformat()))
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_UPDATE_TOOL, (tool, utc_now_iso()))
             logger.info("Updated robot tool", tool=tool)
+    
+    def update_state(self, position: str, tool: str):
+        """
+        Update position and tool in a single write (e.g., after a whole plan).
+        
+        Args:
+            position: New position name
+            tool: Tool name or "none"
+        """
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_UPDATE_STATE, (position, tool, utc_now_iso()))
+            logger.info("Updated robot state", position=position, tool=tool)
 
 
-class HistoryDB:
+class HistoryDB(_SQLiteDB):
     """
     Run history and step tracking for replay and analysis.
     
@@ -151,13 +326,13 @@ class HistoryDB:
             db_path: Path to SQLite file (default: $SQLITE_HISTORY_DB or data/history.db)
         """
         self.db_path = db_path or os.getenv("SQLITE_HISTORY_DB", "data/history.db")
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connect()
         self._initialize_schema()
         logger.info("HistoryDB initialized", db_path=self.db_path)
     
     def _initialize_schema(self):
         """Create tables for runs and run_steps."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS runs (
                     run_id TEXT PRIMARY KEY,
@@ -182,22 +357,31 @@ class HistoryDB:
                     FOREIGN KEY (run_id) REFERENCES runs (run_id)
                 )
             """)
+            
+            # Indexes for failed-position, by-date and latest-completed lookups
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_steps_run_state ON run_steps (run_id, state)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_status_finished ON runs (status, finished_at DESC)")
             logger.info("History schema initialized")
     
-    def create_run(self, run_id: str, operator_input: str, sequence_json: str) -> None:
+    def create_run(self, run_id: str, operator_input: str, sequence_json: Union[str, list]) -> None:
         """
         Create new run entry with pending status.
         
         Args:
             run_id: UUIDv4 correlation_id
             operator_input: Original operator command
-            sequence_json: Validated JSON plan (before YAML conversion)
+            sequence_json: Validated plan (before YAML conversion), either
+                already serialized or as a list (stored as compact JSON)
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO runs (run_id, operator_input, sequence_json, status, started_at)
-                VALUES (?, ?, ?, 'pending', ?)
-            """, (run_id, operator_input, sequence_json, datetime.utcnow().isoformat()))
+        if not isinstance(sequence_json, str):
+            if orjson is not None:
+                sequence_json = orjson.dumps(sequence_json).decode()
+            else:
+                sequence_json = json.dumps(sequence_json, separators=(",", ":"))
+        
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_CREATE_RUN, (run_id, operator_input, sequence_json, utc_now_iso()))
             logger.info("Created run entry", run_id=run_id)
     
     def update_run_status(self, run_id: str, status: str) -> None:
@@ -208,12 +392,8 @@ class HistoryDB:
             run_id: Run correlation ID
             status: New status value
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE runs
-                SET status = ?, finished_at = ?
-                WHERE run_id = ?
-            """, (status, datetime.utcnow().isoformat(), run_id))
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_UPDATE_RUN_STATUS, (status, utc_now_iso(), run_id))
             logger.info("Updated run status", run_id=run_id, status=status)
     
     def add_step(self, run_id: str, position: str, action: str) -> int:
@@ -228,11 +408,8 @@ class HistoryDB:
         Returns:
             step_id (auto-incremented)
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                INSERT INTO run_steps (run_id, position, action, state, started_at)
-                VALUES (?, ?, ?, 'pending', ?)
-            """, (run_id, position, action, datetime.utcnow().isoformat()))
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_SQL_ADD_STEP, (run_id, position, action, utc_now_iso()))
             step_id = cursor.lastrowid
             logger.info("Added run step", run_id=run_id, step_id=step_id, position=position, action=action)
             return step_id
@@ -246,14 +423,30 @@ class HistoryDB:
             state: New state value
             error: Error message if state is "error"
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE run_steps
-                SET state = ?, error = ?, finished_at = ?
-                WHERE step_id = ?
-            """, (state, error, datetime.utcnow().isoformat(), step_id))
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_UPDATE_STEP_STATE, (state, error, utc_now_iso(), step_id))
             logger.info("Updated step state", step_id=step_id, state=state, error=error)
     
+    def record_finished_steps(self, run_id: str, steps: List[Tuple[str, str]], run_status: str = "completed") -> None:
+        """
+        Record already-executed steps and the final run status in one transaction.
+        
+        Used when the steps ran outside the system (e.g., socket mode), so
+        there is no per-step progress to track: one commit per run.
+        
+        Args:
+            run_id: Run correlation ID
+            steps: List of (position, action) tuples in execution order
+            run_status: Final run status (completed | failed)
+        """
+        now = utc_now_iso()
+        state = "completed" if run_status == "completed" else "error"
+        with self._lock, self._conn as conn:
+            conn.executemany(_SQL_ADD_FINISHED_STEP,
+                             [(run_id, position, action, state, now, now) for position, action in steps])
+            conn.execute(_SQL_UPDATE_RUN_STATUS, (run_status, now, run_id))
+            logger.info("Recorded finished steps", run_id=run_id, count=len(steps), status=run_status)
+    
     def get_latest_completed_run(self) -> Optional[Dict[str, str]]:
         """
         Retrieve most recent successfully completed run for replay.
@@ -270,52 +463,53 @@ class HistoryDB:
                 "finished_at": "2025-01-15T14:30:00"
             }
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT run_id, operator_input, sequence_json, finished_at
-                FROM runs
-                WHERE status = 'completed'
-                ORDER BY finished_at DESC
-                LIMIT 1
-            """)
-            row = cursor.fetchone()
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_SQL_LATEST_COMPLETED_RUN)
+            run = cursor.fetchone()
             
-            if row:
-                run = dict(row)
+            if run:
                 logger.info("Retrieved latest completed run", run_id=run["run_id"])
                 return run
             else:
                 logger.warning("No completed runs found")
                 return None
     
-    def get_run_by_id(self, run_id: str) -> Optional[Dict[str, str]]:
+    def get_run_by_id(self, run_id: str, include_sequence: bool = True) -> Optional[Dict[str, str]]:
         """
         Retrieve specific run by ID for replay.
         
         Args:
             run_id: Run correlation ID (UUID)
+            include_sequence: Also read sequence_json (False skips the plan
+                blob, e.g. when the parsed plan is already cached)
         
         Returns:
-            Dict with keys: run_id, operator_input, sequence_json, status, finished_at (or None)
+            Dict with keys: run_id, operator_input, sequence_json (if
+            include_sequence), status, finished_at (or None)
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT run_id, operator_input, sequence_json, status, finished_at
-                FROM runs
-                WHERE run_id = ?
-            """, (run_id,))
-            row = cursor.fetchone()
+        query = _SQL_RUN_BY_ID if include_sequence else _SQL_RUN_SUMMARY_BY_ID
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(query, (run_id,))
+            run = cursor.fetchone()
             
-            if row:
-                run = dict(row)
+            if run:
                 logger.info("Retrieved run by ID", run_id=run_id, status=run["status"])
                 return run
             else:
                 logger.warning("Run not found", run_id=run_id)
                 return None
     
+    def get_plan_json(self, run_id: str) -> Optional[str]:
+        """
+        Return only the stored sequence_json of a run (None if not found).
+        
+        Example:
+            >>> plan = orjson.loads(db.get_plan_json("abc-123"))
+        """
+        with self._lock, self._conn as conn:
+            row = conn.execute(_SQL_PLAN_JSON_BY_ID, (run_id,)).fetchone()
+        return row["sequence_json"] if row else None
+    
     def get_runs_by_date(self, date: str) -> List[Dict[str, str]]:
         """
         Query runs on specific date.
@@ -330,18 +524,41 @@ class HistoryDB:
             >>> db.get_runs_by_date("2025-01-15")
             [{"run_id": "abc-123", "operator_input": "...", "status": "completed", ...}]
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT run_id, operator_input, status, started_at, finished_at
-                FROM runs
-                WHERE DATE(started_at) = DATE(?)
-                ORDER BY started_at DESC
-            """, (date,))
-            runs = [dict(row) for row in cursor.fetchall()]
+        # Half-open range on the raw ISO text so idx_runs_started_at is used
+        # (wrapping the column in DATE() forces a full scan)
+        day = datetime.strptime(date[:10], "%Y-%m-%d").date()
+        day_start = day.isoformat()
+        day_end = (day + timedelta(days=1)).isoformat()
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_SQL_RUNS_BY_DATE, (day_start, day_end))
+            runs = cursor.fetchall()
             logger.info("Queried runs by date", date=date, count=len(runs))
             return runs
     
+    def get_recent_runs(self, since: datetime, limit: int) -> List[Dict[str, str]]:
+        """
+        Query the most recent runs started at or after a point in time.
+        
+        Args:
+            since: Earliest start time (naive datetimes are local time)
+            limit: Maximum number of runs to return
+        
+        Returns:
+            List of run dicts (newest first) with keys: run_id, operator_input,
+            status, started_at, finished_at
+        
+        Example:
+            >>> db.get_recent_runs(datetime.now() - timedelta(days=1), 15)
+            [{"run_id": "abc-123", "operator_input": "...", "status": "completed", ...}]
+        """
+        # started_at is stored as naive UTC ISO text, so compare in UTC
+        since_utc = since.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_SQL_RECENT_RUNS, (since_utc, limit))
+            runs = cursor.fetchall()
+            logger.info("Queried recent runs", since=since_utc, count=len(runs))
+            return runs
+    
     def get_failed_positions(self, run_id: str) -> List[str]:
         """
         Find which positions failed during a run.
@@ -356,13 +573,8 @@ class HistoryDB:
             >>> db.get_failed_positions("abc-123")
             ["<position_1>", "<position_2>"]
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT position
-                FROM run_steps
-                WHERE run_id = ? AND state = 'error'
-                ORDER BY step_id
-            """, (run_id,))
-            positions = [row[0] for row in cursor.fetchall()]
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_SQL_FAILED_POSITIONS, (run_id,))
+            positions = [row["position"] for row in cursor.fetchall()]
             logger.info("Queried failed positions", run_id=run_id, positions=positions)
             return positions
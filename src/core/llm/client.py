@@ -3,17 +3,69 @@ LLM Client - Unified Interface for Language Model Providers
 Supports OpenAI and Ollama with consistent API.
 """
 
+import json
 import os
-from typing import Optional
+import threading
+from typing import Any, Dict, Iterator, Optional
 from src.core.observability.logging import get_logger
 
 logger = get_logger("llm_client")
 
+# HTTP clients shared by every LLMClient (nodes create a client per call).
+# Reusing them keeps connections alive between completions instead of paying
+# TCP (and TLS) setup each time. SDKs are imported lazily on first use.
+_http_session = None
+_openai_clients: Dict[str, Any] = {}
+_default_client: Optional["LLMClient"] = None
+_clients_lock = threading.Lock()
+
+
+def _get_http_session():
+    """Return the shared requests.Session (keep-alive pool, retries on connect errors)."""
+    global _http_session
+    with _clients_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                  max_retries=Retry(total=2, backoff_factor=0.1))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def _get_openai_client(api_key: str):
+    """Return the shared OpenAI client for api_key (the SDK pools connections)."""
+    with _clients_lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            from openai import OpenAI
+            client = _openai_clients[api_key] = OpenAI(api_key=api_key)
+        return client
+
+
+def _chat_messages(prompt: str, system: Optional[str]) -> list:
+    """Chat messages for prompt, preceded by the system message if given."""
+    if system:
+        return [{"role": "system", "content": system}, {"role": "user", "content": prompt}]
+    return [{"role": "user", "content": prompt}]
+
 
 class LLMClient:
     """
     Unified interface for LLM providers.
     Automatically selects provider based on MODEL_PROVIDER env var.
+    
+    generate() is safe to call from several threads at once: requests go
+    out concurrently over the shared connection pools (up to 16 per host),
+    so a batching server (Ollama with OLLAMA_NUM_PARALLEL > 1, vLLM) can
+    schedule them together. Neither the chat-completions API nor Ollama's
+    /api/generate accepts a list of prompts, so there is no client-side
+    batching.
     """
     
     def __init__(self):
@@ -28,6 +80,8 @@ class LLMClient:
                 raise ValueError("MODEL_NAME not set in .env file")
             if not self.api_key:
                 raise ValueError("OPENAI_API_KEY not set in .env file")
+            self._generate_impl = self._openai_generate
+            self._stream_impl = self._openai_stream
                 
         elif self.provider == "ollama":
             self.model_name = os.getenv("OLLAMA_MODEL")
@@ -35,15 +89,40 @@ class LLMClient:
             
             if not self.model_name:
                 raise ValueError("OLLAMA_MODEL not set in .env file")
+            self._generate_impl = self._ollama_generate
+            self._stream_impl = self._ollama_stream
         else:
             raise ValueError(f"Unknown MODEL_PROVIDER: {self.provider}")
     
+    @classmethod
+    def get_default(cls) -> "LLMClient":
+        """
+        Return the shared client for the env-configured provider.
+        
+        Created on first use (raising ValueError if the provider settings
+        are missing, as the constructor does) and reused by every node.
+        
+        Example:
+            >>> text = LLMClient.get_default().generate(prompt, correlation_id)
+        """
+        global _default_client
+        client = _default_client
+        if client is None:
+            with _clients_lock:
+                if _default_client is None:
+                    _default_client = cls()
+                client = _default_client
+        return client
+    
     def generate(
         self,
         prompt: str,
         correlation_id: str,
         temperature: float = 0.1,
         max_tokens: Optional[int] = None,
+        system: Optional[str] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None,
     ) -> str:
         """
         Generate text completion from prompt.
@@ -53,6 +132,14 @@ class LLMClient:
             correlation_id: For logging/tracing
             temperature: Sampling temperature (0.0-1.0)
             max_tokens: Maximum tokens to generate (provider default if None)
+            system: Optional system message (instructions/context shared
+                across requests; sent ahead of the prompt so providers can
+                reuse the cached prefix)
+            json_schema: Optional JSON schema the response must follow
+                (OpenAI structured outputs / Ollama format); the backend
+                must support it
+            seed: Optional sampling seed; with temperature 0 the same
+                prompt gives the same response (best effort on OpenAI)
         
         Returns:
             Generated text response
@@ -63,12 +150,51 @@ class LLMClient:
             provider=self.provider,
             model=self.model_name,
             temperature=temperature,
+            seed=seed,
         )
         
-        if self.provider == "openai":
-            return self._openai_generate(prompt, correlation_id, temperature, max_tokens)
-        elif self.provider == "ollama":
-            return self._ollama_generate(prompt, correlation_id, temperature, max_tokens)
+        return self._generate_impl(prompt, correlation_id, temperature, max_tokens, system, json_schema, seed)
+    
+    def stream(
+        self,
+        prompt: str,
+        correlation_id: str,
+        temperature: float = 0.1,
+        max_tokens: Optional[int] = None,
+        system: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Generate text completion as it is produced.
+        
+        Closing the returned generator (or breaking out of a for loop and
+        calling close()) closes the HTTP response, which aborts generation
+        on the server.
+        
+        Args:
+            prompt: Input prompt for the LLM
+            correlation_id: For logging/tracing
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens to generate (provider default if None)
+            system: Optional system message (instructions/context shared
+                across requests; sent ahead of the prompt so providers can
+                reuse the cached prefix)
+        
+        Returns:
+            Generator of text chunks
+        
+        Example:
+            >>> chunks = client.stream("List positions", correlation_id)
+            >>> text = "".join(chunks)
+        """
+        logger.info(
+            "Streaming LLM completion",
+            correlation_id=correlation_id,
+            provider=self.provider,
+            model=self.model_name,
+            temperature=temperature,
+        )
+        
+        return self._stream_impl(prompt, correlation_id, temperature, max_tokens, system)
     
     def _openai_generate(
         self,
@@ -76,21 +202,31 @@ class LLMClient:
         correlation_id: str,
         temperature: float,
         max_tokens: Optional[int],
+        system: Optional[str],
+        json_schema: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None,
     ) -> str:
         """Call OpenAI API."""
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=self.api_key)
+        client = _get_openai_client(self.api_key)
         
         kwargs = {
             "model": self.model_name,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": _chat_messages(prompt, system),
             "temperature": temperature,
         }
         
         if max_tokens:
             kwargs["max_tokens"] = max_tokens
         
+        if seed is not None:
+            kwargs["seed"] = seed
+        
+        if json_schema:
+            kwargs["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": json_schema},
+            }
+        
         response = client.chat.completions.create(**kwargs)
         
         content = response.choices[0].message.content
@@ -105,30 +241,73 @@ class LLMClient:
         
         return content
     
+    def _openai_stream(
+        self,
+        prompt: str,
+        correlation_id: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        system: Optional[str],
+    ) -> Iterator[str]:
+        """Call OpenAI API with stream=True."""
+        client = _get_openai_client(self.api_key)
+        
+        kwargs = {
+            "model": self.model_name,
+            "messages": _chat_messages(prompt, system),
+            "temperature": temperature,
+            "stream": True,
+        }
+        
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+        
+        stream = client.chat.completions.create(**kwargs)
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            stream.close()
+            logger.info("OpenAI stream closed", correlation_id=correlation_id)
+    
     def _ollama_generate(
         self,
         prompt: str,
         correlation_id: str,
         temperature: float,
         max_tokens: Optional[int],
+        system: Optional[str],
+        json_schema: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None,
     ) -> str:
         """Call Ollama API."""
         import requests
         
         url = f"{self.base_url}/api/generate"
         
+        # Sampling parameters belong in "options" (top-level ones are ignored)
+        options = {"temperature": temperature}
+        if max_tokens:
+            options["num_predict"] = max_tokens
+        if seed is not None:
+            options["seed"] = seed
+        
         payload = {
             "model": self.model_name,
             "prompt": prompt,
-            "temperature": temperature,
             "stream": False,
+            "options": options,
         }
         
-        if max_tokens:
-            payload["options"] = {"num_predict": max_tokens}
+        if system:
+            payload["system"] = system
+        
+        if json_schema:
+            payload["format"] = json_schema
         
         try:
-            response = requests.post(url, json=payload, timeout=120)
+            response = _get_http_session().post(url, json=payload, timeout=120)
             response.raise_for_status()
             data = response.json()
             
@@ -147,3 +326,54 @@ class LLMClient:
                 error=str(e),
             )
             raise
+    
+    def _ollama_stream(
+        self,
+        prompt: str,
+        correlation_id: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        system: Optional[str],
+    ) -> Iterator[str]:
+        """Call Ollama API with stream=True (newline-delimited JSON chunks)."""
+        import requests
+        
+        url = f"{self.base_url}/api/generate"
+        
+        options = {"temperature": temperature}
+        if max_tokens:
+            options["num_predict"] = max_tokens
+        
+        payload = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": True,
+            "options": options,
+        }
+        
+        if system:
+            payload["system"] = system
+        
+        try:
+            response = _get_http_session().post(url, json=payload, timeout=120, stream=True)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(
+                "Ollama API call failed",
+                correlation_id=correlation_id,
+                error=str(e),
+            )
+            raise
+        
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("response"):
+                    yield data["response"]
+                if data.get("done"):
+                    break
+        finally:
+            response.close()
+            logger.info("Ollama stream closed", correlation_id=correlation_id, model=self.model_name)
@@ -6,41 +6,158 @@ See docs/observability/README.md for schema and privacy requirements.
 Logs are grouped by correlation_id in run-specific files for request tracing.
 """
 
+import atexit
+import functools
 import json
 import logging
+import logging.handlers
 import os
+import queue
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+from functools import lru_cache
 from hashlib import sha256
 import threading
 
+try:
+    import orjson  # Optional: 2-5x faster serialization of log entries
+except ImportError:
+    orjson = None
+
+
+def _json_line(entry: Dict[str, Any]) -> bytes:
+    """Serialize a log entry as one compact JSON line (UTF-8, newline-terminated)."""
+    if orjson is not None:
+        return orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode()
+
+
+# (second, formatted "YYYY-MM-DDTHH:MM:SS") of the last utc_now_iso() call
+_iso_second_cache = (None, "")
+
+
+def utc_now_iso() -> str:
+    """
+    Current UTC time as ISO8601 with microseconds (no timezone suffix).
+    
+    The date/time part is formatted once per second and reused, avoiding a
+    datetime object plus isoformat() on every log line and DB write.
+    
+    Example:
+        >>> utc_now_iso()
+        "2025-01-15T12:34:56.123456"
+    """
+    global _iso_second_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_second_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _iso_second_cache = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}"
+
+
+# Fields logged as a SHA-256 digest instead of raw content (privacy).
+# LOG_HASH_INPUTS=0 drops them entirely, skipping the hashing cost.
+_HASHED_FIELDS = frozenset({"input_text", "prompt", "taskspec"})
+_HASH_INPUTS = os.getenv("LOG_HASH_INPUTS", "1") != "0"
+
+
+@lru_cache(maxsize=64)
+def _content_digest(content) -> str:
+    """SHA-256 hex digest of str/bytes content (cached: prompts are often logged repeatedly)."""
+    data = content if isinstance(content, bytes) else content.encode()
+    return sha256(data, usedforsecurity=False).hexdigest()
+
+
+# correlation_id used by log calls that do not pass one (see bind_correlation_id)
+_bound_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+
+@contextmanager
+def bind_correlation_id(correlation_id: Optional[str]) -> Iterator[None]:
+    """
+    Attach correlation_id to every log call in this context that omits it.
+    
+    Example:
+        >>> with bind_correlation_id("abc-123"):
+        ...     logger.info("Plan built")  # logged with correlation_id="abc-123"
+    """
+    token = _bound_correlation_id.set(correlation_id)
+    try:
+        yield
+    finally:
+        _bound_correlation_id.reset(token)
+
+
+def bind_state_correlation_id(node: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator for workflow nodes: bind state["correlation_id"] while the node runs."""
+    @functools.wraps(node)
+    def wrapper(state, *args, **kwargs):
+        with bind_correlation_id(state.get("correlation_id")):
+            return node(state, *args, **kwargs)
+    return wrapper
+
 
 class StructuredLogger:
     """
     Provides structured JSON logging grouped by correlation_id.
     
-    Logs are written to run-specific files where all logs for a correlation_id
-    are grouped under a parent JSON object.
-    
-    File structure: logs/runs/YYYY-MM-DD/<correlation_id>.json
-    Format: {
-        "correlation_id": "...",
-        "model_name": "...",
-        "graph_version": "...",
-        "start_time": "...",
-        "end_time": "...",
-        "logs": [
-            {"ts": "...", "service": "...", "level": "...", "message": "...", ...},
-            ...
-        ]
-    }
+    Logs are appended to run-specific JSONL files, one file per correlation_id.
+    Each entry is written once, so a run with N entries costs O(N) bytes.
+    
+    File structure: logs/runs/YYYY-MM-DD/<correlation_id>.jsonl
+    Format (one JSON object per line):
+        {"correlation_id": "...", "model_name": "...", "graph_version": "...", "start_time": "..."}
+        {"ts": "...", "service": "...", "level": "...", "message": "...", ...}
+        ...
+        {"end_time": "..."}
+    
+    The trailer line is written by flush_run() (or at process exit).
     """
     
-    # Class-level cache for run data (correlation_id -> log entries)
-    _run_cache = {}
-    _cache_lock = threading.Lock()
+    # Run-log writes are handed to a background thread (queue of
+    # (correlation_id, run_file, entry); entry None = end of run), so log
+    # calls never wait on disk I/O.
+    _run_queue: "queue.Queue[Tuple[str, Path, Optional[Dict[str, Any]]]]" = queue.Queue()
+    _writer_lock = threading.Lock()
+    _writer_started = False
+    
+    # Console output goes through one QueueHandler/QueueListener pair: the
+    # calling thread only enqueues the record, the listener thread writes it
+    _console_handler: Optional[logging.handlers.QueueHandler] = None
+    _console_listener: Optional[logging.handlers.QueueListener] = None
+    
+    # Runs whose header has been queued (correlation_id -> run file)
+    _active_runs: Dict[str, Path] = {}
+    _runs_lock = threading.Lock()
+    
+    # Recently finished runs (oldest first): entries logged after flush_run
+    # are appended to the existing file instead of starting a second header
+    MAX_FINISHED_RUNS = 1024
+    _finished_runs: "OrderedDict[str, Path]" = OrderedDict()
+    
+    # Services that use the LLM (their entries include model info)
+    _LLM_SERVICES = frozenset({
+        "llm_client", "intent_parser", "router", "sequence_planning",
+        "cli", "workflow"
+    })
+    
+    # Legacy per-service files, opened once per path and shared by all loggers.
+    # Correlated entries already go to the run file, so they are only copied
+    # here when LEGACY_LOG_FILES=1; uncorrelated entries are always written.
+    LEGACY_LOG_FILES = os.getenv("LEGACY_LOG_FILES", "0") == "1"
+    _legacy_handles: Dict[Path, BinaryIO] = {}
+    _legacy_lock = threading.Lock()
+    
+    # Open run files, owned by the writer (least recently used first)
+    MAX_OPEN_RUN_FILES = 32
+    _run_handles: "OrderedDict[str, BinaryIO]" = OrderedDict()
     
     # Service to subfolder mapping
     _SERVICE_FOLDERS = {
@@ -64,6 +181,7 @@ class StructuredLogger:
         # Knowledge/database
         "neo4j_client": "knowledge",
         "sqlite_client": "knowledge",
+        "graph_cache": "knowledge",
         
         # Workflow/human interaction
         "cli": "workflow",
@@ -87,6 +205,8 @@ class StructuredLogger:
         self.log_dir = Path(log_dir or os.getenv("LOG_DIR", "logs"))
         self.runs_dir = self.log_dir / "runs"
         self.runs_dir.mkdir(parents=True, exist_ok=True)
+        self._run_date: Optional[str] = None
+        self._run_date_dir = self.runs_dir
         
         # Determine subfolder for this service
         subfolder = self._SERVICE_FOLDERS.get(service_name, "other")
@@ -96,6 +216,13 @@ class StructuredLogger:
         # Service-specific log file in appropriate subfolder
         today = datetime.now().strftime("%Y-%m-%d")
         self.legacy_log_file = self.service_log_dir / f"{service_name}_{today}.jsonl"
+        self._legacy_fh: Optional[BinaryIO] = None  # Opened on first write
+        
+        # Fields identical on every entry (env does not change after startup)
+        self._static_fields: Dict[str, Any] = {"service": service_name}
+        if service_name in self._LLM_SERVICES:
+            self._static_fields["model_name"] = os.getenv("MODEL_NAME", "unknown")
+            self._static_fields["graph_version"] = os.getenv("GRAPH_VERSION", "unknown")
         
         # Initialize Python logger for console output
         self.logger = logging.getLogger(service_name)
@@ -106,60 +233,188 @@ class StructuredLogger:
         show_console = service_name in ["cli", "workflow"] or console_log_level == "DEBUG"
         
         if show_console:
-            # Console handler (human-readable)
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(
-                logging.Formatter("%(message)s")  # Simplified format for CLI
-            )
-            self.logger.addHandler(console_handler)
+            # Console handler (human-readable), shared and added once per logger
+            console_handler = self._get_console_handler()
+            if console_handler not in self.logger.handlers:
+                self.logger.addHandler(console_handler)
+    
+    @classmethod
+    def _get_console_handler(cls) -> logging.handlers.QueueHandler:
+        """Return the queued console handler, starting its listener thread once."""
+        with cls._writer_lock:
+            if cls._console_handler is None:
+                stream_handler = logging.StreamHandler()
+                stream_handler.setFormatter(
+                    logging.Formatter("%(message)s")  # Simplified format for CLI
+                )
+                console_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+                cls._console_listener = logging.handlers.QueueListener(console_queue, stream_handler)
+                cls._console_listener.start()
+                atexit.register(cls._console_listener.stop)  # Drain before exit
+                cls._console_handler = logging.handlers.QueueHandler(console_queue)
+            return cls._console_handler
     
     def _get_run_file_path(self, correlation_id: str) -> Path:
-        """Get the file path for a specific run."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        date_dir = self.runs_dir / today
-        date_dir.mkdir(parents=True, exist_ok=True)
-        return date_dir / f"{correlation_id}.json"
-    
-    def _write_run_log(self, correlation_id: str):
-        """Write the complete run log to file."""
-        with self._cache_lock:
-            if correlation_id not in self._run_cache:
+        """Get the file path for a specific run (date folder created once per day)."""
+        today = time.strftime("%Y-%m-%d")
+        if today != self._run_date:
+            date_dir = self.runs_dir / today
+            date_dir.mkdir(parents=True, exist_ok=True)
+            self._run_date, self._run_date_dir = today, date_dir
+        return self._run_date_dir / f"{correlation_id}.jsonl"
+    
+    @classmethod
+    def _open_legacy(cls, path: Path) -> BinaryIO:
+        """Return the shared unbuffered append handle for a legacy log file (one write per line)."""
+        with cls._legacy_lock:
+            handle = cls._legacy_handles.get(path)
+            if handle is None:
+                if not cls._legacy_handles:
+                    atexit.register(cls._close_legacy)
+                handle = cls._legacy_handles[path] = open(path, "ab", buffering=0)
+            return handle
+    
+    @classmethod
+    def _close_legacy(cls):
+        """Close all legacy log files (called at exit)."""
+        with cls._legacy_lock:
+            for handle in cls._legacy_handles.values():
+                handle.close()
+            cls._legacy_handles.clear()
+    
+    @classmethod
+    def _start_writer(cls):
+        """Start the run-log writer thread once per process."""
+        with cls._runs_lock:
+            if cls._writer_started:
                 return
-            
-            run_data = self._run_cache[correlation_id]
-            run_file = self._get_run_file_path(correlation_id)
-            
-            # Update end time
-            run_data["end_time"] = datetime.utcnow().isoformat() + "Z"
-            
-            # Write to file (atomic write)
-            temp_file = run_file.with_suffix('.tmp')
-            with open(temp_file, 'w') as f:
-                json.dump(run_data, f, indent=2)
-            temp_file.replace(run_file)
+            cls._writer_started = True
+        threading.Thread(target=cls._writer_loop, name="run-log-writer", daemon=True).start()
+        atexit.register(cls.flush_pending)
+    
+    @classmethod
+    def _writer_loop(cls):
+        """Append queued entries; flush files once per burst of entries."""
+        while True:
+            batch = [cls._run_queue.get()]
+            try:
+                cls._write_batch(batch)
+            except Exception:
+                # Keep the thread alive (e.g., disk full, unserializable
+                # field): later entries are still written. Reported through
+                # stdlib logging, never back into the run queue.
+                logging.getLogger(__name__).exception(
+                    "Run log writer dropped a batch of %d entries", len(batch))
+    
+    @classmethod
+    def _write_batch(cls, batch: list):
+        """Write batch plus everything else already queued, then flush."""
+        with cls._writer_lock:
+            while True:
+                try:
+                    batch.append(cls._run_queue.get_nowait())
+                except queue.Empty:
+                    break
+            touched = set()
+            for correlation_id, run_file, entry in batch:
+                if entry is None:
+                    # Trailer: end of run
+                    entry = {"end_time": utc_now_iso() + "Z"}
+                    cls._run_handle(correlation_id, run_file).write(_json_line(entry))
+                    cls._run_handles.pop(correlation_id).close()
+                    touched.discard(correlation_id)
+                else:
+                    cls._run_handle(correlation_id, run_file).write(_json_line(entry))
+                    touched.add(correlation_id)
+            for correlation_id in touched:
+                handle = cls._run_handles.get(correlation_id)
+                if handle is not None:  # None if evicted (closing flushed it)
+                    handle.flush()
     
-    def _get_global_fields(self, include_model_info: bool = False) -> Dict[str, Any]:
+    @classmethod
+    def _run_handle(cls, correlation_id: str, run_file: Path) -> BinaryIO:
+        """Return the open file for a run, reopening it after LRU eviction."""
+        handle = cls._run_handles.get(correlation_id)
+        if handle is not None:
+            cls._run_handles.move_to_end(correlation_id)
+            return handle
+        if len(cls._run_handles) >= cls.MAX_OPEN_RUN_FILES:
+            _, oldest = cls._run_handles.popitem(last=False)
+            oldest.close()
+        handle = open(run_file, "ab")
+        cls._run_handles[correlation_id] = handle
+        return handle
+    
+    def _begin_run(self, correlation_id: str, start_time: str) -> Path:
         """
-        Extract global context fields from environment.
+        Queue the header line of a new run and return its file.
         
         Args:
-            include_model_info: If True, include model_name and graph_version
-                                (only for LLM-related services)
+            correlation_id: Run to start
+            start_time: Timestamp of the run's first entry (header start_time)
         
-        Returns:
-            Dictionary with ts, service, and optionally model_name/graph_version
+        A run already finished by flush_run gets no second header; its file
+        is returned so late entries follow the trailer.
         """
-        fields = {
-            "ts": datetime.utcnow().isoformat() + "Z",
-            "service": self.service_name,
-        }
+        self._start_writer()
+        with self._runs_lock:
+            run_file = self._active_runs.get(correlation_id)
+            if run_file is None:
+                run_file = self._finished_runs.get(correlation_id)
+                if run_file is not None:
+                    return run_file
+                run_file = self._get_run_file_path(correlation_id)
+                self._run_queue.put((correlation_id, run_file, {
+                    "correlation_id": correlation_id,
+                    "model_name": os.getenv("MODEL_NAME", "unknown"),
+                    "graph_version": os.getenv("GRAPH_VERSION", "unknown"),
+                    "start_time": start_time,
+                }))
+                # Published after the header is queued, so lock-free readers
+                # can never queue an entry ahead of it
+                self._active_runs[correlation_id] = run_file
+            return run_file
+    
+    @classmethod
+    def flush_run(cls, correlation_id: Optional[str]):
+        """
+        Mark a run as finished: its trailer is written and its file closed.
         
-        # Only include model info for LLM-related services
-        if include_model_info:
-            fields["model_name"] = os.getenv("MODEL_NAME", "unknown")
-            fields["graph_version"] = os.getenv("GRAPH_VERSION", "unknown")
+        Args:
+            correlation_id: Run to finish (None is ignored)
+        """
+        with cls._runs_lock:
+            run_file = cls._active_runs.pop(correlation_id, None) if correlation_id else None
+            if run_file is not None:
+                cls._run_queue.put((correlation_id, run_file, None))
+                cls._mark_finished(correlation_id, run_file)
+    
+    @classmethod
+    def _mark_finished(cls, correlation_id: str, run_file: Path):
+        """Remember a finished run, forgetting the oldest beyond MAX_FINISHED_RUNS (caller holds _runs_lock)."""
+        cls._finished_runs[correlation_id] = run_file
+        if len(cls._finished_runs) > cls.MAX_FINISHED_RUNS:
+            cls._finished_runs.popitem(last=False)
+    
+    @classmethod
+    def flush_pending(cls):
+        """Finish all open runs and write everything queued (called at exit)."""
+        with cls._runs_lock:
+            for correlation_id, run_file in cls._active_runs.items():
+                cls._run_queue.put((correlation_id, run_file, None))
+                cls._mark_finished(correlation_id, run_file)
+            cls._active_runs.clear()
+        cls._write_batch([])
+    
+    def _get_global_fields(self) -> Dict[str, Any]:
+        """
+        Build the common fields of a log entry.
         
-        return fields
+        Returns:
+            Dictionary with ts, service, and optionally model_name/graph_version
+            (only for LLM-related services)
+        """
+        return {"ts": utc_now_iso() + "Z", **self._static_fields}
     
     def log_json(
         self,
@@ -176,7 +431,8 @@ class StructuredLogger:
         Args:
             level: Log level (INFO, WARNING, ERROR)
             message: Human-readable log message
-            correlation_id: UUIDv4 for request tracing (REQUIRED for grouped logging)
+            correlation_id: UUIDv4 for request tracing (REQUIRED for grouped
+                logging; defaults to the one bound by bind_correlation_id)
             duration_ms: Operation duration in milliseconds (optional)
             plan_attempt: Planner retry counter (optional)
             **extra_fields: Additional context-specific fields
@@ -188,15 +444,11 @@ class StructuredLogger:
         Note:
             model_name and graph_version are only included for LLM-related services
         """
-        # Determine if this service uses LLM (should include model info)
-        llm_services = {
-            "llm_client", "intent_parser", "router", "sequence_planning", 
-            "cli", "workflow"
-        }
-        include_model_info = self.service_name in llm_services
+        if correlation_id is None:
+            correlation_id = _bound_correlation_id.get()
         
         # Build log entry
-        log_entry = self._get_global_fields(include_model_info=include_model_info)
+        log_entry = self._get_global_fields()
         log_entry.update({
             "level": level.upper(),
             "message": message,
@@ -211,43 +463,64 @@ class StructuredLogger:
         # Add extra fields (with privacy filtering)
         for key, value in extra_fields.items():
             # Hash sensitive content instead of logging raw
-            if key in ["input_text", "prompt", "taskspec"]:
-                log_entry[f"{key}_sha256"] = sha256(str(value).encode()).hexdigest()
+            if key in _HASHED_FIELDS:
+                if _HASH_INPUTS:
+                    log_entry[f"{key}_sha256"] = _content_digest(value if isinstance(value, (str, bytes)) else str(value))
             elif key == "ROBOT_API_TOKEN":
                 continue  # Never log API token
             else:
                 log_entry[key] = value
         
-        # If correlation_id provided, write to grouped run file
+        # If correlation_id provided, append to grouped run file
         if correlation_id:
-            with self._cache_lock:
-                if correlation_id not in self._run_cache:
-                    # Initialize new run
-                    self._run_cache[correlation_id] = {
-                        "correlation_id": correlation_id,
-                        "model_name": os.getenv("MODEL_NAME", "unknown"),
-                        "graph_version": os.getenv("GRAPH_VERSION", "unknown"),
-                        "start_time": datetime.utcnow().isoformat() + "Z",
-                        "end_time": None,
-                        "logs": []
-                    }
-                
-                # Add log entry (without redundant correlation_id since it's the parent)
-                self._run_cache[correlation_id]["logs"].append(log_entry)
+            # Lock-free for known runs; the lock only guards creating a run
+            run_file = self._active_runs.get(correlation_id)
+            if run_file is None:
+                run_file = self._begin_run(correlation_id, log_entry["ts"])
             
-            # Write to file after each log (ensures we don't lose data on crashes)
-            self._write_run_log(correlation_id)
+            # Entry without redundant correlation_id (the header carries it);
+            # copied because the legacy write below may add it
+            self._run_queue.put((correlation_id, run_file, dict(log_entry)))
         
-        # Also write to legacy service-specific log file for backward compatibility
-        log_entry["correlation_id"] = correlation_id  # Keep for legacy format
-        with open(self.legacy_log_file, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        # Service-specific log file: entries not captured by a run file, or
+        # all entries when legacy files are enabled (backward compatibility)
+        if not correlation_id or self.LEGACY_LOG_FILES:
+            log_entry["correlation_id"] = correlation_id  # Keep for legacy format
+            line = _json_line(log_entry)
+            if self._legacy_fh is None:
+                self._legacy_fh = self._open_legacy(self.legacy_log_file)
+            with self._legacy_lock:
+                if not self._legacy_fh.closed:
+                    self._legacy_fh.write(line)
         
-        # Write to console (human-readable)
-        log_method = getattr(self.logger, level.lower(), self.logger.info)
+        # Write to console (human-readable); skip formatting when the level is off
+        levelno = logging.getLevelName(level.upper())
+        if not isinstance(levelno, int):
+            levelno = logging.INFO
+        if not self.logger.isEnabledFor(levelno):
+            return
         extra_msg = " | ".join(f"{k}={v}" for k, v in extra_fields.items() if v is not None)
         full_message = f"{message} | {extra_msg}" if extra_msg else message
-        log_method(full_message)
+        self.logger.log(levelno, full_message)
+    
+    def is_enabled_for(self, level: str) -> bool:
+        """
+        Whether entries of this level are recorded (LOG_LEVEL, default INFO).
+        
+        Lets callers skip building expensive fields for entries that would
+        be dropped.
+        
+        Example:
+            >>> if logger.is_enabled_for("DEBUG"):
+            ...     logger.debug("Full payload", steps=expensive_dump())
+        """
+        levelno = logging.getLevelName(level.upper())
+        return self.logger.isEnabledFor(levelno if isinstance(levelno, int) else logging.INFO)
+    
+    def debug(self, message: str, **kwargs):
+        """Log DEBUG level message (dropped entirely unless LOG_LEVEL=DEBUG)."""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.log_json("DEBUG", message, **kwargs)
     
     def info(self, message: str, **kwargs):
         """Log INFO level message."""
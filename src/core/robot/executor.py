@@ -9,7 +9,6 @@ Environment: ROBOT_EXECUTION_MODE=simulation|socket
 """
 
 import os
-import json
 import time
 from typing import Dict, Any
 from datetime import datetime
@@ -20,6 +19,13 @@ from src.core.robot.socket_client_class import RobotSocketClient
 
 logger = get_logger("robot_shim")
 
+EXECUTION_MODE = os.getenv("ROBOT_EXECUTION_MODE", "socket")
+ROBOT_HOST = os.getenv("ROBOT_SOCKET_HOST", "127.0.0.1")
+ROBOT_PORT = int(os.getenv("ROBOT_SOCKET_PORT", "5000"))
+
+# Simulated duration per step (0 = no delay, e.g. for tests)
+SIM_STEP_SECONDS = float(os.getenv("SIM_STEP_SECONDS", "0.5"))
+
 
 class RobotExecutor:
     """
@@ -28,17 +34,20 @@ class RobotExecutor:
     Simulation: Simulates timing, updates databases
     Socket: Writes YAML to file, socket code reads and executes each line
     
-    Both modes update SQLite.
+    Both modes update SQLite through the shared DB clients
+    (RobotStateDB/HistoryDB.get_default()), each holding a persistent
+    connection (no reconnect per step or per executor).
     """
     
     def __init__(self):
-        self.execution_mode = os.getenv("ROBOT_EXECUTION_MODE", "socket")
+        self.execution_mode = EXECUTION_MODE
+        self._mode_upper = self.execution_mode.upper()
         self.actions_file = Path("actions.yaml")
-        self.state_db = RobotStateDB()
-        self.history_db = HistoryDB()
+        self.state_db = RobotStateDB.get_default()
+        self.history_db = HistoryDB.get_default()
         self.socket_client = None
         
-        logger.info(f"RobotExecutor initialized ({self.execution_mode.upper()} MODE)", 
+        logger.info(f"RobotExecutor initialized ({self._mode_upper} MODE)", 
                    actions_file=str(self.actions_file))
     
     def execute_sequence(
@@ -54,11 +63,10 @@ class RobotExecutor:
         YAML already written by verification layer.
         This layer executes and updates databases.
         """
-        logger.info(f"Starting {self.execution_mode.upper()} execution", 
+        logger.info(f"Starting {self._mode_upper} execution", 
                    correlation_id=correlation_id)
         
-        plan_json = json.dumps(plan)
-        self.history_db.create_run(correlation_id, operator_input, plan_json)
+        self.history_db.create_run(correlation_id, operator_input, plan)
         
         try:
             self.history_db.update_run_status(correlation_id, "running")
@@ -71,7 +79,7 @@ class RobotExecutor:
             return result
         
         except Exception as e:
-            error_msg = f"{self.execution_mode.upper()} execution failed: {str(e)}"
+            error_msg = f"{self._mode_upper} execution failed: {str(e)}"
             logger.error("Execution failed", 
                         correlation_id=correlation_id, 
                         error=error_msg)
@@ -84,20 +92,15 @@ class RobotExecutor:
             }
     
     def _execute_simulation_mode(self, plan: list, correlation_id: str) -> Dict[str, Any]:
-        """Simulate step-by-step execution."""
-        for step in plan:
-            step_id = self.history_db.add_step(
-                correlation_id,
-                step.get("target"),
-                step["action"]
-            )
-            
-            self.history_db.update_step_state(step_id, "running")
-            time.sleep(0.5)
-            self.history_db.update_step_state(step_id, "completed")
-            self._update_state_from_step(step, correlation_id)
+        """Simulate execution: one delay for the whole plan, then one write per DB."""
+        if SIM_STEP_SECONDS > 0:
+            time.sleep(SIM_STEP_SECONDS * len(plan))
         
-        self.history_db.update_run_status(correlation_id, "completed")
+        self._apply_plan_state(plan, correlation_id)
+        self.history_db.record_finished_steps(
+            correlation_id,
+            [(step.get("target"), step["action"]) for step in plan]
+        )
         
         logger.info("SIMULATION completed", 
                    correlation_id=correlation_id,
@@ -116,9 +119,7 @@ class RobotExecutor:
                 self.socket_client = RobotSocketClient()
             
             if not self.socket_client.is_connected():
-                host = os.getenv("ROBOT_SOCKET_HOST", "127.0.0.1")
-                port = int(os.getenv("ROBOT_SOCKET_PORT", 5000))
-                self.socket_client.connect_robot(host, port)
+                self.socket_client.connect_robot(ROBOT_HOST, ROBOT_PORT)
             
             # Execute sequence
             success = self.socket_client.execute_sequence(str(self.actions_file))
@@ -130,17 +131,12 @@ class RobotExecutor:
                     "run_id": correlation_id
                 }
             
-            # Update databases
-            for step in plan:
-                step_id = self.history_db.add_step(
-                    correlation_id,
-                    step.get("target"),
-                    step["action"]
-                )
-                self.history_db.update_step_state(step_id, "completed")
-                self._update_state_from_step(step, correlation_id)
-            
-            self.history_db.update_run_status(correlation_id, "completed")
+            # Update databases (one state write, steps + run status in one transaction)
+            self._apply_plan_state(plan, correlation_id)
+            self.history_db.record_finished_steps(
+                correlation_id,
+                [(step.get("target"), step["action"]) for step in plan]
+            )
             
             logger.info("SOCKET execution completed",
                        correlation_id=correlation_id,
@@ -161,35 +157,47 @@ class RobotExecutor:
                 "run_id": correlation_id
             }
     
-    def _update_state_from_step(self, step: Dict[str, Any], correlation_id: str):
-        """Update robot state DB based on step."""
-        if step["action"] == "move":
-            self.state_db.update_position(step["target"])
-            logger.info(f"{self.execution_mode.upper()} move", 
-                       correlation_id=correlation_id,
-                       target=step["target"])
+    def _apply_plan_state(self, plan: list, correlation_id: str):
+        """
+        Fold the plan's moves/tool changes into the final state and store it once.
         
-        elif step["action"] == "routine":
-            if step["target"] == "tool_attach":
-                tool_name = step.get("tool")
-                if not tool_name:
-                    raise ValueError(f"tool_attach step missing 'tool' key: {step}")
-                self.state_db.update_tool(tool_name)
-                logger.info(f"{self.execution_mode.upper()} tool attach", 
-                           correlation_id=correlation_id,
-                           tool=tool_name)
-            
-            elif step["target"] == "tool_release":
-                self.state_db.update_tool("none")
-                logger.info(f"{self.execution_mode.upper()} tool release", 
-                           correlation_id=correlation_id)
+        Only the final position/tool is read back (get_current_state); the
+        per-step transitions are already recorded as steps in history.db.
+        """
+        state = self.state_db.get_state()
+        position = state["current_position"]
+        tool = state["current_tool"]
+        mode = self._mode_upper
+        
+        for step in plan:
+            if step["action"] == "move":
+                position = step["target"]
+                logger.info("Robot move", correlation_id=correlation_id, mode=mode, target=position)
             
-            else:
-                logger.info(f"{self.execution_mode.upper()} routine",
-                           correlation_id=correlation_id,
-                           routine=step["target"])
+            elif step["action"] == "routine":
+                if step["target"] == "tool_attach":
+                    tool = step.get("tool")
+                    if not tool:
+                        raise ValueError(f"tool_attach step missing 'tool' key: {step}")
+                    logger.info("Robot tool attach", correlation_id=correlation_id, mode=mode, tool=tool)
+                
+                elif step["target"] == "tool_release":
+                    tool = "none"
+                    logger.info("Robot tool release", correlation_id=correlation_id, mode=mode)
+                
+                else:
+                    logger.info("Robot routine", correlation_id=correlation_id, mode=mode, routine=step["target"])
+        
+        # Routine-only plans leave the state untouched (as per-step updates did)
+        if (position, tool) != (state["current_position"], state["current_tool"]):
+            self.state_db.update_state(position, tool)
     
     def get_current_state(self) -> Dict[str, str]:
         """Get current robot state from SQLite."""
         return self.state_db.get_state()
+    
+    def close(self):
+        """Close the robot socket, if any (the shared DB clients stay open)."""
+        if self.socket_client is not None:
+            self.socket_client.close()
 
@@ -3,67 +3,275 @@ Robot Socket Client
 TCP/IP communication with robot controller.
 """
 
+import select
 import socket
 import time
 import yaml
 import os
+from collections import deque
+from typing import Dict, List, Tuple
+from src.core.observability.logging import get_logger
+
+# LibYAML C loader when PyYAML was built with it, pure-Python otherwise
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+logger = get_logger("socket_client")
+
+# Parsed + sorted steps per sequence file, keyed by path and validated
+# against (inode, mtime_ns, size) so an unchanged actions.yaml is not
+# re-parsed. The inode matters: verify_node replaces the file with
+# os.replace, and with coarse mtimes a same-size plan would otherwise
+# look unchanged.
+_YAML_CACHE: Dict[str, Tuple[Tuple[int, int, int], List[dict]]] = {}
+
+# Directives kept in flight by execute_sequence_pipelined (0 = sequential
+# send/ACK per step; requires a controller that echoes the seq field)
+PIPELINE_WINDOW = int(os.getenv("ROBOT_SOCKET_PIPELINE_WINDOW", "0"))
+
+# Seconds to wait for a robot reply before giving up on the step
+RECV_TIMEOUT = float(os.getenv("ROBOT_SOCKET_RECV_TIMEOUT", "60"))
+
+# Directive/reply frame terminator
+FRAME_END = b"#"
+
+
+def _encode_directive(step, seq=None):
+    """
+    Encode one step as a robot directive.
+    
+    Format: act:{action},tar:{target},sta:{stabilize},tool:{tool},pos:{position}
+    With seq (pipelined mode), ',seq:{seq}' follows the action and the frame
+    ends with '#'.
+    """
+    buf = bytearray(b"act:")
+    buf += step.get("action", "").strip().encode("UTF-8")
+    if seq is not None:
+        buf += b",seq:%d" % seq
+    buf += b",tar:"
+    buf += step.get("target", "").strip().encode("UTF-8")
+    buf += b",sta:"
+    buf += str(step.get("stabilize", "")).encode("UTF-8")
+    buf += b",tool:"
+    buf += step.get("tool", "").strip().encode("UTF-8")
+    buf += b",pos:"
+    buf += step.get("position", "").strip().encode("UTF-8")
+    if seq is not None:
+        buf += FRAME_END
+    return buf
+
+def _order_by_id(steps):
+    """
+    Return steps in id order.
+    
+    Ids are normally dense 1..N (as written by the YAML converter), so each
+    step is placed directly at index id-1. Missing, duplicate or
+    out-of-range ids fall back to a stable sort.
+    """
+    ordered = [None] * len(steps)
+    for step in steps:
+        i = step.get("id", 0)
+        if not (isinstance(i, int) and 1 <= i <= len(steps)) or ordered[i - 1] is not None:
+            return sorted(steps, key=lambda s: s.get("id", 0))
+        ordered[i - 1] = step
+    return ordered
 
 class RobotSocketClient:
     """
     Socket client for robot communication.
     Maintains connection state and handles message protocol.
+    
+    The listening socket is bound once and kept for the client's lifetime;
+    a dropped robot connection is closed and re-accepted on the same
+    listener instead of binding again.
     """
     
     def __init__(self):
         self.server_socket = None
         self.client_socket = None
         self.client_ip = None
+        # Reply buffer reused by every recv (no per-reply bytes allocation)
+        self._rxbuf = bytearray(8192)
+        self._rxmv = memoryview(self._rxbuf)
+        self._reset_rx()
+    
+    def _reset_rx(self):
+        """Forget buffered reply bytes and frames (new or dropped connection)."""
+        self._rx_pending = b""
+        self._rx_frames = deque()
+        self._framed = False
+    
+    def _next_frame(self):
+        """
+        Return the next reply from the robot, or None if it closed the connection.
+        
+        Replies are split on '#' and stripped; bytes after the last '#' are
+        kept for the next call, so a reply split across reads and several
+        replies in one read are each returned once. Until a '#' has been
+        seen on the connection, each read is taken as one reply (controllers
+        speaking the unterminated sequential protocol).
+        """
+        while not self._rx_frames:
+            readable, _, _ = select.select([self.client_socket], [], [], RECV_TIMEOUT)
+            if not readable:
+                raise TimeoutError(f"No reply from robot within {RECV_TIMEOUT}s")
+            n = self.client_socket.recv_into(self._rxmv)
+            if n == 0:
+                return None
+            data = self._rx_pending + self._rxmv[:n]
+            if FRAME_END in data:
+                self._framed = True
+            if self._framed:
+                *frames, self._rx_pending = data.split(FRAME_END)
+            else:
+                frames, self._rx_pending = [data], b""
+            for frame in frames:
+                client_message = frame.decode("latin-1").strip()
+                if client_message:
+                    self._rx_frames.append(client_message)
+        return self._rx_frames.popleft()
     
     def load_sequence(self, path="actions.yaml"):
+        st = os.stat(path)
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = _YAML_CACHE.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
         with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-        steps = data["RobotSequence"]["steps"]
-        # ensure we iterate in id order
-        steps = sorted(steps, key=lambda s: s.get("id", 0))
+            data = yaml.load(f, Loader=_Loader)
+        steps = _order_by_id(data["RobotSequence"]["steps"])
+        _YAML_CACHE[path] = (key, steps)
         return steps
     
-    def sendToRobot(self, sendData):
+    def sendToRobot(self, sendData, expect_reply=True):
+        """
+        Send one directive and, if expect_reply, wait for the robot's reply.
+        
+        Returns:
+            The reply (latin-1 decoded, '#' stripped), or None when expect_reply is False
+        """
         server_message = sendData
-        self.client_socket.send(server_message.encode("UTF-8"))
+        if isinstance(server_message, str):
+            server_message = server_message.encode("UTF-8")
+        self.client_socket.sendall(server_message)
         print("send Objekt !")
-        if self.client_socket.recv:
-            print("the message is:")
-            client_message = self.client_socket.recv(4094)
-            client_message = client_message.decode("latin-1")
-            print("!!", client_message)
-        return "client_message"
+        if not expect_reply:
+            return None
+        print("the message is:")
+        client_message = self._next_frame()
+        if client_message is None:
+            raise ConnectionError("Robot closed the connection")
+        print("!!", client_message)
+        return client_message
     
     def connect_robot(self, host=None, port=None):
-        if host is None:
-            host = os.getenv('ROBOT_SOCKET_HOST', '127.0.0.1')
-        if port is None:
-            port = int(os.getenv('ROBOT_SOCKET_PORT', 5000))
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.bind((host, port))
-        self.server_socket.listen()
+        if self.server_socket is None:
+            if host is None:
+                host = os.getenv('ROBOT_SOCKET_HOST', '127.0.0.1')
+            if port is None:
+                port = int(os.getenv('ROBOT_SOCKET_PORT', 5000))
+            server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server_socket.bind((host, port))
+            server_socket.listen()
+            self.server_socket = server_socket
+        return self.accept_robot()
+    
+    def accept_robot(self):
+        """Accept a robot connection on the existing listening socket."""
+        host, port = self.server_socket.getsockname()[:2]
         print(f"Waiting for robot connection on {host}:{port}...")
         (self.client_socket, self.client_ip) = self.server_socket.accept()
+        self._reset_rx()
+        # Small directive frames: send immediately instead of waiting on Nagle
+        self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 64 * 1024)
         print(f"Robot at address {self.client_ip} connected.")
         return True
     
     def execute_sequence(self, yaml_path="actions.yaml"):
         steps = self.load_sequence(yaml_path)
-        for step in steps:
-            action = step.get("action", "").strip()
-            target = step.get("target", "").strip()
-            stabilize = step.get("stabilize", "")
-            tool = step.get("tool", "").strip()
-            position = step.get("position", "").strip()
-            client_message = self.sendToRobot(f'act:{action},tar:{target},sta:{stabilize},tool:{tool},pos:{position}',)
+        try:
+            if PIPELINE_WINDOW > 0:
+                return self.execute_sequence_pipelined(steps, PIPELINE_WINDOW)
+            for step in steps:
+                client_message = self.sendToRobot(_encode_directive(step))
+                if client_message == "Shutting down":
+                    return False
+            return True
+        except OSError:
+            # Connection state unknown: drop it so the next run re-accepts
+            self.drop_robot()
+            raise
+    
+    def execute_sequence_pipelined(self, steps, window=8):
+        """
+        Send steps with up to `window` directives awaiting ACK.
+        
+        Each directive carries a `seq:N` field (N = index in steps) and ends
+        with '#'. Replies are '#'-terminated frames; a reply containing
+        `seq:N` acknowledges that step (in any order), a reply without it
+        acknowledges the oldest outstanding step.
+        
+        Returns:
+            True when every step is acknowledged, False if the robot replies
+            "Shutting down" or closes the connection
+        """
+        sock = self.client_socket
+        self._framed = True
+        in_flight = deque()
+        next_seq = 0
+        
+        while next_seq < len(steps) or in_flight:
+            while next_seq < len(steps) and len(in_flight) < window:
+                sock.sendall(_encode_directive(steps[next_seq], next_seq))
+                in_flight.append(next_seq)
+                next_seq += 1
+            
+            client_message = self._next_frame()
+            if client_message is None:
+                logger.warning("Robot closed the connection", in_flight=len(in_flight))
+                return False
+            logger.debug("Robot reply", reply=client_message)
             if client_message == "Shutting down":
+                logger.warning("Robot shutting down", in_flight=len(in_flight))
                 return False
+            seq = self._acked_seq(client_message)
+            if seq is not None and seq in in_flight:
+                in_flight.remove(seq)
+            elif in_flight:
+                in_flight.popleft()
         return True
     
+    @staticmethod
+    def _acked_seq(client_message):
+        """Return N from a 'seq:N' field in a reply, or None."""
+        for field in client_message.split(","):
+            key, _, value = field.partition(":")
+            if key.strip() == "seq" and value.strip().isdigit():
+                return int(value)
+        return None
+    
     
     def is_connected(self):
-        return self.client_socket is not None
\ No newline at end of file
+        return self.client_socket is not None
+    
+    def drop_robot(self):
+        """Close the robot connection, keeping the listening socket."""
+        if self.client_socket is not None:
+            try:
+                self.client_socket.close()
+            finally:
+                self.client_socket = None
+                self.client_ip = None
+                self._reset_rx()
+    
+    def close(self):
+        """Close the robot connection and the listening socket."""
+        self.drop_robot()
+        if self.server_socket is not None:
+            self.server_socket.close()
+            self.server_socket = None
\ No newline at end of file
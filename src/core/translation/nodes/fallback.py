@@ -5,13 +5,37 @@ See docs/translation/README.md for error handling.
 """
 
 from typing import Dict, Any
-from src.core.translation.state import WorkflowState
+from src.core.translation.state import WorkflowState, MAX_PLAN_ATTEMPTS
 from src.core.knowledge.sqlite_client import RobotStateDB
 from src.core.observability.logging import get_logger
-import os
 
 logger = get_logger("fallback")
 
+# Response templates (static text built once)
+_UNKNOWN_INTENT_TMPL = (
+    "I couldn't understand your request: '{operator_input}'\n\n"
+    "I can help with:\n"
+    "  - Robot movement commands (e.g., 'Move to position y')\n"
+    "  - Routine execution (e.g., 'Do routine x at position y')\n"
+    "  - Tool changes (e.g., 'Attach tool xyxyxy')\n"
+    "  - Information queries (e.g., 'What positions are available?')\n"
+    "  - Task replay (e.g., 'Do that again')\n\n"
+    "Please rephrase your command or ask a question."
+)
+
+_MAX_ATTEMPTS_SUGGESTIONS = (
+    "Suggestions:\n"
+    "  - Simplify your command (e.g., 'Move to <position_name>')\n"
+    "  - Check available positions with 'What positions are available?'\n"
+    "  - Ensure you're requesting valid position-to-position moves\n"
+)
+
+_GENERIC_ERROR_TMPL = (
+    "An unexpected error occurred while processing your request.\n\n"
+    "Correlation ID: {correlation_id}\n"
+    "Please try again or contact system administrator if the problem persists."
+)
+
 
 def fallback_node(state: WorkflowState) -> Dict[str, Any]:
     """
@@ -37,8 +61,6 @@ def fallback_node(state: WorkflowState) -> Dict[str, Any]:
     human_decision = state.get("human_decision")
     verification_result = state.get("verification_result")
     
-    max_attempts = int(os.getenv("MAX_PLAN_ATTEMPTS", "3"))
-    
     logger.warning("Fallback triggered", 
                   correlation_id=correlation_id, 
                   intent=intent, 
@@ -48,38 +70,29 @@ def fallback_node(state: WorkflowState) -> Dict[str, Any]:
     
     # Scenario 1: Unknown intent
     if intent == "unknown":
-        response = f"I couldn't understand your request: '{operator_input}'\n\n"
-        response += "I can help with:\n"
-        response += "  - Robot movement commands (e.g., 'Move to position y')\n"
-        response += "  - Routine execution (e.g., 'Do routine x at position y')\n"
-        response += "  - Tool changes (e.g., 'Attach tool xyxyxy')\n"
-        response += "  - Information queries (e.g., 'What positions are available?')\n"
-        response += "  - Task replay (e.g., 'Do that again')\n\n"
-        response += "Please rephrase your command or ask a question."
+        response = _UNKNOWN_INTENT_TMPL.format(operator_input=operator_input)
         
         logger.info("Unknown intent fallback", correlation_id=correlation_id)
     
     # Scenario 2: Max planning attempts exceeded
-    elif plan_attempt > max_attempts:
-        response = f"Failed to generate a valid plan after {max_attempts} attempts.\n\n"
+    elif plan_attempt > MAX_PLAN_ATTEMPTS:
+        parts = [f"Failed to generate a valid plan after {MAX_PLAN_ATTEMPTS} attempts.\n\n"]
         
         if validation_errors:
-            response += f"Schema validation errors:\n{validation_errors}\n\n"
+            parts.append(f"Schema validation errors:\n{validation_errors}\n\n")
         
         if verification_result and not verification_result.get("valid"):
-            response += "Verification failures:\n"
+            parts.append("Verification failures:\n")
             if verification_result.get("missing_positions"):
-                response += f"  - Missing positions: {', '.join(verification_result['missing_positions'])}\n"
+                parts.append(f"  - Missing positions: {', '.join(verification_result['missing_positions'])}\n")
             if verification_result.get("illegal_edges"):
-                response += f"  - Illegal moves: {verification_result['illegal_edges']}\n"
+                parts.append(f"  - Illegal moves: {verification_result['illegal_edges']}\n")
             if verification_result.get("unsupported_routines"):
-                response += f"  - Unsupported routines: {verification_result['unsupported_routines']}\n"
-            response += "\n"
+                parts.append(f"  - Unsupported routines: {verification_result['unsupported_routines']}\n")
+            parts.append("\n")
         
-        response += "Suggestions:\n"
-        response += "  - Simplify your command (e.g., 'Move to <position_name>')\n"
-        response += "  - Check available positions with 'What positions are available?'\n"
-        response += "  - Ensure you're requesting valid position-to-position moves\n"
+        parts.append(_MAX_ATTEMPTS_SUGGESTIONS)
+        response = "".join(parts)
         
         logger.error("Max attempts exceeded", correlation_id=correlation_id)
     
@@ -94,9 +107,7 @@ def fallback_node(state: WorkflowState) -> Dict[str, Any]:
     
     # Scenario 4: Generic system error
     else:
-        response = "An unexpected error occurred while processing your request.\n\n"
-        response += f"Correlation ID: {correlation_id}\n"
-        response += "Please try again or contact system administrator if the problem persists."
+        response = _GENERIC_ERROR_TMPL.format(correlation_id=correlation_id)
         
         logger.error("Generic fallback", correlation_id=correlation_id)
     
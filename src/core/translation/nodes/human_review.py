@@ -6,19 +6,40 @@ See docs/translation/README.md for decision outcomes.
 
 import json
 import os
+import select
 import sys
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
 from src.core.translation.state import WorkflowState
 from src.core.knowledge.sqlite_client import RobotStateDB
 from src.core.observability.logging import get_logger
 
+try:
+    import msvcrt  # Console keyboard polling (Windows only; select() can't wait on stdin there)
+except ImportError:
+    msvcrt = None
+
 logger = get_logger("human_review")
 
 # Human review timeout configuration (seconds)
 HUMAN_REVIEW_TIMEOUT = int(os.getenv("HUMAN_REVIEW_TIMEOUT", "120"))
 
+_RULE = "=" * 80
+
+# Static part of the review block shown after the plan
+_OPTIONS_BLOCK = (
+    f"\n{_RULE}\n"
+    "Options:\n"
+    "  [a] Approve - Execute this plan\n"
+    "  [r] Revise - Request changes (provide comments)\n"
+    "  [d] Decline - Cancel this task\n"
+    f"{_RULE}\n"
+    f"Timeout: {HUMAN_REVIEW_TIMEOUT} seconds\n"
+    f"{_RULE}\n"
+    "\n"  # Blank line before prompt
+)
+
 
 def human_review_node(state: WorkflowState) -> Dict[str, Any]:
     """
@@ -79,56 +100,49 @@ def prompt_operator_cli(correlation_id: str, operator_input: str, plan: list) ->
         decision: 'approved' | 'revision' | 'declined' | 'timeout'
         comments: str or None
     """
-    print("\n" + "="*80)
-    print("PLAN REVIEW REQUIRED")
-    print("="*80)
-    print(f"Correlation ID: {correlation_id}")
-    print(f"Your command: {operator_input}")
-    print("\nGenerated Plan:")
-    print()
+    # Render the whole block and write it once
+    out = [
+        "\n" + _RULE,
+        "PLAN REVIEW REQUIRED",
+        _RULE,
+        f"Correlation ID: {correlation_id}",
+        f"Your command: {operator_input}",
+        "\nGenerated Plan:",
+        "",
+    ]
     for step in plan:
-        step_id = step.get('id', '?')
-        name = step.get('name', 'Unknown')
-        print(f"  {step_id}. {name}")
-    
-    print("\n" + "="*80)
-    print("Options:")
-    print("  [a] Approve - Execute this plan")
-    print("  [r] Revise - Request changes (provide comments)")
-    print("  [d] Decline - Cancel this task")
-    print("="*80)
-    print(f"Timeout: {HUMAN_REVIEW_TIMEOUT} seconds")
-    print("="*80)
-    print()  # Add blank line before prompt
+        out.append(f"  {step.get('id', '?')}. {step.get('name', 'Unknown')}")
+    
+    sys.stdout.write("\n".join(out) + "\n" + _OPTIONS_BLOCK)
+    sys.stdout.flush()
     
     end_time = time.time() + HUMAN_REVIEW_TIMEOUT
     
     while True:
-        remaining = max(0, int(end_time - time.time()))
-        if remaining == 0:
+        print("Your decision [a/r/d]: ", end='')
+        sys.stdout.flush()  # Ensure prompt is displayed
+        
+        line = _readline_before(end_time)
+        if line is None:
             print("\nHuman review timeout exceeded. Routing to fallback.")
             logger.warning("Human review timeout", correlation_id=correlation_id)
             return ("timeout", None)
         
-        print("Your decision [a/r/d]: ", end='')
-        sys.stdout.flush()  # Ensure prompt is displayed
-        
-        choice = sys.stdin.readline().strip().lower()
+        choice = line.strip().lower()
         
         if choice == "a":
             return ("approved", None)
         
         elif choice == "r":
-            remaining = max(0, int(end_time - time.time()))
-            if remaining == 0:
-                print("Timeout exceeded while waiting for comments.")
-                return ("timeout", None)
-            
-            print()  # Add blank line before prompt
-            print("What changes do you want? ", end='')
+            sys.stdout.write("\nWhat changes do you want? ")  # Blank line before prompt
             sys.stdout.flush()  # Ensure prompt is displayed
-            comments = sys.stdin.readline().strip()
-            return ("revision", comments)
+            
+            comments = _readline_before(end_time)
+            if comments is None:
+                print("\nTimeout exceeded while waiting for comments.")
+                logger.warning("Human review timeout", correlation_id=correlation_id)
+                return ("timeout", None)
+            return ("revision", comments.strip())
         
         elif choice == "d":
             return ("declined", None)
@@ -138,6 +152,41 @@ def prompt_operator_cli(correlation_id: str, operator_input: str, plan: list) ->
 
 
 
+def _readline_before(end_time: float) -> Optional[str]:
+    """
+    Read one line from stdin, giving up at end_time.
+    
+    Waits with select() (or msvcrt polling on Windows) so the deadline is
+    enforced even when the operator types nothing. Piped stdin is read
+    directly, since lines may already sit in Python's input buffer.
+    
+    Returns:
+        The line read, or None if the deadline passed first
+    """
+    remaining = end_time - time.time()
+    if remaining <= 0:
+        return None
+    
+    if not sys.stdin.isatty():
+        return sys.stdin.readline()
+    
+    if msvcrt is not None:
+        while not msvcrt.kbhit():
+            if time.time() >= end_time:
+                return None
+            time.sleep(0.1)
+    else:
+        ready, _, _ = select.select([sys.stdin], [], [], remaining)
+        if not ready:
+            return None
+    
+    return sys.stdin.readline()
+
+
+# Next node per review decision
+_DECISION_ROUTES = {"approved": "verify", "revision": "sequence_planning"}
+
+
 def human_review_condition(state: WorkflowState) -> str:
     """
     Conditional edge after HumanReview node.
@@ -145,13 +194,6 @@ def human_review_condition(state: WorkflowState) -> str:
     Returns:
         "verify" (approved) | "sequence_planning" (revision) | "fallback" (declined/timeout)
     """
-    decision = state.get("human_decision")
-    
-    if decision == "approved":
-        return "verify"
-    elif decision == "revision":
-        return "sequence_planning"
-    else:
-        # declined or timeout
-        return "fallback"
+    # declined or timeout → fallback
+    return _DECISION_ROUTES.get(state.get("human_decision"), "fallback")
 
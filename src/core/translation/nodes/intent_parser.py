@@ -5,15 +5,101 @@ LLM focuses ONLY on understanding what the user wants, not HOW to achieve it.
 
 import os
 import json
-from typing import Dict, Any
+import re
+import threading
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Dict, Any, Optional, Tuple
 from src.core.translation.state import WorkflowState
 from src.core.knowledge.neo4j_client import Neo4jClient
-from src.core.knowledge.sqlite_client import RobotStateDB
+from src.core.knowledge.sqlite_client import RobotStateDB, HistoryDB
 from src.core.llm.client import LLMClient
 from src.core.observability.logging import get_logger
 
+try:
+    import orjson  # Optional: faster parse of responses and prompt context dumps
+except ImportError:
+    orjson = None
+
 logger = get_logger("intent_parser")
 
+# Seconds the graph part of the intent context (positions/tools/routines)
+# is reused before Neo4j is asked again. Robot state and last run are
+# always read fresh so "do that again" sees the run that just finished.
+CONTEXT_CACHE_TTL = float(os.getenv("CONTEXT_CACHE_TTL", "60"))
+
+# Completion cap for the intent JSON (0 = provider default). A sequence
+# step is ~25 tokens, so the default leaves room for ~40 steps.
+INTENT_MAX_TOKENS = int(os.getenv("INTENT_MAX_TOKENS", "1024"))
+
+# Seconds an LLM response is reused for an identical prompt (0 = off).
+# The prompt includes robot state and last run, so a hit means the same
+# command in the same situation.
+INTENT_CACHE_TTL = float(os.getenv("INTENT_CACHE_TTL", "300"))
+INTENT_CACHE_MAX_ENTRIES = 256
+
+# Greedy decoding with a fixed seed: the same prompt gives the same intent,
+# which keeps parsing reproducible and the response cache meaningful
+INTENT_SEED = 0xC0FFEE
+
+# Send a JSON schema with the request (OpenAI structured outputs / Ollama
+# format) so the model can only emit known goals and graph names. Off by
+# default: older models and servers reject the parameter.
+INTENT_GUIDED_JSON = os.getenv("INTENT_GUIDED_JSON", "0") == "1"
+
+# Match trivial commands ("go home", "go to <position>", "release tool",
+# "again") with rules before calling the LLM
+INTENT_FAST_PARSE = os.getenv("INTENT_FAST_PARSE", "1") == "1"
+
+_REPEAT_COMMANDS = frozenset({"again", "repeat", "do it again", "run latest", "same as last"})
+_RELEASE_COMMANDS = frozenset({"release tool", "release the tool", "return tool", "return the tool"})
+_HOME_RE = re.compile(r"(?:go|move|navigate)(?: to)?(?: the)? home(?: position)?")
+_MOVE_RE = re.compile(r"(?:(?:go|move|navigate)(?: to)? )?(.+)")
+
+# Goals accepted by the sequence builder (plus "unknown" for clarification)
+_INTENT_GOALS = ["move", "execute_routine", "attach_tool", "release_tool",
+                 "release_tool_and_home", "sequence", "unknown"]
+
+# prompt digest -> (expires_at, raw LLM response), least recently used first
+_intent_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_intent_cache_lock = threading.Lock()
+
+_static_context: Optional[Dict[str, Any]] = None
+_static_context_expires = 0.0
+_static_context_lock = threading.Lock()
+
+# JSON object inside a ```json ... ``` (or bare ```) fence
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_json_decoder = json.JSONDecoder()
+
+
+# Prompt section after the operator command (no per-request fields)
+_FULL_KEYWORD_NOTE = """
+**IMPORTANT - How to handle "full" or "all" keywords:**
+When the operator says "full" or "all" (e.g., "do a full scan", "process all stations"), you MUST create steps for EVERY work position listed above.
+For example, if Available Positions shows Station_A, Station_B, and Station_C, then "full scan" means:
+- Scan at Station_A
+- Scan at Station_B  
+- Scan at Station_C
+
+Do NOT pick just one position when "full" or "all" is specified.
+"""
+
+
+def _json_loads(text: str) -> Any:
+    """json.loads via orjson when installed (its JSONDecodeError subclasses json's)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_indented(value: Any) -> str:
+    """Pretty-print value with 2-space indent for the prompt."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(value, indent=2)
+
 
 def parse_intent_node(state: WorkflowState) -> Dict[str, Any]:
     """
@@ -45,20 +131,43 @@ def parse_intent_node(state: WorkflowState) -> Dict[str, Any]:
                has_revision=bool(human_comments),
                has_errors=bool(validation_errors))
     
+    # Revisions and retries after planning errors must reach the LLM
+    if INTENT_FAST_PARSE and not human_comments and not validation_errors:
+        intent = _fast_parse(operator_input)
+        if intent is not None:
+            logger.info("Intent parsed by rules",
+                       correlation_id=correlation_id,
+                       intent=intent)
+            return {
+                "intent": intent,
+            }
+    
     context = _build_minimal_context()
     
     prompt = _build_intent_prompt(operator_input, context, human_comments, validation_errors)
     
-    # Use unified LLM client (no max_tokens - allow full sequence output)
-    llm_client = LLMClient()
-    intent_json = llm_client.generate(prompt, correlation_id, temperature=0.1)
+    cache_key = None
+    if INTENT_CACHE_TTL > 0 and not human_comments and not validation_errors:
+        cache_key = blake2b(prompt.encode(), digest_size=16).hexdigest()
+    
+    intent_json = _get_cached_response(cache_key) if cache_key else None
+    if intent_json is not None:
+        logger.info("Intent response served from cache", correlation_id=correlation_id)
+    else:
+        # Use unified LLM client (max_tokens bounds the reserved output; intents are short JSON)
+        llm_client = LLMClient.get_default()
+        intent_json = llm_client.generate(prompt, correlation_id, temperature=0.0,
+                                          max_tokens=INTENT_MAX_TOKENS or None,
+                                          seed=INTENT_SEED,
+                                          json_schema=context["intent_schema"] if INTENT_GUIDED_JSON else None)
     
     try:
-        clean_json = _extract_json_from_response(intent_json)
-        intent = json.loads(clean_json)
+        intent = _parse_intent_json(intent_json)
         logger.info("Intent parsed successfully",
                    correlation_id=correlation_id,
                    intent=intent)
+        if cache_key:
+            _cache_response(cache_key, intent_json)
     except json.JSONDecodeError as e:
         logger.error("Failed to parse intent JSON",
                     correlation_id=correlation_id,
@@ -71,6 +180,90 @@ def parse_intent_node(state: WorkflowState) -> Dict[str, Any]:
     }
 
 
+def _fast_parse(operator_input: str, _depth: int = 0) -> Optional[Dict[str, Any]]:
+    """
+    Parse trivial commands without the LLM.
+    
+    Handles repeat commands ("again", re-parsed from the last completed
+    run's command), "go home", "go to <exact position name>" and "release
+    tool". Only the context a pattern needs is read (graph names come
+    from the cached static context).
+    
+    Returns:
+        Intent dict, or None to fall through to the LLM
+    
+    Example:
+        >>> _fast_parse("go home")
+        {"goal": "move", "position": "Home"}
+    """
+    command = " ".join(operator_input.lower().split()).rstrip(".!")
+    if not command:
+        return None  # Only punctuation/whitespace: let the LLM ask for clarification
+    
+    if command in _REPEAT_COMMANDS:
+        run = HistoryDB.get_default().get_latest_completed_run()
+        if run is None or _depth > 0:
+            return None
+        return _fast_parse(run["operator_input"], _depth + 1)
+    
+    if command in _RELEASE_COMMANDS:
+        return {"goal": "release_tool"}
+    
+    positions = _build_static_context()["positions"]
+    if _HOME_RE.fullmatch(command):
+        homes = [p["name"] for p in positions if p.get("role") == "home"]
+        return {"goal": "move", "position": homes[0]} if len(homes) == 1 else None
+    
+    match = _MOVE_RE.fullmatch(command)
+    if match is None:
+        return None
+    target = match.group(1)
+    for position in positions:
+        if position["name"].lower() == target:
+            return {"goal": "move", "position": position["name"]}
+    return None
+
+
+def _get_cached_response(key: str) -> Optional[str]:
+    """Return the cached LLM response for a prompt digest, or None if absent/expired."""
+    with _intent_cache_lock:
+        entry = _intent_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _intent_cache[key]
+            return None
+        _intent_cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_response(key: str, response: str):
+    """Store an LLM response that parsed successfully, evicting the least recently used."""
+    with _intent_cache_lock:
+        _intent_cache[key] = (time.monotonic() + INTENT_CACHE_TTL, response)
+        _intent_cache.move_to_end(key)
+        if len(_intent_cache) > INTENT_CACHE_MAX_ENTRIES:
+            _intent_cache.popitem(last=False)
+
+
+def _parse_intent_json(text: str) -> Any:
+    """
+    Parse the LLM response as JSON.
+    
+    Well-formed responses (JSON only, as the prompt asks) are parsed
+    directly; anything else goes through _extract_json_from_response.
+    
+    Raises:
+        json.JSONDecodeError: If no JSON object can be parsed
+    """
+    if text and text.lstrip().startswith("{"):
+        try:
+            return _json_loads(text)
+        except json.JSONDecodeError:
+            pass
+    return _json_loads(_extract_json_from_response(text))
+
+
 def _extract_json_from_response(text: str) -> str:
     """
     Extract JSON from LLM response that might have markdown or commentary.
@@ -84,36 +277,25 @@ def _extract_json_from_response(text: str) -> str:
     if not text:
         return "{}"
     
-    text = text.strip()
-    
-    # Remove markdown code blocks
-    if text.startswith("```"):
-        # Find the actual JSON content between ``` markers
-        lines = text.split("\n")
-        start_idx = 0
-        end_idx = len(lines)
-        
-        # Skip first line if it's ```json or ```
-        if lines[0].startswith("```"):
-            start_idx = 1
-        
-        # Find closing ```
-        for i in range(len(lines) - 1, start_idx, -1):
-            if lines[i].strip() == "```":
-                end_idx = i
-                break
-        
-        text = "\n".join(lines[start_idx:end_idx]).strip()
+    # Prefer the fenced block so braces in surrounding commentary are ignored
+    match = _FENCE_RE.search(text)
+    if match:
+        text = match.group(1)
     
-    # Find JSON object boundaries
     start = text.find("{")
-    end = text.rfind("}")
-    
-    if start != -1 and end != -1 and start < end:
-        return text[start:end + 1]
+    if start == -1:
+        # If no JSON found, return empty object
+        return "{}"
     
-    # If no JSON found, return empty object
-    return "{}"
+    # Decode one object from the first brace (string-aware, so '{"k": "}"}'
+    # ends at the right brace and trailing commentary is dropped)
+    try:
+        _, end = _json_decoder.raw_decode(text, start)
+        return text[start:end]
+    except json.JSONDecodeError:
+        # Malformed: hand back the widest candidate and let the caller report it
+        end = text.rfind("}")
+        return text[start:end + 1] if end > start else "{}"
 
 
 def _build_minimal_context() -> Dict[str, Any]:
@@ -123,48 +305,109 @@ def _build_minimal_context() -> Dict[str, Any]:
     Returns:
         Dict containing robot state, available resources, and last completed task
     """
-    neo4j = Neo4jClient()
-    neo4j.connect()
+    return {**_build_dynamic_context(), **_build_static_context()}
+
+
+def _build_static_context() -> Dict[str, Any]:
+    """
+    Return positions, tools and routines from Neo4j, cached for CONTEXT_CACHE_TTL seconds.
     
-    try:
+    Returns:
+        Dict with "positions", "tools" and "routines" lists, their rendered
+        prompt section "resources_prompt" and the response schema
+        "intent_schema" (shared; do not mutate)
+    """
+    global _static_context, _static_context_expires
+    
+    with _static_context_lock:
+        if _static_context is not None and time.monotonic() < _static_context_expires:
+            return _static_context
+        
+        neo4j = Neo4jClient.get_default()
         positions = neo4j.get_all_positions()
         tools = neo4j.get_all_tools()
         routines = neo4j.get_all_routines()
         
-        state_db = RobotStateDB()
-        robot_state = state_db.get_state()
-        
-        # Get recent history for "repeat" commands
-        from src.core.knowledge.sqlite_client import HistoryDB
-        from datetime import datetime, timedelta
-        history_db = HistoryDB()
-        
-        recent_runs = history_db.get_runs_by_date(datetime.now().strftime("%Y-%m-%d"))
-        if not recent_runs:
-            yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-            recent_runs = history_db.get_runs_by_date(yesterday)
-        
-        # Get last completed run
-        last_run = None
-        if recent_runs:
-            for run in reversed(recent_runs):  # Most recent first
-                if run['status'] == 'completed':
-                    last_run = {
-                        'command': run['operator_input'],
-                        'run_id': run['run_id']
-                    }
-                    break
-        
-        return {
-            "robot_position": robot_state["current_position"],
-            "robot_tool": robot_state["current_tool"],
+        _static_context = {
             "positions": [{"name": p["name"], "role": p["role"]} for p in positions],
             "tools": [{"name": t["name"]} for t in tools],
             "routines": [{"name": r["name"], "required_tool": r.get("required_tool")} for r in routines],
-            "last_run": last_run,
         }
-    finally:
-        neo4j.close()
+        # Rendered once per refresh instead of on every prompt
+        _static_context["resources_prompt"] = _render_resources(_static_context)
+        _static_context["intent_schema"] = _build_intent_schema(_static_context)
+        _static_context_expires = time.monotonic() + CONTEXT_CACHE_TTL
+        return _static_context
+
+
+def _render_resources(context: Dict[str, Any]) -> str:
+    """Render the positions/tools/routines section of the intent prompt."""
+    return f"""**Available Positions:**
+{_json_indented(context['positions'])}
+
+**Available Tools:**
+{_json_indented(context['tools'])}
+
+**Available Routines:**
+{_json_indented(context['routines'])}"""
+
+
+def _build_intent_schema(context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the JSON schema for intent responses from the graph names.
+    
+    Restricts "goal" to the known intent types and "position", "tool" and
+    "routine" (top level and in sequence steps) to names in the graph, so
+    a guided backend cannot produce a name the planner will reject.
+    """
+    def name_enum(items):
+        names = sorted({item["name"] for item in items if item.get("name")})
+        return {"type": "string", "enum": names} if names else {"type": "string"}
+    
+    names = {
+        "position": name_enum(context["positions"]),
+        "tool": name_enum(context["tools"]),
+        "routine": name_enum(context["routines"]),
+    }
+    step = {
+        "type": "object",
+        "properties": {"action": {"type": "string"}, **names},
+        "required": ["action"],
+    }
+    return {
+        "type": "object",
+        "properties": {
+            "goal": {"type": "string", "enum": _INTENT_GOALS},
+            **names,
+            "steps": {"type": "array", "items": step},
+        },
+        "required": ["goal"],
+    }
+
+
+def _build_dynamic_context() -> Dict[str, Any]:
+    """
+    Read current robot state and the last completed run (never cached).
+    
+    Returns:
+        Dict with "robot_position", "robot_tool" and "last_run"
+    """
+    robot_state = RobotStateDB.get_default().get_state()
+    
+    # Last completed run for "repeat" commands (one indexed row)
+    run = HistoryDB.get_default().get_latest_completed_run()
+    last_run = None
+    if run:
+        last_run = {
+            'command': run['operator_input'],
+            'run_id': run['run_id']
+        }
+    
+    return {
+        "robot_position": robot_state["current_position"],
+        "robot_tool": robot_state["current_tool"],
+        "last_run": last_run,
+    }
 
 
 def _build_intent_prompt(operator_input: str, context: Dict[str, Any], human_comments: str = None, validation_errors: str = None) -> str:
@@ -180,49 +423,34 @@ def _build_intent_prompt(operator_input: str, context: Dict[str, Any], human_com
     Returns:
         Formatted prompt string for LLM
     """
-    prompt = f"""You are an intent parser for a robot system. Convert the operator's command into a structured intent.
+    parts = [f"""You are an intent parser for a robot system. Convert the operator's command into a structured intent.
 
 **Current Robot State:**
 - Position: {context['robot_position']}
 - Tool: {context['robot_tool']}
 
-**Available Positions:**
-{json.dumps(context['positions'], indent=2)}
-
-**Available Tools:**
-{json.dumps(context['tools'], indent=2)}
-
-**Available Routines:**
-{json.dumps(context['routines'], indent=2)}"""
+""", context["resources_prompt"]]
 
     # Add last run context if available
     if context.get('last_run'):
-        prompt += f"""
+        parts.append(f"""
 
 **Last Completed Task:**
 Command: "{context['last_run']['command']}"
 Run ID: {context['last_run']['run_id']}
 
 NOTE: If the operator says "again", "repeat", "do it again", "run the latest task again", etc., 
-you should parse it as the SAME intent as the last completed task above."""
+you should parse it as the SAME intent as the last completed task above.""")
 
-    prompt += f"""
+    parts.append(f"""
 
 **Operator Command:** {operator_input}
-
-**IMPORTANT - How to handle "full" or "all" keywords:**
-When the operator says "full" or "all" (e.g., "do a full scan", "process all stations"), you MUST create steps for EVERY work position listed above.
-For example, if Available Positions shows Station_A, Station_B, and Station_C, then "full scan" means:
-- Scan at Station_A
-- Scan at Station_B  
-- Scan at Station_C
-
-Do NOT pick just one position when "full" or "all" is specified.
-"""
+""")
+    parts.append(_FULL_KEYWORD_NOTE)
     
     # Add human feedback if this is a revision
     if human_comments:
-        prompt += f"""
+        parts.append(f"""
 
 **CRITICAL - Human Revision Request:**
 The operator reviewed your previous plan and wants changes.
@@ -238,10 +466,10 @@ Examples:
 - Original: "inspect pos 3" + Feedback: "use the camera" → Parse as camera inspection at pos 3
 
 IMPORTANT: The feedback MODIFIES the original command. You must understand what the original command meant, then adjust it based on feedback.
-"""
+""")
     
     if validation_errors:
-        prompt += f"""
+        parts.append(f"""
 
 **IMPORTANT - Previous Planning Error:**
 The last attempt to build a plan failed with this error:
@@ -251,9 +479,15 @@ Please adjust your intent parsing to avoid this error. Consider:
 - Are you using correct position/tool/routine names from the lists above?
 - Are you following the format rules correctly?
 - Does the requested action make sense given the available resources?
-"""
+""")
     
-    prompt += """
+    parts.append(_STATIC_PROMPT_TAIL)
+    return "".join(parts)
+
+
+# Rules, intent formats and examples: identical for every request, so the
+# text is built once at import (kept as a plain string, braces included)
+_STATIC_PROMPT_TAIL = """
 
 **Your Task:** Parse the command into ONE of these intent types.
 
@@ -408,4 +642,3 @@ WRONG: Including tool_attach, tool_release, or any routine steps (operator only
 
 **Return JSON only:**
 """
-    return prompt
@@ -7,7 +7,9 @@ See docs/translation/README.md for query patterns.
 
 import os
 import json
-from typing import Dict, Any
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List
 from src.core.translation.state import WorkflowState
 from src.core.llm.client import LLMClient
 from src.core.knowledge.neo4j_client import Neo4jClient
@@ -17,6 +19,56 @@ from datetime import datetime, timedelta
 
 logger = get_logger("question")
 
+# Knowledge fetches are independent, so they run side by side and the
+# question waits for the slowest one instead of the sum of all of them
+_fetch_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="question-fetch")
+
+# Recent history sent to the LLM (limit to prevent token overflow)
+MAX_HISTORY_RECORDS = 15
+
+# Follow-up offers the prompt forbids; generation stops when one starts
+_FOLLOW_UP_PHRASES = ("Would you like me to", "Should I ", "Do you want me to")
+_MAX_PHRASE_LEN = max(len(p) for p in _FOLLOW_UP_PHRASES)
+
+# Questions that ask for descriptions; otherwise description lines are left
+# out of the knowledge context to keep the prompt short
+_DESCRIBE_RE = re.compile(r"\b(describe|description|explain|what is|what does|tell me about|purpose)\b", re.IGNORECASE)
+
+_SYSTEM_INSTRUCTIONS = """You are a helpful assistant for a context-aware robot control system.
+
+Your task: Provide a clear, concise answer to the operator's question using the system knowledge below.
+
+Guidelines:
+- Answer in natural language (not JSON or technical format)
+- Be helpful and conversational
+- If asking about positions/tools/routines, list them clearly
+- If asking about current state, provide the current position and tool
+- If asking about history, respect the operator's requested quantity UP TO THE AVAILABLE DATA
+  (e.g., "10 latest" = show 10 if available, "50 latest" = show up to 50 if available)
+- If operator asks for more than available (e.g., "show 100" but only 50 in context), show what you have
+- If no specific number requested for history, show a reasonable summary (5-10 recent runs)
+- **HANDLE IMPLICIT CONTEXT**: If question references "latest", "more", or "the rest" without specifying WHAT,
+  assume they're asking about task history (most common follow-up question)
+- **DO NOT SHOW TECHNICAL IDs**: Hide run_id/correlation_id UUIDs - they are internal tracking only
+  Show task descriptions in plain language (e.g., "move to all positions" not "66197bd2-8213...")
+- If the question cannot be answered with available knowledge, politely explain what you CAN help with
+- Use bullet points for lists (indented with "  - ")
+- Handle synonyms naturally (e.g., "points" = "positions", "spots" = "positions")
+
+**CRITICAL - DO NOT ASK FOLLOW-UP QUESTIONS:**
+This is an INFORMATION-ONLY node. You are answering questions, NOT executing tasks.
+- DO NOT ask "Would you like me to proceed?"
+- DO NOT ask "Should I execute this?"
+- DO NOT ask "Do you want me to do X?"
+Just provide the factual answer. The operator will give a new command if they want action.
+
+Examples:
+WRONG: "The first task was X. Would you like me to proceed?"
+RIGHT: "The first task was X. To repeat it, say 'move to all positions'."
+
+Respond with ONLY your answer (no preamble like "Here's the answer:").
+"""
+
 
 def question_node(state: WorkflowState) -> Dict[str, Any]:
     """
@@ -38,57 +90,49 @@ def question_node(state: WorkflowState) -> Dict[str, Any]:
     
     logger.info("Processing question with LLM", correlation_id=correlation_id)
     
-    # Gather all knowledge for LLM context
-    neo4j = Neo4jClient()
-    neo4j.connect()
+    # Gather all knowledge for LLM context (concurrently)
+    state_db = RobotStateDB.get_default()
+    history_db = HistoryDB.get_default()
     
-    state_db = RobotStateDB()
-    history_db = HistoryDB()
+    positions = _fetch_pool.submit(_graph_fetch, "get_all_positions")
+    tools = _fetch_pool.submit(_graph_fetch, "get_all_tools")
+    routines = _fetch_pool.submit(_graph_fetch, "get_all_routines")
+    allowed_moves = _fetch_pool.submit(_graph_fetch, "get_all_allowed_moves")
+    robot_state = _fetch_pool.submit(state_db.get_state)
+    recent_runs = _fetch_pool.submit(_get_recent_runs, history_db)
     
-    try:
-        # Collect knowledge snapshot
-        positions = neo4j.get_all_positions()
-        tools = neo4j.get_all_tools()
-        routines = neo4j.get_all_routines()
-        robot_state = state_db.get_state()
-        
-        # Build allowed moves map
-        allowed_moves = {}
-        for pos in positions:
-            allowed_moves[pos["name"]] = neo4j.get_allowed_moves(pos["name"])
-        
-        # Get recent history (limit to prevent token overflow)
-        MAX_HISTORY_RECORDS = 15
-        
-        recent_runs = history_db.get_runs_by_date(datetime.now().strftime("%Y-%m-%d"))
-        if not recent_runs:
-            yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-            recent_runs = history_db.get_runs_by_date(yesterday)
-        
-        # Limit to most recent N runs
-        if recent_runs and len(recent_runs) > MAX_HISTORY_RECORDS:
-            recent_runs = recent_runs[:MAX_HISTORY_RECORDS]
-        
-        # Call LLM to answer question
-        response = _answer_question_with_llm(
-            operator_input=operator_input,
-            positions=positions,
-            tools=tools,
-            routines=routines,
-            robot_state=robot_state,
-            allowed_moves=allowed_moves,
-            recent_runs=recent_runs if recent_runs else [],
-            correlation_id=correlation_id
-        )
-        
-        logger.info("Question answered", correlation_id=correlation_id)
-        
-        return {
-            "response": response,
-        }
+    # Call LLM to answer question
+    response = _answer_question_with_llm(
+        operator_input=operator_input,
+        positions=positions.result(),
+        tools=tools.result(),
+        routines=routines.result(),
+        robot_state=robot_state.result(),
+        allowed_moves=allowed_moves.result(),
+        recent_runs=recent_runs.result(),
+        correlation_id=correlation_id
+    )
     
-    finally:
-        neo4j.close()
+    logger.info("Question answered", correlation_id=correlation_id)
+    
+    return {
+        "response": response,
+    }
+
+
+def _graph_fetch(method: str) -> Any:
+    """
+    Run one Neo4jClient lookup on the calling pool thread's client.
+    
+    Sessions are not thread-safe, so each pool thread keeps its own
+    connected client (Neo4jClient.get_default) across questions.
+    """
+    return getattr(Neo4jClient.get_default(), method)()
+
+
+def _get_recent_runs(history_db: HistoryDB) -> List[Dict[str, Any]]:
+    """Return runs from the last 24 hours (newest first), at most MAX_HISTORY_RECORDS."""
+    return history_db.get_recent_runs(datetime.now() - timedelta(days=1), MAX_HISTORY_RECORDS)
 
 
 def _answer_question_with_llm(
@@ -121,57 +165,27 @@ def _answer_question_with_llm(
     
     # Build comprehensive context for LLM
     context = _build_knowledge_context(
-        positions, tools, routines, robot_state, allowed_moves, recent_runs
+        positions, tools, routines, robot_state, allowed_moves, recent_runs,
+        include_descriptions=bool(_DESCRIBE_RE.search(operator_input)),
     )
     
-    # Build prompt
-    prompt = f"""You are a helpful assistant for a context-aware robot control system.
-
+    # Static instructions first, then the knowledge snapshot: the system
+    # message is identical across questions until the snapshot changes,
+    # so the provider can reuse its cached prefix
+    system = f"""{_SYSTEM_INSTRUCTIONS}
 SYSTEM KNOWLEDGE:
-{context}
-
-OPERATOR QUESTION:
-"{operator_input}"
-
-Your task: Provide a clear, concise answer to the operator's question using the system knowledge above.
-
-Guidelines:
-- Answer in natural language (not JSON or technical format)
-- Be helpful and conversational
-- If asking about positions/tools/routines, list them clearly
-- If asking about current state, provide the current position and tool
-- If asking about history, respect the operator's requested quantity UP TO THE AVAILABLE DATA
-  (e.g., "10 latest" = show 10 if available, "50 latest" = show up to 50 if available)
-- If operator asks for more than available (e.g., "show 100" but only 50 in context), show what you have
-- If no specific number requested for history, show a reasonable summary (5-10 recent runs)
-- **HANDLE IMPLICIT CONTEXT**: If question references "latest", "more", or "the rest" without specifying WHAT,
-  assume they're asking about task history (most common follow-up question)
-- **DO NOT SHOW TECHNICAL IDs**: Hide run_id/correlation_id UUIDs - they are internal tracking only
-  Show task descriptions in plain language (e.g., "move to all positions" not "66197bd2-8213...")
-- If the question cannot be answered with available knowledge, politely explain what you CAN help with
-- Use bullet points for lists (indented with "  - ")
-- Handle synonyms naturally (e.g., "points" = "positions", "spots" = "positions")
-
-**CRITICAL - DO NOT ASK FOLLOW-UP QUESTIONS:**
-This is an INFORMATION-ONLY node. You are answering questions, NOT executing tasks.
-- DO NOT ask "Would you like me to proceed?"
-- DO NOT ask "Should I execute this?"
-- DO NOT ask "Do you want me to do X?"
-Just provide the factual answer. The operator will give a new command if they want action.
-
-Examples:
-WRONG: "The first task was X. Would you like me to proceed?"
-RIGHT: "The first task was X. To repeat it, say 'move to all positions'."
-
-Respond with ONLY your answer (no preamble like "Here's the answer:").
-"""
+{context}"""
+    prompt = f'OPERATOR QUESTION:\n"{operator_input}"'
 
     start_time = time.time()
     
     try:
-        # Use unified LLM client
-        llm_client = LLMClient()
-        answer = llm_client.generate(prompt, correlation_id, temperature=0.3, max_tokens=800)
+        # Use unified LLM client (streamed so a forbidden follow-up is cut off early)
+        llm_client = LLMClient.get_default()
+        answer = _collect_answer(
+            llm_client.stream(prompt, correlation_id, temperature=0.3, max_tokens=800, system=system),
+            correlation_id,
+        )
         
         duration_ms = int((time.time() - start_time) * 1000)
         
@@ -192,17 +206,45 @@ Respond with ONLY your answer (no preamble like "Here's the answer:").
                 "or current robot status.")
 
 
+def _collect_answer(chunks: Iterator[str], correlation_id: str) -> str:
+    """
+    Join streamed chunks, stopping at the first follow-up question.
+    
+    The answer is cut before the phrase and the stream is closed, which
+    aborts the rest of the generation.
+    """
+    text = ""
+    try:
+        for chunk in chunks:
+            # Only the new chunk plus a phrase-length overlap can hold a new match
+            search_from = max(0, len(text) - _MAX_PHRASE_LEN)
+            text += chunk
+            cut = min((i for i in (text.find(p, search_from) for p in _FOLLOW_UP_PHRASES) if i > 0),
+                      default=-1)
+            if cut > 0:
+                logger.info("Stopped answer at follow-up question", correlation_id=correlation_id)
+                return text[:cut].rstrip()
+        return text
+    finally:
+        chunks.close()
+
+
 def _build_knowledge_context(
     positions: list,
     tools: list,
     routines: list,
     robot_state: dict,
     allowed_moves: dict,
-    recent_runs: list
+    recent_runs: list,
+    include_descriptions: bool = True
 ) -> str:
     """
     Build formatted knowledge context for LLM prompt.
     
+    Args:
+        include_descriptions: Add position/tool/routine descriptions (only
+            needed when the question asks for them)
+    
     Returns:
         Multi-line string with all system knowledge
     """
@@ -212,7 +254,8 @@ def _build_knowledge_context(
     lines.append("AVAILABLE POSITIONS:")
     for pos in positions:
         lines.append(f"  - {pos['name']} (role: {pos['role']})")
-        lines.append(f"    Description: {pos['description']}")
+        if include_descriptions:
+            lines.append(f"    Description: {pos['description']}")
         moves = allowed_moves.get(pos['name'], [])
         if moves:
             lines.append(f"    Can move to: {', '.join(moves)}")
@@ -220,14 +263,18 @@ def _build_knowledge_context(
     # Tools
     lines.append("\nAVAILABLE TOOLS:")
     for tool in tools:
-        lines.append(f"  - {tool['name']}: {tool['description']}")
+        if include_descriptions:
+            lines.append(f"  - {tool['name']}: {tool['description']}")
+        else:
+            lines.append(f"  - {tool['name']}")
     
     # Routines
     lines.append("\nAVAILABLE ROUTINES:")
     for routine in routines:
         tool_req = routine['required_tool'] if routine['required_tool'] != 'none' else 'no tool required'
         lines.append(f"  - {routine['name']} ({tool_req})")
-        lines.append(f"    Description: {routine['description']}")
+        if include_descriptions:
+            lines.append(f"    Description: {routine['description']}")
     
     # Current state
     lines.append("\nCURRENT ROBOT STATE:")
@@ -239,6 +286,7 @@ def _build_knowledge_context(
     if recent_runs:
         lines.append("\nRECENT TASK HISTORY:")
         for run in recent_runs:
-            lines.append(f"  - {run['run_id']}: \"{run['operator_input']}\" → {run['status']}")
+            # No run_id: the answer must not show internal IDs anyway
+            lines.append(f"  - \"{run['operator_input']}\" → {run['status']}")
     
     return "\n".join(lines)
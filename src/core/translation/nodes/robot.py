@@ -8,6 +8,7 @@ See docs/robot-layer/README.md for execution protocol.
 from typing import Dict, Any
 from src.core.translation.state import WorkflowState
 from src.core.robot.executor import RobotExecutor
+from src.core.translation.nodes.verify import wait_for_pending_writes
 from src.core.observability.logging import get_logger
 
 logger = get_logger("robot_node")
@@ -47,7 +48,9 @@ def robot_node(state: WorkflowState) -> Dict[str, Any]:
                correlation_id=correlation_id,
                note="YAML generated by verification layer")
     
-
+    # actions.yaml is written in the background by verify_node
+    wait_for_pending_writes()
+    
     execution_result = executor.execute_sequence(
         yaml_sequence,
         plan,
@@ -58,16 +61,20 @@ def robot_node(state: WorkflowState) -> Dict[str, Any]:
     if execution_result["success"]:
         logger.info("Robot execution completed", correlation_id=correlation_id)
         
-        response = f"Task completed successfully!\n"
-        response += f"Run ID: {execution_result['run_id']}\n"
-        response += f"\nYAML Sequence:\n{yaml_sequence}"
+        response = (
+            "Task completed successfully!\n"
+            f"Run ID: {execution_result['run_id']}\n"
+            f"\nYAML Sequence:\n{yaml_sequence}"
+        )
     else:
         logger.error("Robot execution failed", 
                     correlation_id=correlation_id,
                     error=execution_result["message"])
         
-        response = f"Execution failed: {execution_result['message']}\n"
-        response += f"Run ID: {execution_result['run_id']}"
+        response = (
+            f"Execution failed: {execution_result['message']}\n"
+            f"Run ID: {execution_result['run_id']}"
+        )
     
     return {
         "execution_result": execution_result,
@@ -9,69 +9,179 @@ See docs/translation/README.md for workflow diagram.
 import os
 import uuid
 import json
-from typing import Dict, Any, List
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from src.core.translation.state import WorkflowState
 from src.core.llm.client import LLMClient
-from src.core.observability.logging import get_logger
+from src.core.observability.logging import get_logger, bind_correlation_id
 from src.core.knowledge.sqlite_client import HistoryDB
 from src.core.knowledge.neo4j_client import Neo4jClient
 
+try:
+    import orjson  # Optional: faster parse of LLM replies and stored plans
+except ImportError:
+    orjson = None
+
 logger = get_logger("router")
 
+# Seconds the capabilities summary (and the classifier system message
+# rendered from it) is reused before Neo4j is asked again
+CAPABILITIES_CACHE_TTL = float(os.getenv("CAPABILITIES_CACHE_TTL", "60"))
 
-def _build_system_capabilities() -> str:
-    """
-    Query Neo4j to build dynamic description of system capabilities.
-    Returns formatted string describing available routines, tools, and positions.
-    
-    Graph-driven approach ensures Router adapts to changes in knowledge base.
-    """
-    try:
-        with Neo4jClient() as client:
-            routines = client.get_all_routines()
-            tools = client.get_all_tools()
-            positions = client.get_all_positions()
-            
-            capabilities = []
-            capabilities.append(f"Available routines: {', '.join(r['name'] for r in routines)}")
-            capabilities.append(f"Available tools: {', '.join(t['name'] for t in tools)}")
-            capabilities.append(f"Available positions: {', '.join(p['name'] for p in positions)}")
-            
-            return "\n".join(capabilities)
-    
-    except Exception as e:
-        logger.error("Failed to query graph for capabilities", error=str(e))
-        return "System capabilities unavailable"
+_classifier_system: Optional[str] = None
+_capabilities_expires = 0.0
+_capabilities_lock = threading.Lock()
+
+# Optional local intent classifier tried before the LLM: a pickled
+# scikit-learn style model (predict_proba + classes_) trained offline on
+# (operator_input, intent) pairs. Only answers at or above the threshold
+# are used; everything else escalates to the LLM.
+ROUTER_CLASSIFIER_PATH = os.getenv("ROUTER_CLASSIFIER_PATH")
+ROUTER_CLASSIFIER_THRESHOLD = float(os.getenv("ROUTER_CLASSIFIER_THRESHOLD", "0.9"))
+
+_VALID_INTENTS = ("action", "question", "unknown")
+
+_local_classifier: Any = None
+_local_classifier_loaded = False
+_local_classifier_lock = threading.Lock()
+
+# Keyword tables for replay detection and the fallback classifier. Each is
+# matched as one compiled alternation (substring semantics, single scan).
+_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+# "give/show me <number>" with no clear action verb (N items from history)
+_GIVE_SHOW_NUM = r'(?:give|show)\s+me\s+\d+'
+_REPLAY_PHRASES = ("do that again", "repeat last", "run the same", "do it again")
+_FOLLOWUP_PHRASES = (
+    "more information", "tell me more", "give me more", "what else",
+    "more details", "explain more", "and what about", "what about",
+    "the latest", "the last", "show me", "give me the", "give me"
+)
+_QUESTION_WORDS = ("what", "where", "which", "how many", "list", "show", "tell me", "explain", "give me")
+_ACTION_WORDS = ("move", "go", "weld", "inspect", "attach", "pick", "release", "change")
 
+# Inputs whose intent is known without the LLM (whole input, lowercased)
+_ACTION_CONFIRMATIONS = frozenset({"yes", "proceed", "go ahead", "do it", "confirm", "ok", "okay"})
+_QUESTION_HEADS = ("what ", "what's ", "where ", "which ", "how many ", "show me ", "list ")
 
-def _classify_intent_with_llm(operator_input: str, correlation_id: str) -> str:
+
+def _deterministic_intent(operator_input: str) -> Optional[str]:
     """
-    Use LLM to classify operator input intent.
-    
-    Intent categories:
-    - action: Command requiring task planning and robot execution
-    - question: Information query about system state or capabilities
-    - unknown: Unclear, out-of-scope, or ambiguous input
+    Classify confirmations and plain questions without the LLM.
     
     Args:
-        operator_input: Natural language input from operator
-        correlation_id: Correlation ID for tracing
+        operator_input: Stripped, lowercased operator input
     
     Returns:
-        Intent classification: "action" | "question" | "unknown"
+        "action" | "question", or None when the LLM must decide
+    """
+    text = operator_input.rstrip(".!")
+    if text in _ACTION_CONFIRMATIONS:
+        return "action"
+    if text.endswith("?") and text.startswith(_QUESTION_HEADS):
+        return "question"
+    return None
+
+
+def _any_substring_re(phrases, *patterns: str) -> "re.Pattern[str]":
+    """Compile phrases (plus optional raw patterns) into one regex that matches if any occurs in the text."""
+    return re.compile("|".join([*map(re.escape, phrases), *patterns]))
+
+
+# First flat JSON object in a classifier reply (drops ``` fences and commentary)
+_JSON_OBJ_RE = re.compile(r'\{[^{}]*\}')
+
+_REPLAY_RE = _any_substring_re(_REPLAY_PHRASES)
+# Every follow-up phrase, question word and "give me N" means "question", so
+# they share one automaton and the fallback scans the input at most twice
+_QUESTION_RE = _any_substring_re(_FOLLOWUP_PHRASES + _QUESTION_WORDS, _GIVE_SHOW_NUM)
+_ACTION_RE = _any_substring_re(_ACTION_WORDS)
+
+# Parsed plans of completed runs, keyed by run_id (least recently used
+# first). A run's sequence_json is written once and never changes, so
+# replays of the same run skip the JSON parse. Shared - do not mutate.
+PLAN_CACHE_MAX_ENTRIES = 128
+_plan_cache: "OrderedDict[str, Any]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+# The three capability lookups are independent, so a cold cache waits for
+# the slowest one instead of the sum of all three
+_fetch_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="router-fetch")
+
+
+def _json_loads(text: str) -> Any:
+    """json.loads via orjson when installed (its JSONDecodeError subclasses json's)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def invalidate_capabilities_cache():
+    """Drop the cached capabilities summary (call after editing the graph)."""
+    global _classifier_system
+    with _capabilities_lock:
+        _classifier_system = None
+
+
+def _build_classifier_system() -> str:
     """
-    import time
+    Return the classifier system message: instructions plus a description of
+    the routines, tools and positions queried from Neo4j.
     
-    # Get system capabilities from graph
-    capabilities = _build_system_capabilities()
+    Graph-driven approach ensures Router adapts to changes in knowledge base.
+    The rendered message is cached for CAPABILITIES_CACHE_TTL seconds, so
+    per-call work is only the operator input; failures are not cached.
+    """
+    global _classifier_system, _capabilities_expires
     
-    # Build classification prompt
-    prompt = f"""You are an intent classifier for a context-aware robot control system.
+    with _capabilities_lock:
+        if _classifier_system is not None and time.monotonic() < _capabilities_expires:
+            return _classifier_system
+        
+        capabilities = _query_system_capabilities()
+        if capabilities is None:
+            return _render_classifier_system("System capabilities unavailable")
+        _classifier_system = _render_classifier_system(capabilities)
+        _capabilities_expires = time.monotonic() + CAPABILITIES_CACHE_TTL
+        return _classifier_system
+
+
+def _render_classifier_system(capabilities: str) -> str:
+    """Render the classifier system message around a capabilities summary."""
+    return f"""{_CLASSIFIER_INTRO}
 
 SYSTEM CAPABILITIES:
 {capabilities}
 
-Your task: Classify the operator's input into ONE of these intents:
+{_CLASSIFIER_RULES}"""
+
+
+def _query_system_capabilities() -> Optional[str]:
+    """Format routines, tools and positions from Neo4j, or None if the graph is unavailable."""
+    try:
+        routines = _fetch_pool.submit(_graph_fetch, "get_all_routines")
+        tools = _fetch_pool.submit(_graph_fetch, "get_all_tools")
+        positions = _fetch_pool.submit(_graph_fetch, "get_all_positions")
+        
+        capabilities = []
+        capabilities.append(f"Available routines: {', '.join(r['name'] for r in routines.result())}")
+        capabilities.append(f"Available tools: {', '.join(t['name'] for t in tools.result())}")
+        capabilities.append(f"Available positions: {', '.join(p['name'] for p in positions.result())}")
+        
+        return "\n".join(capabilities)
+    
+    except Exception as e:
+        logger.error("Failed to query graph for capabilities", error=str(e))
+        return None
+
+
+# Classifier instructions sent as the system message (plain strings, braces included)
+_CLASSIFIER_INTRO = """You are an intent classifier for a context-aware robot control system."""
+
+_CLASSIFIER_RULES = """Your task: Classify the operator's input into ONE of these intents:
 1. "action" - Commands that require robot movement, tool operations, or routine execution
    Examples: 
    - Direct commands: "Move to station 5", "Process at area B", "Pick up the gripper tool"
@@ -95,32 +205,159 @@ Your task: Classify the operator's input into ONE of these intents:
 - "What is X?" or "Show me X" = QUESTION (operator wants information)
 - "proceed" / "yes" / "go ahead" = ACTION (confirmation after review)
 
-OPERATOR INPUT: "{operator_input}"
-
 Respond with ONLY a JSON object in this exact format:
-{{
+{
   "intent": "action|question|unknown",
   "reasoning": "Brief explanation"
-}}
+}
 
 Do NOT include any other text, commentary, or markdown formatting."""
 
+
+def _get_local_classifier() -> Any:
+    """Load the ROUTER_CLASSIFIER_PATH model once; None if unset or unloadable."""
+    global _local_classifier, _local_classifier_loaded
+    
+    with _local_classifier_lock:
+        if not _local_classifier_loaded:
+            _local_classifier_loaded = True
+            if ROUTER_CLASSIFIER_PATH:
+                try:
+                    import pickle
+                    with open(ROUTER_CLASSIFIER_PATH, "rb") as f:
+                        _local_classifier = pickle.load(f)
+                    logger.info("Local intent classifier loaded", path=ROUTER_CLASSIFIER_PATH)
+                except Exception as e:
+                    logger.error("Failed to load local intent classifier",
+                                path=ROUTER_CLASSIFIER_PATH,
+                                error=str(e))
+        return _local_classifier
+
+
+def _classify_locally(operator_input: str) -> Optional[Tuple[str, float]]:
+    """
+    Classify with the local model when it is confident enough.
+    
+    Returns:
+        (intent, confidence), or None to escalate to the LLM
+    """
+    model = _get_local_classifier()
+    if model is None:
+        return None
+    try:
+        probabilities = model.predict_proba([operator_input])[0]
+    except Exception as e:
+        logger.warning("Local intent classifier failed", error=str(e))
+        return None
+    
+    best = max(range(len(probabilities)), key=probabilities.__getitem__)
+    intent, confidence = str(model.classes_[best]), float(probabilities[best])
+    if intent in _VALID_INTENTS and confidence >= ROUTER_CLASSIFIER_THRESHOLD:
+        return intent, confidence
+    return None
+
+
+def _load_run_plan(run: Dict[str, Any]) -> Any:
+    """
+    Return the parsed sequence_json of a history run, cached by run_id.
+    
+    run may omit sequence_json; on a cache miss it is then read on its own.
+    """
+    run_id = run["run_id"]
+    with _plan_cache_lock:
+        plan = _plan_cache.get(run_id)
+        if plan is not None:
+            _plan_cache.move_to_end(run_id)
+            return plan
+    
+    sequence_json = run.get("sequence_json")
+    if sequence_json is None:
+        sequence_json = HistoryDB.get_default().get_plan_json(run_id)
+    plan = _json_loads(sequence_json)
+    with _plan_cache_lock:
+        _plan_cache[run_id] = plan
+        if len(_plan_cache) > PLAN_CACHE_MAX_ENTRIES:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+# Short inputs with no name-like tokens (confirmations, "do it please")
+# are classified without the capabilities block
+_COMPACT_INPUT_MAX_CHARS = 20
+_COMPACT_CLASSIFIER_SYSTEM = f"""{_CLASSIFIER_INTRO}
+
+{_CLASSIFIER_RULES}"""
+
+
+def _needs_capabilities(operator_input: str) -> bool:
+    """
+    True unless the input is short and has no possible graph names.
+    
+    Possible names are tokens with digits or a capital letter (the first
+    word is exempt, since sentences start capitalized).
+    """
+    text = operator_input.strip()
+    if len(text) >= _COMPACT_INPUT_MAX_CHARS or any(c.isdigit() for c in text):
+        return True
+    return any(word[:1].isupper() for word in text.split()[1:])
+
+
+def _graph_fetch(method: str) -> Any:
+    """Run one Neo4jClient lookup on the calling pool thread's client (sessions are not thread-safe)."""
+    return getattr(Neo4jClient.get_default(), method)()
+
+
+def _classify_intent_with_llm(operator_input: str, correlation_id: str, operator_input_lower: str) -> str:
+    """
+    Use LLM to classify operator input intent.
+    
+    Intent categories:
+    - action: Command requiring task planning and robot execution
+    - question: Information query about system state or capabilities
+    - unknown: Unclear, out-of-scope, or ambiguous input
+    
+    Args:
+        operator_input: Natural language input from operator
+        correlation_id: Correlation ID for tracing
+        operator_input_lower: Stripped, lowercased input (keyword fallback)
+    
+    Returns:
+        Intent classification: "action" | "question" | "unknown"
+    """
+    # Confident local predictions skip the graph query and the LLM call
+    local = _classify_locally(operator_input)
+    if local is not None:
+        intent, confidence = local
+        logger.info("Local intent classification complete",
+                   correlation_id=correlation_id,
+                   intent=intent,
+                   confidence=round(confidence, 3))
+        return intent
+    
+    # Instructions and capabilities are identical across requests, so they go
+    # in the system message (provider prefix cache); only the input varies
+    # Short confirmation-style inputs skip the capabilities block (and Neo4j)
+    compact = not _needs_capabilities(operator_input)
+    system = _COMPACT_CLASSIFIER_SYSTEM if compact else _build_classifier_system()
+    prompt = f'OPERATOR INPUT: "{operator_input}"'
+    
     start_time = time.time()
     
     try:
         # Use unified LLM client
-        llm_client = LLMClient()
-        content = llm_client.generate(prompt, correlation_id, temperature=0.0, max_tokens=150)
+        llm_client = LLMClient.get_default()
+        content = llm_client.generate(prompt, correlation_id, temperature=0.0, max_tokens=150, system=system)
         
         duration_ms = int((time.time() - start_time) * 1000)
         
-        # Parse LLM response
-        classification = json.loads(content.strip())
+        # Parse LLM response (the {"intent", "reasoning"} object has no nesting)
+        match = _JSON_OBJ_RE.search(content)
+        classification = _json_loads(match.group(0) if match else content.strip())
         intent = classification.get("intent", "unknown")
         reasoning = classification.get("reasoning", "")
         
         # Validate intent value
-        if intent not in ["action", "question", "unknown"]:
+        if intent not in _VALID_INTENTS:
             logger.warning("Invalid intent from LLM, defaulting to unknown", 
                          correlation_id=correlation_id, 
                          invalid_intent=intent)
@@ -130,6 +367,7 @@ Do NOT include any other text, commentary, or markdown formatting."""
                    correlation_id=correlation_id,
                    intent=intent,
                    reasoning=reasoning,
+                   compact_prompt=compact,
                    duration_ms=duration_ms)
         
         return intent
@@ -146,7 +384,7 @@ Do NOT include any other text, commentary, or markdown formatting."""
                     correlation_id=correlation_id,
                     error=str(e))
         # Fallback to simple keyword matching
-        return _fallback_keyword_classification(operator_input)
+        return _fallback_keyword_classification(operator_input_lower)
 
 
 def _fallback_keyword_classification(operator_input: str) -> str:
@@ -155,41 +393,27 @@ def _fallback_keyword_classification(operator_input: str) -> str:
     Used only when LLM fails - not the primary classification method.
     
     Args:
-        operator_input: Operator input (lowercase)
+        operator_input: Operator input (stripped and lowercased by the caller)
     
     Returns:
         Intent: "action" | "question" | "unknown"
     """
-    import re
-    operator_input = operator_input.lower()
-    
-    # Follow-up phrases (treat as questions)
-    followup_phrases = [
-        "more information", "tell me more", "give me more", "what else", 
-        "more details", "explain more", "and what about", "what about",
-        "the latest", "the last", "show me", "give me the", "give me"
-    ]
-    if any(phrase in operator_input for phrase in followup_phrases):
-        return "question"
-    
-    # Check for number + implicit context (e.g., "give me 15")
-    # Pattern: "give/show me <number>" with no clear action verb
-    if re.search(r'(give|show)\s+me\s+\d+', operator_input):
-        return "question"  # Assume asking for N items from history
-    
-    # Strong question indicators
-    question_words = ["what", "where", "which", "how many", "list", "show", "tell me", "explain", "give me"]
-    if any(word in operator_input for word in question_words):
+    # Follow-up phrases, "give/show me <number>" and strong question
+    # indicators (all checked before action verbs)
+    if _QUESTION_RE.search(operator_input):
         return "question"
     
     # Common action verbs
-    action_words = ["move", "go", "weld", "inspect", "attach", "pick", "release", "change"]
-    if any(word in operator_input for word in action_words):
+    if _ACTION_RE.search(operator_input):
         return "action"
     
     return "unknown"
 
 
+# Next node per classified intent (anything else goes to fallback)
+_ROUTE_MAP = {"action": "sequence_planning", "question": "question"}
+
+
 def router_node(state: WorkflowState) -> Dict[str, Any]:
     """
     Classify operator input intent and generate correlation ID.
@@ -215,27 +439,37 @@ def router_node(state: WorkflowState) -> Dict[str, Any]:
     """
     operator_input = state["operator_input"].strip().lower()
     
-    # Generate correlation ID for tracing
+    # Generate correlation ID for tracing (bound for every log call below)
     correlation_id = str(uuid.uuid4())
     
-    logger.info("Router processing input", correlation_id=correlation_id)
+    with bind_correlation_id(correlation_id):
+        return _route_input(state, operator_input, correlation_id)
+
+
+def _route_input(state: WorkflowState, operator_input: str, correlation_id: str) -> Dict[str, Any]:
+    """
+    Classify operator input (body of router_node, correlation_id bound).
+    
+    operator_input is the stripped, lowercased text used by every keyword
+    check; state["operator_input"] (raw) goes to the LLM and the returned state.
+    """
+    raw_input = state["operator_input"]
+    logger.info("Router processing input")
     
     # Check for UUID-based replay (e.g., "run task 66197bd2..." or "do the one named 66197bd2...")
-    import re
-    uuid_pattern = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
-    uuid_match = re.search(uuid_pattern, operator_input)
+    uuid_match = _UUID_RE.search(operator_input)
     
     if uuid_match:
         target_run_id = uuid_match.group(0)
-        logger.info("Detected UUID-based replay intent", correlation_id=correlation_id, target_run_id=target_run_id)
+        logger.info("Detected UUID-based replay intent", target_run_id=target_run_id)
         
         # Load specific run from history
-        history_db = HistoryDB()
-        target_run = history_db.get_run_by_id(target_run_id)
+        history_db = HistoryDB.get_default()
+        # Plan blob is only read (by _load_run_plan) when not already cached
+        target_run = history_db.get_run_by_id(target_run_id, include_sequence=False)
         
         if target_run and target_run["status"] == "completed":
-            import json
-            plan = json.loads(target_run["sequence_json"])
+            plan = _load_run_plan(target_run)
             
             return {
                 "correlation_id": correlation_id,
@@ -245,53 +479,56 @@ def router_node(state: WorkflowState) -> Dict[str, Any]:
                 "plan_attempt": 1,
             }
         else:
-            logger.warning("Run ID not found or not completed", correlation_id=correlation_id, target_run_id=target_run_id)
+            logger.warning("Run ID not found or not completed", target_run_id=target_run_id)
             return {
                 "correlation_id": correlation_id,
-                "operator_input": state["operator_input"],
+                "operator_input": raw_input,
                 "intent": "unknown",
                 "response": f"Task {target_run_id[:8]}... not found or not completed."
             }
     
     # Check for general replay intent (no specific UUID)
-    replay_phrases = ["do that again", "repeat last", "run the same", "do it again"]
-    if any(phrase in operator_input for phrase in replay_phrases):
-        logger.info("Detected replay intent", correlation_id=correlation_id)
+    if _REPLAY_RE.search(operator_input):
+        logger.info("Detected replay intent")
         
         # Load latest completed run from history
-        history_db = HistoryDB()
+        history_db = HistoryDB.get_default()
         last_run = history_db.get_latest_completed_run()
         
         if last_run:
-            import json
-            plan = json.loads(last_run["sequence_json"])
+            plan = _load_run_plan(last_run)
             
             return {
                 "correlation_id": correlation_id,
-                "operator_input": state["operator_input"],
+                "operator_input": raw_input,
                 "intent": "action",
                 "plan": plan,
                 "plan_attempt": 1,  # Still requires human approval
             }
         else:
-            logger.warning("No completed runs found for replay", correlation_id=correlation_id)
+            logger.warning("No completed runs found for replay")
             return {
                 "correlation_id": correlation_id,
-                "operator_input": state["operator_input"],
+                "operator_input": raw_input,
                 "intent": "unknown",
                 "response": "No previous tasks found to repeat. Please describe a new task."
             }
     
-    # Classify intent using LLM (graph-aware natural language understanding)
-    intent = _classify_intent_with_llm(state["operator_input"], correlation_id)
+    # Confirmations and plain questions are decided without the LLM
+    intent = _deterministic_intent(operator_input)
+    path = "rules"
+    if intent is None:
+        # Classify intent using LLM (graph-aware natural language understanding)
+        intent = _classify_intent_with_llm(raw_input, correlation_id, operator_input)
+        path = "classifier"
     
-    logger.info("Intent classified", correlation_id=correlation_id, intent=intent)
+    logger.info("Intent classified", intent=intent, path=path)
     
     # STATELESS DESIGN: No busy checking - every command is independent
     # Robot execution is optional simulation, doesn't block planning
     return {
         "correlation_id": correlation_id,
-        "operator_input": state["operator_input"],
+        "operator_input": raw_input,
         "intent": intent,
         "plan_attempt": 1,
     }
@@ -304,11 +541,4 @@ def route_condition(state: WorkflowState) -> str:
     Returns:
         Node name to route to: "sequence_planning" | "question" | "fallback"
     """
-    intent = state.get("intent")
-    
-    if intent == "action":
-        return "sequence_planning"
-    elif intent == "question":
-        return "question"
-    else:
-        return "fallback"
+    return _ROUTE_MAP.get(state.get("intent"), "fallback")
@@ -9,16 +9,43 @@ This separation of concerns improves reliability by letting each component
 focus on what it does best.
 """
 
-import os
+import atexit
+import queue
 from typing import Dict, Any
-from src.core.translation.state import WorkflowState
+from src.core.translation.state import WorkflowState, MAX_PLAN_ATTEMPTS
 from src.core.translation.nodes.intent_parser import parse_intent_node
 from src.core.translation.sequence_builder import SequenceBuilder
-from src.core.observability.logging import get_logger
+from src.core.observability.logging import get_logger, bind_state_correlation_id
 
 logger = get_logger("sequence_planning")
 
+# Idle builders reused across requests, most recently used first. Each one
+# owns a connected Neo4j session and is used by one request at a time;
+# concurrent requests get extra builders, which join the pool afterwards.
+_idle_builders: "queue.LifoQueue[SequenceBuilder]" = queue.LifoQueue()
 
+
+def _acquire_builder() -> SequenceBuilder:
+    """Take an idle builder from the pool, or create one if none is idle."""
+    try:
+        return _idle_builders.get_nowait()
+    except queue.Empty:
+        return SequenceBuilder()
+
+
+def _close_idle_builders():
+    """Close pooled builders (called at exit)."""
+    while True:
+        try:
+            _idle_builders.get_nowait().close()
+        except queue.Empty:
+            return
+
+
+atexit.register(_close_idle_builders)
+
+
+@bind_state_correlation_id
 def sequence_planning_node(state: WorkflowState) -> Dict[str, Any]:
     """
     Two-stage planning process:
@@ -45,7 +72,6 @@ def sequence_planning_node(state: WorkflowState) -> Dict[str, Any]:
     plan_attempt = state.get("plan_attempt", 1)
     
     logger.info("Starting two-stage planning",
-               correlation_id=correlation_id,
                attempt=plan_attempt,
                has_human_feedback=bool(human_comments))
     
@@ -55,26 +81,23 @@ def sequence_planning_node(state: WorkflowState) -> Dict[str, Any]:
     
     # Check if LLM understood the command
     if intent.get("goal") == "unknown":
-        logger.warning("Could not parse intent",
-                      correlation_id=correlation_id)
+        logger.warning("Could not parse intent")
         return {
             "plan": [],
             "validation_errors": "Could not understand operator command. Please rephrase."
         }
     
     # Stage 2: Build concrete sequence using graph algorithms
-    builder = SequenceBuilder()
+    builder = _acquire_builder()
     try:
         plan = builder.build_sequence(intent, correlation_id)
         
         logger.info("Sequence planning completed",
-                   correlation_id=correlation_id,
                    intent=intent,
                    step_count=len(plan))
         
         # Log the full plan for visibility
         logger.info("Generated plan details",
-                   correlation_id=correlation_id,
                    plan=plan)
         
         return {
@@ -84,7 +107,6 @@ def sequence_planning_node(state: WorkflowState) -> Dict[str, Any]:
     
     except Exception as e:
         logger.error("Sequence building failed",
-                    correlation_id=correlation_id,
                     intent=intent,
                     error=str(e))
         return {
@@ -94,7 +116,7 @@ def sequence_planning_node(state: WorkflowState) -> Dict[str, Any]:
         }
     
     finally:
-        builder.close()
+        _idle_builders.put(builder)
 
 
 def sequence_planning_condition(state: WorkflowState) -> str:
@@ -111,21 +133,21 @@ def sequence_planning_condition(state: WorkflowState) -> str:
     plan = state.get("plan", [])
     validation_errors = state.get("validation_errors")
     plan_attempt = state.get("plan_attempt", 1)
-    max_attempts = int(os.getenv("MAX_PLAN_ATTEMPTS", "3"))
+    correlation_id = state["correlation_id"]
     
     # Check if planning failed (validation errors and empty plan)
     if validation_errors and len(plan) == 0:
-        if plan_attempt < max_attempts:
+        if plan_attempt < MAX_PLAN_ATTEMPTS:
             # Retry planning with error feedback
             logger.info("Planning failed, will retry",
-                       correlation_id=state["correlation_id"],
+                       correlation_id=correlation_id,
                        attempt=plan_attempt,
                        error=validation_errors)
             return "sequence_planning"
         else:
             # Max attempts reached, route to fallback
             logger.warning("Planning failed, max attempts reached",
-                          correlation_id=state["correlation_id"],
+                          correlation_id=correlation_id,
                           attempts=plan_attempt)
             return "fallback"
     else:
@@ -10,18 +10,28 @@ This is the final stage before execution - verifies that:
 See docs/verification/README.md for detailed validation logic.
 """
 
+import atexit
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from datetime import datetime
 from pathlib import Path
-from src.core.translation.state import WorkflowState
+from src.core.translation.state import WorkflowState, MAX_PLAN_ATTEMPTS
 from src.core.verification.verifier import verify_plan
 from src.core.verification.yaml_converter import convert_to_yaml
-from src.core.observability.logging import get_logger
+from src.core.observability.logging import get_logger, bind_state_correlation_id
 
 logger = get_logger("verify_node")
 
+# actions.yaml is written off the workflow thread; one worker keeps writes in
+# submission order. Readers of the file call wait_for_pending_writes() first.
+_WRITER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yaml-writer")
+_pending_writes = []
+_pending_lock = threading.Lock()
 
+
+@bind_state_correlation_id
 def verify_node(state: WorkflowState) -> Dict[str, Any]:
     """
     Verify plan safety and generate YAML output.
@@ -44,11 +54,11 @@ def verify_node(state: WorkflowState) -> Dict[str, Any]:
         or validation_errors for retry (if invalid)
     """
     correlation_id = state["correlation_id"]
-    plan = state["plan"]
+    plan = state.get("plan", [])
     operator_input = state.get("operator_input", "Unknown command")
     plan_attempt = state.get("plan_attempt", 1)
     
-    logger.info("Starting verification", correlation_id=correlation_id, attempt=plan_attempt)
+    logger.info("Starting verification", attempt=plan_attempt)
     
     # Step 1: Verify plan safety (positions, tools, movements)
     result = verify_plan(plan, correlation_id)
@@ -58,8 +68,7 @@ def verify_node(state: WorkflowState) -> Dict[str, Any]:
     
     if result.valid:
         # Step 2: Generate YAML output for robot execution
-        logger.info("Verification passed - generating YAML output", 
-                   correlation_id=correlation_id)
+        logger.info("Verification passed - generating YAML output")
         
         # Convert validated plan to YAML format
         yaml_output = convert_to_yaml(
@@ -69,8 +78,10 @@ def verify_node(state: WorkflowState) -> Dict[str, Any]:
             correlation_id=correlation_id
         )
         
-        # Write YAML to file for robot execution
-        _write_yaml_to_file(yaml_output, correlation_id, operator_input)
+        # Write YAML to file for robot execution (in background)
+        future = _WRITER_POOL.submit(_write_yaml_to_file, yaml_output, correlation_id, operator_input)
+        with _pending_lock:
+            _pending_writes.append(future)
         
         return {
             "verification_result": verification_result,
@@ -79,8 +90,7 @@ def verify_node(state: WorkflowState) -> Dict[str, Any]:
     else:
         # Verification failed - provide feedback for planner to fix issues
         feedback = verification_result["feedback"]
-        logger.warning("Verification failed", 
-                      correlation_id=correlation_id,
+        logger.warning("Verification failed",
                       feedback=feedback,
                       attempt=plan_attempt)
         return {
@@ -103,12 +113,11 @@ def verify_condition(state: WorkflowState) -> str:
     """
     verification_result = state.get("verification_result", {})
     plan_attempt = state.get("plan_attempt", 1)
-    max_attempts = int(os.getenv("MAX_PLAN_ATTEMPTS", "3"))
     
     if verification_result.get("valid"):
         # Verification passed - proceed to robot execution
         return "robot"
-    elif plan_attempt < max_attempts:
+    elif plan_attempt < MAX_PLAN_ATTEMPTS:
         # Verification failed - retry planning with feedback
         return "sequence_planning"
     else:
@@ -116,31 +125,66 @@ def verify_condition(state: WorkflowState) -> str:
         return "fallback"
 
 
+def wait_for_pending_writes(timeout: float = None):
+    """
+    Block until every submitted actions.yaml write has finished.
+    
+    Called before anything reads actions.yaml (robot execution) and at
+    shutdown. A failed write is logged and raised here.
+    
+    Args:
+        timeout: Max seconds to wait per write (None = no limit)
+    """
+    with _pending_lock:
+        futures = _pending_writes[:]
+        _pending_writes.clear()
+    for future in futures:
+        try:
+            future.result(timeout=timeout)
+        except Exception as e:
+            logger.error("YAML write failed", error=str(e))
+            raise
+
+
+def _shutdown_writer():
+    try:
+        wait_for_pending_writes()
+    except Exception:
+        pass  # Already logged
+    _WRITER_POOL.shutdown(wait=True)
+
+
+atexit.register(_shutdown_writer)
+
+
 def _write_yaml_to_file(yaml_sequence: str, correlation_id: str, operator_input: str):
     """
     Write YAML sequence to actions.yaml file.
     
     This file is the deliverable output that can be executed by the robot controller.
-    Each write overwrites the previous content with the new sequence.
+    Each write overwrites the previous content with the new sequence. The file
+    is written to a temporary sibling and renamed into place, so a reader never
+    sees a partially written sequence.
     """
     actions_file = Path("actions.yaml")
+    tmp_file = actions_file.with_name(actions_file.name + ".tmp")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    # Add header with run metadata
-    separator = f"""
+    # Header with run metadata, YAML and trailing blank line in one write
+    content = f"""
 # ============================================================================
 # Run ID: {correlation_id}
 # Command: "{operator_input}"
 # Timestamp: {timestamp}
 # ============================================================================
 
+{yaml_sequence}
+
 """
     
-    # Write YAML with header
-    with open(actions_file, "w", encoding="utf-8") as f:
-        f.write(separator)
-        f.write(yaml_sequence)
-        f.write("\n\n")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_file, actions_file)  # Atomic on POSIX and Windows
     
     logger.info("YAML written to actions.yaml", 
                correlation_id=correlation_id,
@@ -12,13 +12,118 @@ The separation between intent parsing (LLM) and sequence building (graph algorit
 improves reliability and makes the system easier to test and debug.
 """
 
-from typing import Dict, List, Any, Optional
+import copy
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from src.core.knowledge.neo4j_client import Neo4jClient
 from src.core.knowledge.sqlite_client import RobotStateDB
 from src.core.observability.logging import get_logger
 
 logger = get_logger("sequence_builder")
 
+# Built sequences keyed by (graph, intent JSON, start position, start tool).
+# Planning is deterministic for a static graph, so a repeated intent from
+# the same robot state gets the same steps. Shared by all builders; call
+# clear_sequence_cache() after editing the graph (with Neo4jClient.invalidate).
+SEQUENCE_CACHE_MAX_ENTRIES = 256
+_sequence_cache: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+_sequence_cache_lock = threading.Lock()
+
+# Planning prefetches run here; results land in the shared query cache
+_prefetch_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="plan-prefetch")
+
+
+def _graph_fetch(method: str, *args: Any) -> Any:
+    """Run one Neo4jClient lookup on the calling pool thread's client (sessions are not thread-safe)."""
+    return getattr(Neo4jClient.get_default(), method)(*args)
+
+
+def clear_sequence_cache():
+    """Drop all memoized sequences (call after editing the knowledge graph)."""
+    with _sequence_cache_lock:
+        _sequence_cache.clear()
+    logger.info("Sequence cache cleared")
+
+
+# :SUPPORTED_AT properties copied onto a step when set in the graph
+_META_KEYS = ("stabilize", "action_after", "verify")
+
+
+@lru_cache(maxsize=256)
+def _routine_display_name(routine_name: str) -> str:
+    """Step name prefix for a routine: "spot_weld" -> "Spot Weld" (computed once per name)."""
+    return routine_name.replace("_", " ").title()
+
+
+class StepBuffer:
+    """
+    Concrete steps of a plan being built, stored column-wise.
+    
+    One list per step field instead of one dict per step; ids are implicit
+    (position + 1). Optional fields hold None when unset and are left out
+    by to_dicts(), which produces the list-of-dicts plan format used in
+    workflow state, YAML conversion and run history.
+    """
+    
+    __slots__ = ("names", "actions", "targets", "positions", "tools", "stabilize", "action_after", "verify")
+    
+    def __init__(self):
+        self.names: List[str] = []
+        self.actions: List[str] = []
+        self.targets: List[str] = []
+        self.positions: List[Optional[str]] = []
+        self.tools: List[Optional[str]] = []
+        self.stabilize: List[Any] = []
+        self.action_after: List[Any] = []
+        self.verify: List[Any] = []
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def append(self, name: str, action: str, target: str, position: Optional[str] = None,
+               tool: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None):
+        """Add one step; non-empty metadata fields (stabilize, action_after, verify) are kept."""
+        self.names.append(name)
+        self.actions.append(action)
+        self.targets.append(target)
+        self.positions.append(position)
+        self.tools.append(tool)
+        metadata = metadata or {}
+        self.stabilize.append(metadata.get("stabilize") or None)
+        self.action_after.append(metadata.get("action_after") or None)
+        self.verify.append(metadata.get("verify") or None)
+    
+    def extend_moves(self, positions: List[str]):
+        """Add a move step to each of positions, in order."""
+        n = len(positions)
+        self.names.extend(f"Move to {pos}" for pos in positions)
+        self.actions.extend(["move"] * n)
+        self.targets.extend(positions)
+        for column in (self.positions, self.tools, self.stabilize, self.action_after, self.verify):
+            column.extend([None] * n)
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Return the steps as plan dicts with sequential ids from 1.
+        
+        Example:
+            [{"id": 1, "name": "Move to <position>", "action": "move", "target": "<position>"}]
+        """
+        optional = ("position", "tool") + _META_KEYS
+        steps = []
+        for i, row in enumerate(zip(self.names, self.actions, self.targets, self.positions,
+                                    self.tools, self.stabilize, self.action_after, self.verify), start=1):
+            step = {"id": i, "name": row[0], "action": row[1], "target": row[2]}
+            for key, value in zip(optional, row[3:]):
+                if value is not None:
+                    step[key] = value
+            steps.append(step)
+        return steps
+
 
 class SequenceBuilder:
     """
@@ -35,12 +140,36 @@ class SequenceBuilder:
     def __init__(self):
         self.neo4j = Neo4jClient()
         self.neo4j.connect()
-        self.state_db = RobotStateDB()
+        self.state_db = RobotStateDB.get_default()
     
     def close(self):
-        """Close database connections."""
+        """Close the Neo4j session (the shared state DB stays open)."""
         self.neo4j.close()
     
+    def _shortest_path(self, from_position: str, to_position: str) -> Optional[List[str]]:
+        """Look up a path in the client's all-pairs table (built once, then cached)."""
+        path = self.neo4j.get_all_shortest_paths().get((from_position, to_position))
+        if path is None:
+            logger.warning("No path found", from_position=from_position, to_position=to_position)
+        return path
+    
+    def _navigate(self, steps: StepBuffer, from_position: str, to_position: str) -> str:
+        """
+        Add the move steps from from_position to to_position.
+        
+        Nothing is added when already there or when no path exists.
+        
+        Returns:
+            Simulated position afterwards
+        """
+        if from_position == to_position:
+            return from_position
+        path = self._shortest_path(from_position, to_position)
+        if not path:
+            return from_position
+        steps.extend_moves(path[1:])
+        return path[-1]
+    
     def build_sequence(self, intent: Dict[str, Any], correlation_id: str) -> List[Dict[str, Any]]:
         """
         Convert high-level intent into concrete step sequence.
@@ -71,11 +200,12 @@ class SequenceBuilder:
         Algorithm:
             1. Convert intent into list of high-level steps
             2. Initialize simulated robot state (position, tool)
-            3. For each high-level step:
+            3. Validate routine steps and resolve the tool each one requires
+            4. For each high-level step:
                a. Insert tool changes if needed (release old, attach new)
                b. Insert navigation path to target position
                c. Add the actual work step (routine/tool operation)
-            4. Return sequence with sequential IDs starting from 1
+            5. Return sequence with sequential IDs starting from 1
         """
         goal = intent.get("goal")
         
@@ -107,264 +237,170 @@ class SequenceBuilder:
         simulated_position = robot_state["current_position"]
         simulated_tool = robot_state["current_tool"]
         
-        all_steps = []
-        step_id = 1
+        cache_key = ((self.neo4j.uri, self.neo4j.database),
+                     json.dumps(intent, sort_keys=True, default=str),
+                     simulated_position, simulated_tool)
+        with _sequence_cache_lock:
+            cached = _sequence_cache.get(cache_key)
+            if cached is not None:
+                _sequence_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.info("Step sequence served from cache",
+                       correlation_id=correlation_id,
+                       concrete_steps=len(cached))
+            return copy.deepcopy(cached)
+        
+        # Tool -> stand position, fetched once for every tool change below
+        tool_locations = self.neo4j.get_tool_locations()
+        
+        # Routine metadata for every lookup the expansion can make (tool
+        # attach/release at each stand, plus each routine step), routine info
+        # and supported positions, and the path table are independent: fetch
+        # them concurrently so a cold cache waits for the slowest query only
+        metadata_pairs = [(routine, loc) for loc in set(tool_locations.values())
+                          for routine in ("tool_release", "tool_attach")]
+        metadata_pairs += [(step["routine"], step["position"]) for step in steps
+                           if step.get("action") in ("routine", "execute_routine")
+                           and "routine" in step and "position" in step]
+        routine_names = [step["routine"] for step in steps
+                         if step.get("action") in ("routine", "execute_routine") and "routine" in step]
+        metadata_future = _prefetch_pool.submit(_graph_fetch, "get_routine_metadata_batch", metadata_pairs)
+        routines_future = _prefetch_pool.submit(_graph_fetch, "get_routines_bulk", routine_names)
+        # Path table (adjacency load) is needed by every navigation step
+        paths_future = _prefetch_pool.submit(_graph_fetch, "get_all_shortest_paths")
+        routine_metadata = metadata_future.result()
+        routines = routines_future.result()
+        paths_future.result()
+        
+        # Validate every routine step and resolve the tool it needs before
+        # expanding, so the expansion loop below only tracks the simulated tool.
+        # Index -> required tool (None = no tool); unknown routines are absent.
+        routine_tools: Dict[int, Optional[str]] = {}
+        for i, high_level_step in enumerate(steps):
+            # LLM may use "routine" or "execute_routine"
+            if high_level_step.get("action") not in ("routine", "execute_routine"):
+                continue
+            routine_name = high_level_step["routine"]
+            target_position = high_level_step["position"]
+            
+            # Routine info and supported positions (prefetched above)
+            planning_context = routines[routine_name]
+            routine_info = planning_context["info"]
+            if not routine_info:
+                logger.warning("Unknown routine in sequence",
+                              correlation_id=correlation_id,
+                              routine=routine_name)
+                continue
+            
+            # Validate routine is supported at this position
+            supported_positions = planning_context["supported_positions"]
+            if target_position not in planning_context["supported_set"]:
+                logger.error("Routine not supported at position - rejecting step",
+                           correlation_id=correlation_id,
+                           routine=routine_name,
+                           requested_position=target_position,
+                           supported_positions=supported_positions)
+                raise ValueError(
+                    f"Routine '{routine_name}' is not supported at position '{target_position}'. "
+                    f"Valid positions: {supported_positions}"
+                )
+            
+            required_tool = routine_info.get("required_tool")
+            routine_tools[i] = required_tool if required_tool and required_tool != "none" else None
+        
+        all_steps = StepBuffer()
         
         # Process each high-level step and expand into atomic steps
-        for high_level_step in steps:
+        for i, high_level_step in enumerate(steps):
             action = high_level_step.get("action")
             
-            # Handle routine execution (LLM may use "routine" or "execute_routine")
-            if action in ["routine", "execute_routine"]:
-                # Execute routine at position
+            # Handle routine execution (validated above)
+            if action in ("routine", "execute_routine"):
+                if i not in routine_tools:
+                    continue
                 routine_name = high_level_step["routine"]
                 target_position = high_level_step["position"]
+                required_tool = routine_tools[i]
                 
-                # Fetch routine information from knowledge graph
-                routine_info = self.neo4j.get_routine_by_name(routine_name)
-                if not routine_info:
-                    logger.warning("Unknown routine in sequence",
-                                  correlation_id=correlation_id,
-                                  routine=routine_name)
-                    continue
-                
-                # Validate routine is supported at this position
-                supported_positions = self.neo4j.get_supported_positions(routine_name)
-                if target_position not in supported_positions:
-                    logger.error("Routine not supported at position - rejecting step",
-                               correlation_id=correlation_id,
-                               routine=routine_name,
-                               requested_position=target_position,
-                               supported_positions=supported_positions)
-                    raise ValueError(
-                        f"Routine '{routine_name}' is not supported at position '{target_position}'. "
-                        f"Valid positions: {supported_positions}"
-                    )
-                
-                required_tool = routine_info.get("required_tool")
-                
-                # Step 1: Tool change if needed
-                if required_tool and required_tool != "none" and simulated_tool != required_tool:
+                # Step 1: Tool change if needed (consecutive routines on the same tool skip this)
+                if required_tool and simulated_tool != required_tool:
                     # Need to change tools
                     if simulated_tool != "none":
                         # First, release current tool at its storage location
-                        tool_loc = self.neo4j.get_tool_locations().get(simulated_tool)
+                        tool_loc = tool_locations.get(simulated_tool)
                         if tool_loc:
                             # Navigate to tool storage location if not already there
-                            if simulated_position != tool_loc:
-                                path = self.neo4j.get_shortest_path(simulated_position, tool_loc)
-                                if path:
-                                    for pos in path[1:]:
-                                        all_steps.append({
-                                            "id": step_id,
-                                            "name": f"Move to {pos}",
-                                            "action": "move",
-                                            "target": pos
-                                        })
-                                        step_id += 1
-                                        simulated_position = pos
+                            simulated_position = self._navigate(all_steps, simulated_position, tool_loc)
                             
                             # Add tool release step with metadata from knowledge graph
-                            release_step = {
-                                "id": step_id,
-                                "name": f"Release {simulated_tool}",
-                                "action": "routine",
-                                "target": "tool_release",
-                                "position": tool_loc,
-                                "tool": simulated_tool
-                            }
-                            metadata = self.neo4j.get_routine_metadata("tool_release", tool_loc)
-                            if metadata:
-                                if "stabilize" in metadata and metadata["stabilize"]:
-                                    release_step["stabilize"] = metadata["stabilize"]
-                                if "action_after" in metadata and metadata["action_after"]:
-                                    release_step["action_after"] = metadata["action_after"]
-                                if "verify" in metadata and metadata["verify"]:
-                                    release_step["verify"] = metadata["verify"]
-                            
-                            all_steps.append(release_step)
-                            step_id += 1
+                            all_steps.append(f"Release {simulated_tool}", "routine", "tool_release", position=tool_loc, tool=simulated_tool,
+                                             metadata=routine_metadata.get(("tool_release", tool_loc)))
                             simulated_tool = "none"
                     
                     # Second, attach required tool from its storage location
-                    tool_loc = self.neo4j.get_tool_locations().get(required_tool)
+                    tool_loc = tool_locations.get(required_tool)
                     if tool_loc:
-                        if simulated_position != tool_loc:
-                            path = self.neo4j.get_shortest_path(simulated_position, tool_loc)
-                            if path:
-                                for pos in path[1:]:
-                                    all_steps.append({
-                                        "id": step_id,
-                                        "name": f"Move to {pos}",
-                                        "action": "move",
-                                        "target": pos
-                                    })
-                                    step_id += 1
-                                    simulated_position = pos
+                        simulated_position = self._navigate(all_steps, simulated_position, tool_loc)
                         
                         # Add tool attach step with metadata from knowledge graph
-                        attach_step = {
-                            "id": step_id,
-                            "name": f"Attach {required_tool}",
-                            "action": "routine",
-                            "target": "tool_attach",
-                            "position": tool_loc,
-                            "tool": required_tool 
-                        }
-                        metadata = self.neo4j.get_routine_metadata("tool_attach", tool_loc)
-                        if metadata:
-                            if "stabilize" in metadata and metadata["stabilize"]:
-                                attach_step["stabilize"] = metadata["stabilize"]
-                            if "action_after" in metadata and metadata["action_after"]:
-                                attach_step["action_after"] = metadata["action_after"]
-                            if "verify" in metadata and metadata["verify"]:
-                                attach_step["verify"] = metadata["verify"]
-                        
-                        all_steps.append(attach_step)
-                        step_id += 1
+                        all_steps.append(f"Attach {required_tool}", "routine", "tool_attach", position=tool_loc, tool=required_tool,
+                                         metadata=routine_metadata.get(("tool_attach", tool_loc)))
                         simulated_tool = required_tool
                 
                 # Step 2: Navigate to target position for routine execution
-                if simulated_position != target_position:
-                    path = self.neo4j.get_shortest_path(simulated_position, target_position)
-                    if path:
-                        for pos in path[1:]:
-                            all_steps.append({
-                                "id": step_id,
-                                "name": f"Move to {pos}",
-                                "action": "move",
-                                "target": pos
-                            })
-                            step_id += 1
-                            simulated_position = pos
+                simulated_position = self._navigate(all_steps, simulated_position, target_position)
                 
                 # Step 3: Execute the routine at target position
                 # Fetch routine-specific metadata (stabilize time, verification, etc.)
-                metadata = self.neo4j.get_routine_metadata(routine_name, target_position)
-                routine_step = {
-                    "id": step_id,
-                    "name": f"{routine_name.replace('_', ' ').title()} at {target_position}",
-                    "action": "routine",
-                    "target": routine_name,
-                    "position": target_position
-                }
-                
-                # Include metadata fields if they exist in knowledge graph
-                if metadata:
-                    if "stabilize" in metadata and metadata["stabilize"]:
-                        routine_step["stabilize"] = metadata["stabilize"]
-                    if "action_after" in metadata and metadata["action_after"]:
-                        routine_step["action_after"] = metadata["action_after"]
-                    if "verify" in metadata and metadata["verify"]:
-                        routine_step["verify"] = metadata["verify"]
-                
-                all_steps.append(routine_step)
-                step_id += 1
+                all_steps.append(f"{_routine_display_name(routine_name)} at {target_position}",
+                                 "routine", routine_name, position=target_position,
+                                 metadata=routine_metadata.get((routine_name, target_position)))
             
             elif action == "move":
                 # Simple movement
                 target_position = high_level_step["position"]
-                if simulated_position != target_position:
-                    path = self.neo4j.get_shortest_path(simulated_position, target_position)
-                    if path:
-                        for pos in path[1:]:
-                            all_steps.append({
-                                "id": step_id,
-                                "name": f"Move to {pos}",
-                                "action": "move",
-                                "target": pos
-                            })
-                            step_id += 1
-                            simulated_position = pos
+                simulated_position = self._navigate(all_steps, simulated_position, target_position)
             
             elif action == "attach_tool":
                 # Attach specific tool
                 tool_name = high_level_step["tool"]
-                tool_loc = self.neo4j.get_tool_locations().get(tool_name)
+                tool_loc = tool_locations.get(tool_name)
                 if tool_loc:
-                    if simulated_position != tool_loc:
-                        path = self.neo4j.get_shortest_path(simulated_position, tool_loc)
-                        if path:
-                            for pos in path[1:]:
-                                all_steps.append({
-                                    "id": step_id,
-                                    "name": f"Move to {pos}",
-                                    "action": "move",
-                                    "target": pos
-                                })
-                                step_id += 1
-                                simulated_position = pos
+                    simulated_position = self._navigate(all_steps, simulated_position, tool_loc)
                     
                     # Fetch metadata for tool_attach
-                    attach_step = {
-                        "id": step_id,
-                        "name": f"Attach {tool_name}",
-                        "action": "routine",
-                        "target": "tool_attach",
-                        "position": tool_loc,
-                        "tool": tool_name
-                    }
-                    metadata = self.neo4j.get_routine_metadata("tool_attach", tool_loc)
-                    if metadata:
-                        if "stabilize" in metadata and metadata["stabilize"]:
-                            attach_step["stabilize"] = metadata["stabilize"]
-                        if "action_after" in metadata and metadata["action_after"]:
-                            attach_step["action_after"] = metadata["action_after"]
-                        if "verify" in metadata and metadata["verify"]:
-                            attach_step["verify"] = metadata["verify"]
-                    
-                    all_steps.append(attach_step)
-                    step_id += 1
+                    all_steps.append(f"Attach {tool_name}", "routine", "tool_attach", position=tool_loc, tool=tool_name,
+                                     metadata=routine_metadata.get(("tool_attach", tool_loc)))
                     simulated_tool = tool_name
             
             elif action == "release_tool":
                 # Release current tool
                 if simulated_tool != "none":
-                    tool_loc = self.neo4j.get_tool_locations().get(simulated_tool)
+                    tool_loc = tool_locations.get(simulated_tool)
                     if tool_loc:
-                        if simulated_position != tool_loc:
-                            path = self.neo4j.get_shortest_path(simulated_position, tool_loc)
-                            if path:
-                                for pos in path[1:]:
-                                    all_steps.append({
-                                        "id": step_id,
-                                        "name": f"Move to {pos}",
-                                        "action": "move",
-                                        "target": pos
-                                    })
-                                    step_id += 1
-                                    simulated_position = pos
+                        simulated_position = self._navigate(all_steps, simulated_position, tool_loc)
                         
                         # Fetch metadata for tool_release
-                        release_step = {
-                            "id": step_id,
-                            "name": f"Release {simulated_tool}",
-                            "action": "routine",
-                            "target": "tool_release",
-                            "position": tool_loc,
-                            "tool": simulated_tool
-                        }
-                        metadata = self.neo4j.get_routine_metadata("tool_release", tool_loc)
-                        if metadata:
-                            if "stabilize" in metadata and metadata["stabilize"]:
-                                release_step["stabilize"] = metadata["stabilize"]
-                            if "action_after" in metadata and metadata["action_after"]:
-                                release_step["action_after"] = metadata["action_after"]
-                            if "verify" in metadata and metadata["verify"]:
-                                release_step["verify"] = metadata["verify"]
-                        
-                        all_steps.append(release_step)
-                        step_id += 1
+                        all_steps.append(f"Release {simulated_tool}", "routine", "tool_release", position=tool_loc, tool=simulated_tool,
+                                         metadata=routine_metadata.get(("tool_release", tool_loc)))
                         simulated_tool = "none"
         
+        plan = all_steps.to_dicts()
+        
         logger.info("Step sequence built",
                    correlation_id=correlation_id,
                    high_level_steps=len(steps),
-                   concrete_steps=len(all_steps))
+                   concrete_steps=len(plan))
         
-        # Log the complete sequence for visibility
-        logger.info("Complete step sequence",
-                   correlation_id=correlation_id,
-                   steps=all_steps)
+        # Full step dump only at DEBUG (sequence_planning logs the plan once at INFO)
+        if logger.is_enabled_for("DEBUG"):
+            logger.debug("Complete step sequence",
+                        correlation_id=correlation_id,
+                        steps=plan)
+        
+        with _sequence_cache_lock:
+            _sequence_cache[cache_key] = copy.deepcopy(plan)
+            if len(_sequence_cache) > SEQUENCE_CACHE_MAX_ENTRIES:
+                _sequence_cache.popitem(last=False)
         
-        return all_steps
+        return plan
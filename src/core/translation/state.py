@@ -4,8 +4,13 @@ Shared state structure for Translation Layer workflow.
 See docs/translation/README.md for data flow.
 """
 
+import os
 from typing import TypedDict, Optional, List, Dict, Any
 
+# Planning attempts before a request goes to fallback (read once at import;
+# shared by the sequence_planning, verify and fallback nodes)
+MAX_PLAN_ATTEMPTS = int(os.getenv("MAX_PLAN_ATTEMPTS", "3"))
+
 
 class WorkflowState(TypedDict, total=False):
     """
@@ -16,7 +21,7 @@ class WorkflowState(TypedDict, total=False):
     - operator_input: Original natural language command
     - intent: Classification (action | question | unknown)
     - plan: Task sequence from SequenceBuilder
-    - plan_attempt: Retry counter (max 3)
+    - plan_attempt: Retry counter (max MAX_PLAN_ATTEMPTS)
     - validation_errors: Planning or verification feedback
     - human_decision: approved | revision | declined | timeout
     - human_comments: Operator feedback for revision
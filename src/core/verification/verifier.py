@@ -5,7 +5,10 @@ External module called BY LangGraph nodes (not a node itself).
 See docs/verification/README.md for validation logic.
 """
 
-from typing import Dict, List, Any
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Dict, FrozenSet, List, Any, Optional, Tuple
+from src.core.knowledge.graph_cache import GraphCacheSnapshot, get_graph_snapshot
 from src.core.knowledge.neo4j_client import Neo4jClient
 from src.core.knowledge.sqlite_client import RobotStateDB
 from src.core.observability.logging import get_logger
@@ -13,6 +16,109 @@ from src.core.observability.logging import get_logger
 logger = get_logger("verify")
 
 
+class _PosKind(IntEnum):
+    """Position classes the move checks branch on (classified once per snapshot)."""
+    OTHER = 0  # home, safe_approach, ...
+    WORK = 1  # role "work"
+    STAND = 2  # tool stand (has a tool in tool_locations)
+
+
+@dataclass(frozen=True, slots=True)
+class _GraphSnapshot:
+    """Lookup dicts derived from the cached graph queries (shared - do not mutate)."""
+    sources: Tuple[Any, ...]  # Query results the dicts were built from
+    all_positions: Dict[str, str]  # position name -> role
+    all_routines: Dict[str, str]  # routine name -> required tool
+    position_to_tool: Dict[str, str]  # tool stand position -> tool name
+    tool_to_routines: Dict[str, List[str]]  # tool name -> routines requiring it
+    pos_kind: Dict[str, _PosKind]  # position name -> kind (every position)
+    allowed_edges: FrozenSet[Tuple[str, str]]  # (from, to), both directions
+    supported_at: FrozenSet[Tuple[str, str]]  # (routine, position)
+    tool_support: FrozenSet[Tuple[str, str]]  # (tool, position) with a supported routine
+
+
+# Replaced as a whole (never mutated), so concurrent rebuilds are harmless
+_snapshot: Optional[_GraphSnapshot] = None
+
+
+def _build_snapshot(sources: Tuple[Any, ...], all_positions: Dict[str, str],
+                    all_routines: Dict[str, str], tool_locations: Dict[str, str],
+                    allowed_edges: FrozenSet[Tuple[str, str]],
+                    supported_at: FrozenSet[Tuple[str, str]]) -> _GraphSnapshot:
+    """Derive the reverse lookups and store the snapshot for reuse."""
+    global _snapshot
+    # Reverse mapping: position_name → tool_name
+    position_to_tool = {pos: tool for tool, pos in tool_locations.items()}
+    tool_to_routines: Dict[str, List[str]] = {}
+    for name, tool in all_routines.items():
+        tool_to_routines.setdefault(tool, []).append(name)
+    snapshot = _GraphSnapshot(
+        sources=sources,
+        all_positions=all_positions,
+        all_routines=all_routines,
+        position_to_tool=position_to_tool,
+        tool_to_routines=tool_to_routines,
+        pos_kind={
+            name: _PosKind.STAND if name in position_to_tool
+            else _PosKind.WORK if role == "work"
+            else _PosKind.OTHER
+            for name, role in all_positions.items()
+        },
+        allowed_edges=allowed_edges,
+        supported_at=supported_at,
+        tool_support=frozenset(
+            (all_routines[name], position) for name, position in supported_at if name in all_routines
+        ),
+    )
+    _snapshot = snapshot
+    return snapshot
+
+
+def _graph_snapshot(neo4j: Neo4jClient) -> _GraphSnapshot:
+    """
+    Return the validation lookup dicts, rebuilt only when the graph data changed.
+    
+    The client returns the same cached result objects until
+    Neo4jClient.invalidate() drops them, so their identity is the version.
+    """
+    sources = (
+        neo4j.get_all_positions(),
+        neo4j.get_all_routines(),
+        neo4j.get_tool_locations(),
+        neo4j.get_allowed_edges(),
+        neo4j.get_supported_at(),
+    )
+    snapshot = _snapshot
+    if snapshot is not None and all(a is b for a, b in zip(snapshot.sources, sources)):
+        return snapshot
+    
+    positions, routines, tool_locations, allowed_edges, supported_at = sources
+    return _build_snapshot(
+        sources,
+        all_positions={p["name"]: p["role"] for p in positions},
+        all_routines={r["name"]: r["required_tool"] for r in routines},
+        tool_locations=tool_locations,
+        allowed_edges=allowed_edges,
+        supported_at=supported_at,
+    )
+
+
+def _local_graph_snapshot(local: GraphCacheSnapshot) -> _GraphSnapshot:
+    """Return the validation lookups for the local graph cache, rebuilt when it is reloaded."""
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.sources[0] is local:
+        return snapshot
+    return _build_snapshot(
+        (local,),
+        all_positions=local.positions,
+        all_routines=local.routines,
+        tool_locations=local.tool_locations,
+        allowed_edges=local.allowed_edges,
+        supported_at=local.supported_at,
+    )
+
+
+@dataclass(slots=True)
 class VerificationResult:
     """
     Structured validation result for planner feedback.
@@ -26,24 +132,170 @@ class VerificationResult:
         feedback: Human-readable explanation for planner repair
     """
     
-    def __init__(self):
-        self.valid: bool = True
-        self.missing_positions: List[str] = []
-        self.illegal_edges: List[tuple] = []
-        self.unsupported_routines: List[tuple] = []
-        self.tool_conflicts: List[str] = []
-        self.feedback: List[str] = []
+    valid: bool = True
+    missing_positions: List[str] = field(default_factory=list)
+    illegal_edges: List[tuple] = field(default_factory=list)
+    unsupported_routines: List[tuple] = field(default_factory=list)
+    tool_conflicts: List[str] = field(default_factory=list)
+    feedback: List[str] = field(default_factory=list)
+    _dict: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for logging and LangGraph state."""
-        return {
-            "valid": self.valid,
-            "missing_positions": self.missing_positions,
-            "illegal_edges": [{"from": a, "to": b} for a, b in self.illegal_edges],
-            "unsupported_routines": [{"routine": r, "position": p} for r, p in self.unsupported_routines],
-            "tool_conflicts": self.tool_conflicts,
-            "feedback": "\n".join(self.feedback),
-        }
+        """
+        Convert to dictionary for logging and LangGraph state.
+        
+        Built on first call and reused, so call it once verification is
+        complete (verify_plan's log and verify_node share one conversion).
+        """
+        if self._dict is None:
+            self._dict = {
+                "valid": self.valid,
+                "missing_positions": self.missing_positions,
+                "illegal_edges": [{"from": a, "to": b} for a, b in self.illegal_edges],
+                "unsupported_routines": [{"routine": r, "position": p} for r, p in self.unsupported_routines],
+                "tool_conflicts": self.tool_conflicts,
+                "feedback": "\n".join(self.feedback),
+            }
+        return self._dict
+
+
+@dataclass(frozen=True, slots=True)
+class _StepContext:
+    """Read-only inputs shared by the step handlers for one verify_plan call."""
+    correlation_id: str
+    graph: _GraphSnapshot
+
+
+def _verify_move(ctx: _StepContext, step: Dict[str, Any], i: int,
+                 simulated_position: str, simulated_tool: str,
+                 result: VerificationResult) -> Tuple[str, str]:
+    """
+    Check a move step and return the simulated (position, tool) after it.
+    
+    The position only advances when the move is legal.
+    """
+    correlation_id = ctx.correlation_id
+    graph = ctx.graph
+    target = step.get("target")
+    
+    # Check 1: Target position exists
+    kind = graph.pos_kind.get(target)
+    if kind is None:
+        result.valid = False
+        result.missing_positions.append(target)
+        result.feedback.append(f"Step {i}: Position '{target}' does not exist in graph")
+        logger.warning("Invalid position", correlation_id=correlation_id, step=i, position=target)
+        return simulated_position, simulated_tool
+    
+    # Check 2: Tool stand collision prevention
+    # Cannot move to a tool position while holding a DIFFERENT tool
+    if kind is _PosKind.STAND:
+        tool_at_target = graph.position_to_tool[target]
+        if simulated_tool != "none" and simulated_tool != tool_at_target:
+            result.valid = False
+            result.tool_conflicts.append(f"Step {i}: Cannot move to '{target}' (tool stand for '{tool_at_target}') while holding '{simulated_tool}'")
+            result.feedback.append(f"Step {i}: Collision risk - must release '{simulated_tool}' before approaching '{tool_at_target}' tool stand")
+            logger.warning("Tool stand collision risk", correlation_id=correlation_id, step=i, target=target, holding=simulated_tool, stand_tool=tool_at_target)
+            return simulated_position, simulated_tool
+    
+    # Check 3: Work position compatibility with current tool
+    # If moving to a work position with a tool, ensure at least one routine using that tool is supported there
+    if kind is _PosKind.WORK and simulated_tool != "none":
+        # Check if ANY routine requiring this tool is supported at target position
+        if (simulated_tool, target) not in graph.tool_support:
+            routines_for_tool = graph.tool_to_routines.get(simulated_tool, [])
+            result.valid = False
+            result.tool_conflicts.append(f"Step {i}: Cannot move to '{target}' with tool '{simulated_tool}' - no supported routines for this tool at this position")
+            result.feedback.append(f"Step {i}: Position '{target}' does not support any routines using '{simulated_tool}' (no :SUPPORTED_AT edges)")
+            logger.warning("Incompatible tool at work position", correlation_id=correlation_id, step=i, position=target, tool=simulated_tool, checked_routines=routines_for_tool)
+            return simulated_position, simulated_tool
+    
+    # Check 4: Edge whitelist
+    if (simulated_position, target) not in graph.allowed_edges:
+        result.valid = False
+        result.illegal_edges.append((simulated_position, target))
+        result.feedback.append(f"Step {i}: No :ONLY_ALLOWED_MOVE_TO edge from '{simulated_position}' to '{target}'")
+        logger.warning("Illegal edge", correlation_id=correlation_id, step=i, from_pos=simulated_position, to_pos=target)
+        return simulated_position, simulated_tool
+    
+    return target, simulated_tool
+
+
+def _verify_routine(ctx: _StepContext, step: Dict[str, Any], i: int,
+                    simulated_position: str, simulated_tool: str,
+                    result: VerificationResult) -> Tuple[str, str]:
+    """
+    Check a routine step and return the simulated (position, tool) after it.
+    
+    tool_attach/tool_release change the simulated tool when they are legal.
+    """
+    correlation_id = ctx.correlation_id
+    graph = ctx.graph
+    target = step.get("target")
+    position = step.get("position")
+    
+    # Check 1: Routine exists
+    if target not in graph.all_routines:
+        result.valid = False
+        result.feedback.append(f"Step {i}: Routine '{target}' does not exist in graph")
+        logger.warning("Invalid routine", correlation_id=correlation_id, step=i, routine=target)
+        return simulated_position, simulated_tool
+    
+    # Check 2: Position exists (for work routines)
+    if position and position not in graph.all_positions:
+        result.valid = False
+        result.missing_positions.append(position)
+        result.feedback.append(f"Step {i}: Position '{position}' for routine does not exist")
+        logger.warning("Invalid routine position", correlation_id=correlation_id, step=i, position=position)
+        return simulated_position, simulated_tool
+    
+    # Check 3: :SUPPORTED_AT relationship (if position specified)
+    if position:
+        if (target, position) not in graph.supported_at:
+            result.valid = False
+            result.unsupported_routines.append((target, position))
+            result.feedback.append(f"Step {i}: Routine '{target}' not supported at '{position}' (no :SUPPORTED_AT edge)")
+            logger.warning("Unsupported routine", correlation_id=correlation_id, step=i, routine=target, position=position)
+    
+    # Check 4: Tool requirements
+    required_tool = graph.all_routines[target]
+    if required_tool != "none" and simulated_tool != required_tool:
+        result.valid = False
+        result.tool_conflicts.append(f"Step {i}: Routine '{target}' requires tool '{required_tool}', but robot has '{simulated_tool}'")
+        result.feedback.append(f"Step {i}: Tool mismatch - need '{required_tool}', have '{simulated_tool}'")
+        logger.warning("Tool conflict", correlation_id=correlation_id, step=i, required=required_tool, current=simulated_tool)
+    
+    # Update simulated tool state (for tool_attach/tool_release)
+    if target == "tool_attach":
+        # Safety check: Cannot attach tool if already holding one
+        if simulated_tool != "none":
+            result.valid = False
+            result.tool_conflicts.append(f"Step {i}: Cannot attach tool - robot already holding '{simulated_tool}'")
+            result.feedback.append(f"Step {i}: Must release '{simulated_tool}' before attaching another tool")
+            logger.warning("Tool attach conflict", correlation_id=correlation_id, step=i, current_tool=simulated_tool)
+        else:
+            # Tool stored at this position (reverse mapping built by _graph_snapshot)
+            attached = graph.position_to_tool.get(position)
+            if attached:
+                simulated_tool = attached
+    elif target == "tool_release":
+        # Safety check: Cannot release if not holding anything
+        if simulated_tool == "none":
+            result.valid = False
+            result.tool_conflicts.append(f"Step {i}: Cannot release tool - robot not holding any tool")
+            result.feedback.append(f"Step {i}: No tool to release")
+            logger.warning("Tool release conflict", correlation_id=correlation_id, step=i)
+        else:
+            simulated_tool = "none"
+    
+    return simulated_position, simulated_tool
+
+
+# Step action -> check; steps with any other action are not checked
+_STEP_HANDLERS: Dict[str, Callable[..., Tuple[str, str]]] = {
+    "move": _verify_move,
+    "routine": _verify_routine,
+}
 
 
 def verify_plan(plan: List[Dict[str, Any]], correlation_id: str) -> VerificationResult:
@@ -77,151 +329,38 @@ def verify_plan(plan: List[Dict[str, Any]], correlation_id: str) -> Verification
     
     logger.info("Starting plan verification", correlation_id=correlation_id, step_count=len(plan))
     
-    # Connect to knowledge sources
-    neo4j = Neo4jClient()
-    neo4j.connect()
-    
-    state_db = RobotStateDB()
-    robot_state = state_db.get_state()
+    robot_state = RobotStateDB.get_default().get_state()
     current_position = robot_state["current_position"]
     current_tool = robot_state["current_tool"]
     
-    try:
-        # Get graph data for validation
-        all_positions = {p["name"]: p["role"] for p in neo4j.get_all_positions()}
-        all_routines = {r["name"]: r["required_tool"] for r in neo4j.get_all_routines()}
-        
-        # Get tool locations to prevent wrong-tool-at-toolstand collisions
-        tool_locations = neo4j.get_tool_locations()
-        # Build reverse mapping: position_name → tool_name
-        position_to_tool = {pos: tool for tool, pos in tool_locations.items()}
-        
-        # Track simulated state during plan execution
-        simulated_position = current_position
-        simulated_tool = current_tool
-        
-        # Validate each step
-        for i, step in enumerate(plan, start=1):
-            action = step.get("action")
-            target = step.get("target")
-            position = step.get("position")  # For routines
-            
-            if action == "move":
-                # Check 1: Target position exists
-                if target not in all_positions:
-                    result.valid = False
-                    result.missing_positions.append(target)
-                    result.feedback.append(f"Step {i}: Position '{target}' does not exist in graph")
-                    logger.warning("Invalid position", correlation_id=correlation_id, step=i, position=target)
-                    continue
-                
-                # Check 2: Tool stand collision prevention
-                # Cannot move to a tool position while holding a DIFFERENT tool
-                if target in position_to_tool:
-                    tool_at_target = position_to_tool[target]
-                    if simulated_tool != "none" and simulated_tool != tool_at_target:
-                        result.valid = False
-                        result.tool_conflicts.append(f"Step {i}: Cannot move to '{target}' (tool stand for '{tool_at_target}') while holding '{simulated_tool}'")
-                        result.feedback.append(f"Step {i}: Collision risk - must release '{simulated_tool}' before approaching '{tool_at_target}' tool stand")
-                        logger.warning("Tool stand collision risk", correlation_id=correlation_id, step=i, target=target, holding=simulated_tool, stand_tool=tool_at_target)
-                        continue
-                
-                # Check 3: Work position compatibility with current tool
-                # If moving to a work position with a tool, ensure at least one routine using that tool is supported there
-                if all_positions[target] == "work" and simulated_tool != "none":
-                    # Find routines that require this tool
-                    routines_for_tool = [r_name for r_name, req_tool in all_routines.items() if req_tool == simulated_tool]
-                    
-                    # Check if ANY of these routines are supported at target position
-                    has_supported_routine = False
-                    for routine_name in routines_for_tool:
-                        if neo4j.get_routine_metadata(routine_name, target):
-                            has_supported_routine = True
-                            break
-                    
-                    if not has_supported_routine:
-                        result.valid = False
-                        result.tool_conflicts.append(f"Step {i}: Cannot move to '{target}' with tool '{simulated_tool}' - no supported routines for this tool at this position")
-                        result.feedback.append(f"Step {i}: Position '{target}' does not support any routines using '{simulated_tool}' (no :SUPPORTED_AT edges)")
-                        logger.warning("Incompatible tool at work position", correlation_id=correlation_id, step=i, position=target, tool=simulated_tool, checked_routines=routines_for_tool)
-                        continue
-                
-                # Check 4: Edge whitelist
-                if not neo4j.is_move_allowed(simulated_position, target):
-                    result.valid = False
-                    result.illegal_edges.append((simulated_position, target))
-                    result.feedback.append(f"Step {i}: No :ONLY_ALLOWED_MOVE_TO edge from '{simulated_position}' to '{target}'")
-                    logger.warning("Illegal edge", correlation_id=correlation_id, step=i, from_pos=simulated_position, to_pos=target)
-                else:
-                    # Update simulated position
-                    simulated_position = target
-            
-            elif action == "routine":
-                # Check 1: Routine exists
-                if target not in all_routines:
-                    result.valid = False
-                    result.feedback.append(f"Step {i}: Routine '{target}' does not exist in graph")
-                    logger.warning("Invalid routine", correlation_id=correlation_id, step=i, routine=target)
-                    continue
-                
-                # Check 2: Position exists (for work routines)
-                if position and position not in all_positions:
-                    result.valid = False
-                    result.missing_positions.append(position)
-                    result.feedback.append(f"Step {i}: Position '{position}' for routine does not exist")
-                    logger.warning("Invalid routine position", correlation_id=correlation_id, step=i, position=position)
-                    continue
-                
-                # Check 3: :SUPPORTED_AT relationship (if position specified)
-                if position:
-                    metadata = neo4j.get_routine_metadata(target, position)
-                    if not metadata:
-                        result.valid = False
-                        result.unsupported_routines.append((target, position))
-                        result.feedback.append(f"Step {i}: Routine '{target}' not supported at '{position}' (no :SUPPORTED_AT edge)")
-                        logger.warning("Unsupported routine", correlation_id=correlation_id, step=i, routine=target, position=position)
-                
-                # Check 4: Tool requirements
-                required_tool = all_routines[target]
-                if required_tool != "none" and simulated_tool != required_tool:
-                    result.valid = False
-                    result.tool_conflicts.append(f"Step {i}: Routine '{target}' requires tool '{required_tool}', but robot has '{simulated_tool}'")
-                    result.feedback.append(f"Step {i}: Tool mismatch - need '{required_tool}', have '{simulated_tool}'")
-                    logger.warning("Tool conflict", correlation_id=correlation_id, step=i, required=required_tool, current=simulated_tool)
-                
-                # Update simulated tool state (for tool_attach/tool_release)
-                if target == "tool_attach":
-                    # Safety check: Cannot attach tool if already holding one
-                    if simulated_tool != "none":
-                        result.valid = False
-                        result.tool_conflicts.append(f"Step {i}: Cannot attach tool - robot already holding '{simulated_tool}'")
-                        result.feedback.append(f"Step {i}: Must release '{simulated_tool}' before attaching another tool")
-                        logger.warning("Tool attach conflict", correlation_id=correlation_id, step=i, current_tool=simulated_tool)
-                    else:
-                        # Query Neo4j to find which tool is at this position
-                        tool_locations = neo4j.get_tool_locations()
-                        # Reverse lookup: position → tool name
-                        for tool_name, tool_position in tool_locations.items():
-                            if tool_position == position:
-                                simulated_tool = tool_name
-                                break
-                elif target == "tool_release":
-                    # Safety check: Cannot release if not holding anything
-                    if simulated_tool == "none":
-                        result.valid = False
-                        result.tool_conflicts.append(f"Step {i}: Cannot release tool - robot not holding any tool")
-                        result.feedback.append(f"Step {i}: No tool to release")
-                        logger.warning("Tool release conflict", correlation_id=correlation_id, step=i)
-                    else:
-                        simulated_tool = "none"
-        
-        # Log final result
-        if result.valid:
-            logger.info("Plan verification passed", correlation_id=correlation_id)
-        else:
-            logger.warning("Plan verification failed", correlation_id=correlation_id, issues=result.to_dict())
+    local = get_graph_snapshot()
+    if local is not None:
+        # Local graph cache is current for $GRAPH_VERSION: no Neo4j reads
+        graph = _local_graph_snapshot(local)
+    else:
+        # Shared knowledge client (kept open across requests); the reads
+        # share one transaction and are cached after the first plan
+        neo4j = Neo4jClient.get_default()
+        with neo4j.read_tx():
+            graph = _graph_snapshot(neo4j)
+    
+    ctx = _StepContext(correlation_id, graph)
+    
+    # Track simulated state during plan execution
+    simulated_position = current_position
+    simulated_tool = current_tool
+    
+    # Validate each step
+    for i, step in enumerate(plan, start=1):
+        handler = _STEP_HANDLERS.get(step.get("action"))
+        if handler is None:
+            continue
+        simulated_position, simulated_tool = handler(ctx, step, i, simulated_position, simulated_tool, result)
     
-    finally:
-        neo4j.close()
+    # Log final result
+    if result.valid:
+        logger.info("Plan verification passed", correlation_id=correlation_id)
+    else:
+        logger.warning("Plan verification failed", correlation_id=correlation_id, issues=result.to_dict())
     
     return result
@@ -9,10 +9,32 @@ Execution layer is for internal testing/simulation only.
 See docs/robot-layer/README.md for YAML format specification.
 """
 
+import io
 import yaml
-from typing import Dict, List, Any
+from typing import Dict, List, Any, IO
 from src.core.observability.logging import get_logger
 
+# LibYAML C emitter when PyYAML was built with it, pure-Python otherwise
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+
+class _SequenceDumper(_Dumper):
+    """
+    Dumper for robot sequences: steps are plain dicts, lists and scalars.
+    
+    Alias tracking is off, so the representer keeps no per-node identity
+    table and a value shared by several steps (e.g., cached routine
+    metadata) is written out in full instead of as an &anchor/*alias pair
+    the controller may not understand.
+    """
+    
+    def ignore_aliases(self, data):
+        return True
+
+
 logger = get_logger("yaml_converter")
 
 
@@ -56,6 +78,55 @@ def convert_to_yaml(
         ... ]
         >>> yaml_str = convert_to_yaml(plan, "<job_name>", "<job_description>", "abc-123")
     """
+    buffer = io.StringIO()
+    convert_to_yaml_stream(plan, sequence_name, description, correlation_id, buffer)
+    return buffer.getvalue()
+
+
+class _CountingWriter:
+    """Text stream wrapper that counts the characters written through it."""
+    
+    __slots__ = ("_fp", "count")
+    
+    def __init__(self, fp: IO[str]):
+        self._fp = fp
+        self.count = 0
+    
+    def write(self, data: str) -> int:
+        self.count += len(data)
+        return self._fp.write(data)
+    
+    def flush(self):
+        self._fp.flush()
+
+
+def convert_to_yaml_stream(
+    plan: List[Dict[str, Any]],
+    sequence_name: str,
+    description: str,
+    correlation_id: str,
+    fp: IO[str]
+) -> int:
+    """
+    Write the YAML for a validated plan straight to a text stream.
+    
+    Same output as convert_to_yaml, without building the whole document
+    as a string first (e.g., when writing to a file or socket).
+    
+    Args:
+        plan: List of validated task steps (JSON from sequence_builder)
+        sequence_name: Human-readable sequence identifier
+        description: Sequence purpose summary
+        correlation_id: UUIDv4 for request tracing
+        fp: Writable text stream
+    
+    Returns:
+        Number of characters written
+    
+    Example:
+        >>> with open("actions.yaml", "w", encoding="utf-8") as f:
+        ...     convert_to_yaml_stream(plan, "<job_name>", "<job_description>", "abc-123", f)
+    """
     logger.info("Converting JSON plan to YAML", 
                correlation_id=correlation_id, 
                step_count=len(plan))
@@ -70,8 +141,11 @@ def convert_to_yaml(
     }
     
     # Convert to YAML with clean formatting
-    yaml_output = yaml.dump(
+    writer = _CountingWriter(fp)
+    yaml.dump(
         robot_sequence,
+        writer,
+        Dumper=_SequenceDumper,
         default_flow_style=False,
         sort_keys=False,
         allow_unicode=True,
@@ -80,6 +154,6 @@ def convert_to_yaml(
     
     logger.info("YAML conversion complete", 
                correlation_id=correlation_id, 
-               yaml_length=len(yaml_output))
+               yaml_length=writer.count)
     
-    return yaml_output
+    return writer.count